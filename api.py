@@ -2,15 +2,30 @@
 FastAPI application for local development and testing
 Serves the same endpoints as AWS Lambda
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel, Field
+import asyncio
+import json
 import mlflow.sklearn
-import pandas as pd
+import numpy as np
 import os
-from typing import Optional
+import time
+from typing import Dict, List, Optional
 import uvicorn
 
+from src.feature_contract import FeatureContract, load_contract, silence_feature_name_warning
+from src.inference import REQUEST_BOUNDS, clip_scores, model_version_of, rate_scores
+from src.inference_executor import InferenceExecutor
+from src.metrics import Metrics, MetricsMiddleware, request_timer
+from src.micro_batcher import MicroBatcher
+from src.model_registry import ModelRegistry
+from src.model_reloader import LoadedModel, LocalModelSource, ModelReloader, S3ModelSource, load_model_file
+from src.prediction_cache import PredictionCache
+from src.stream_parser import StreamParser
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -28,24 +43,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global model variable
-model = None
+# Per-stage latency histograms and request counters on /metrics ("false" removes all instrumentation)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+metrics = Metrics(enabled=METRICS_ENABLED)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+# Active model with its feature contract and version. Replaced in a single
+# assignment on reload, so in-flight requests finish on the model they started with.
+current: Optional[LoadedModel] = None
+silence_feature_name_warning()
+
+# Upper bound on records accepted by /predict/batch in one call
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '10000'))
+
+# Rows parsed and scored per model.predict call by /predict/stream
+STREAM_CHUNK_ROWS = int(os.getenv('STREAM_CHUNK_ROWS', '10000'))
+WINE_TYPE_CODES = {"red": 0, "white": 1}
+
+# Opt-in micro-batching of concurrent /predict calls
+MICRO_BATCHING = os.getenv('MICRO_BATCHING', 'false').lower() == 'true'
+MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', '64'))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv('MICRO_BATCH_MAX_WAIT_MS', '2'))
+
+# Where model.predict runs: "thread" (default), "process" or "inline" (on the event loop)
+INFERENCE_EXECUTOR = os.getenv('INFERENCE_EXECUTOR', 'thread')
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', '0')) or None
+INFERENCE_MAX_IN_FLIGHT = int(os.getenv('INFERENCE_MAX_IN_FLIGHT', '0')) or None
+
+# Prediction cache for resubmitted measurements (size 0 disables it)
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', '10000'))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', '3600'))
+
+# Hot reload: seconds between checks of the model source (0 disables)
+MODEL_RELOAD_INTERVAL = float(os.getenv('MODEL_RELOAD_INTERVAL', '0'))
+# "local" watches the loaded model file, "s3" watches MODEL_S3_KEY through S3Handler
+MODEL_RELOAD_SOURCE = os.getenv('MODEL_RELOAD_SOURCE', 'local')
+MODEL_S3_KEY = os.getenv('MODEL_S3_KEY', 'models/model.pkl')
+
+# Named models (models/<name>/model.pkl) selectable per request with ?model= or X-Model-Name
+MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', 'models')
+# Loaded named models are unloaded least-recently-used above this size (0 = unlimited)
+MODEL_MEMORY_BUDGET_MB = float(os.getenv('MODEL_MEMORY_BUDGET_MB', '0'))
+
+registry = ModelRegistry(int(MODEL_MEMORY_BUDGET_MB * 1024 * 1024) or None)
+
+prediction_cache = (
+    PredictionCache(FeatureContract.default().feature_names, max_size=PREDICTION_CACHE_SIZE, ttl_seconds=PREDICTION_CACHE_TTL)
+    if PREDICTION_CACHE_SIZE > 0 else None
+)
 
 
 # Request schema for Wine Quality Prediction
 class PredictionRequest(BaseModel):
-    fixed_acidity: float = Field(..., ge=0, description="Fixed acidity (tartaric acid - g/dm³)")
-    volatile_acidity: float = Field(..., ge=0, description="Volatile acidity (acetic acid - g/dm³)")
-    citric_acid: float = Field(..., ge=0, description="Citric acid (g/dm³)")
-    residual_sugar: float = Field(..., ge=0, description="Residual sugar (g/dm³)")
-    chlorides: float = Field(..., ge=0, description="Chlorides (sodium chloride - g/dm³)")
-    free_sulfur_dioxide: float = Field(..., ge=0, description="Free sulfur dioxide (mg/dm³)")
-    total_sulfur_dioxide: float = Field(..., ge=0, description="Total sulfur dioxide (mg/dm³)")
-    density: float = Field(..., gt=0, description="Density (g/cm³)")
-    pH: float = Field(..., ge=0, le=14, description="pH level")
-    sulphates: float = Field(..., ge=0, description="Sulphates (potassium sulphate - g/dm³)")
-    alcohol: float = Field(..., ge=0, description="Alcohol content (% by volume)")
-    wine_type_encoded: Optional[int] = Field(0, ge=0, le=1, description="Wine type (0=red, 1=white)")
+    fixed_acidity: float = Field(..., **REQUEST_BOUNDS["fixed_acidity"], description="Fixed acidity (tartaric acid - g/dm³)")
+    volatile_acidity: float = Field(..., **REQUEST_BOUNDS["volatile_acidity"], description="Volatile acidity (acetic acid - g/dm³)")
+    citric_acid: float = Field(..., **REQUEST_BOUNDS["citric_acid"], description="Citric acid (g/dm³)")
+    residual_sugar: float = Field(..., **REQUEST_BOUNDS["residual_sugar"], description="Residual sugar (g/dm³)")
+    chlorides: float = Field(..., **REQUEST_BOUNDS["chlorides"], description="Chlorides (sodium chloride - g/dm³)")
+    free_sulfur_dioxide: float = Field(..., **REQUEST_BOUNDS["free_sulfur_dioxide"], description="Free sulfur dioxide (mg/dm³)")
+    total_sulfur_dioxide: float = Field(..., **REQUEST_BOUNDS["total_sulfur_dioxide"], description="Total sulfur dioxide (mg/dm³)")
+    density: float = Field(..., **REQUEST_BOUNDS["density"], description="Density (g/cm³)")
+    pH: float = Field(..., **REQUEST_BOUNDS["pH"], description="pH level")
+    sulphates: float = Field(..., **REQUEST_BOUNDS["sulphates"], description="Sulphates (potassium sulphate - g/dm³)")
+    alcohol: float = Field(..., **REQUEST_BOUNDS["alcohol"], description="Alcohol content (% by volume)")
+    wine_type_encoded: Optional[int] = Field(0, **REQUEST_BOUNDS["wine_type_encoded"], description="Wine type (0=red, 1=white)")
 
     class Config:
         schema_extra = {
@@ -75,38 +137,64 @@ class PredictionResponse(BaseModel):
     message: str = Field(default="Prediction successful")
 
 
+class BatchPredictionRequest(BaseModel):
+    records: List[PredictionRequest] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="Wines to score"
+    )
+
+
+class BatchPrediction(BaseModel):
+    prediction: float = Field(..., description="Predicted wine quality score")
+    wine_quality_score: float = Field(..., description="Wine quality (0-10)")
+    quality_rating: str = Field(..., description="Quality rating (Poor/Average/Good/Excellent)")
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[BatchPrediction] = Field(..., description="One result per record, in request order")
+    count: int = Field(..., description="Number of records scored")
+    model_version: str = Field(default="v1.0", description="Model version")
+    message: str = Field(default="Prediction successful")
+
+
 class HealthResponse(BaseModel):
     status: str
     service: str
     version: str
     model_loaded: bool
+    model_version: Optional[str] = None
+    model_loaded_at: Optional[str] = None
+
+
+def install_model(loaded: LoadedModel) -> None:
+    """Make a loaded (and warmed) model the active one"""
+    global current
+    replaced, current = current, loaded
+    # Keys carry the model version, so only the replaced model's entries are dead weight;
+    # registry models keep theirs
+    if prediction_cache is not None and replaced is not None and replaced.version != loaded.version:
+        prediction_cache.invalidate(model_version=replaced.version)
 
 
 def load_model():
     """Load the latest trained model"""
-    global model
 
-    if model is not None:
-        return model
+    if current is not None:
+        return current.model
 
     try:
         # Option 1: Try to load from root directory (saved by pipeline)
         root_model_path = "model.pkl"
         if os.path.exists(root_model_path):
-            import pickle
-            with open(root_model_path, 'rb') as f:
-                model = pickle.load(f)
+            install_model(load_model_file(root_model_path))
             print(f"✅ Model loaded from: {root_model_path}")
-            return model
+            return current.model
 
         # Option 2: Try to load from models/ directory
         simple_model_path = "models/model.pkl"
         if os.path.exists(simple_model_path):
-            import pickle
-            with open(simple_model_path, 'rb') as f:
-                model = pickle.load(f)
+            install_model(load_model_file(simple_model_path))
             print(f"✅ Model loaded from: {simple_model_path}")
-            return model
+            return current.model
 
         # Option 3: Try to load from MLflow
         mlflow_dir = os.path.expanduser(
@@ -125,9 +213,15 @@ def load_model():
 
             if model_paths:
                 latest_model = max(model_paths, key=os.path.getmtime)
-                model = mlflow.sklearn.load_model(latest_model)
+                loaded_model = mlflow.sklearn.load_model(latest_model)
+                install_model(LoadedModel(
+                    loaded_model,
+                    load_contract(None, loaded_model),
+                    model_version_of(latest_model.encode()),
+                    source=f"mlflow:{latest_model}"
+                ))
                 print(f"✅ Model loaded from MLflow: {latest_model}")
-                return model
+                return current.model
 
         raise FileNotFoundError("No trained model found")
 
@@ -137,9 +231,146 @@ def load_model():
         raise
 
 
+def active_model() -> LoadedModel:
+    """The active model, loading one on first use"""
+    if current is None:
+        load_model()
+    return current
+
+
+# Registry models being loaded: name -> future of the load, shared by every request waiting for it
+registry_loads: Dict[str, "asyncio.Future[LoadedModel]"] = {}
+
+
+async def resolve_model(name: Optional[str]) -> LoadedModel:
+    """
+    The model a request asked for: a registry model by name, else the active model.
+
+    A registry model's first use unpickles, compiles and warms it on a worker
+    thread, so the event loop keeps serving /health and other requests. One
+    load runs per name; concurrent requests for it wait on the same load.
+    """
+    if name is None or name == "default":
+        return active_model()
+    try:
+        loaded = registry.loaded(name)
+        if loaded is not None:
+            return loaded
+        pending = registry_loads.get(name)
+        if pending is None:
+            pending = asyncio.get_running_loop().run_in_executor(None, registry.get, name)
+            registry_loads[name] = pending
+
+            def forget(done: "asyncio.Future[LoadedModel]") -> None:
+                if registry_loads.get(name) is done:
+                    del registry_loads[name]
+            pending.add_done_callback(forget)
+        # Shielded: a cancelled request doesn't cancel the load others are waiting for
+        return await asyncio.shield(pending)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown model '{name}'. Available: {['default'] + registry.names}"
+        )
+
+
+executor = InferenceExecutor(
+    kind=INFERENCE_EXECUTOR,
+    max_workers=INFERENCE_WORKERS,
+    max_in_flight=INFERENCE_MAX_IN_FLIGHT,
+)
+
+
+async def predict_matrix(features: np.ndarray, loaded: LoadedModel) -> np.ndarray:
+    """Score a feature matrix on the inference executor and clip to the 0-10 range"""
+    return clip_scores(await executor.predict(features, loaded))
+
+
+batcher = (
+    MicroBatcher(predict_matrix, max_batch_size=MICRO_BATCH_MAX_SIZE, max_wait_ms=MICRO_BATCH_MAX_WAIT_MS)
+    if MICRO_BATCHING else None
+)
+
+# Serving state sampled at scrape time
+metrics.gauge("wine_api_inference_in_flight", "Model calls running on the inference executor", lambda: executor.in_flight)
+metrics.gauge("wine_api_inference_waiting", "Model calls waiting for an executor slot", lambda: executor.waiting)
+metrics.gauge(
+    "wine_api_micro_batch_queue_depth", "Rows waiting for the micro-batcher",
+    lambda: batcher.stats()["queue_depth"] if batcher is not None else None
+)
+metrics.gauge(
+    "wine_api_prediction_cache_hit_rate", "Prediction cache hit rate",
+    lambda: prediction_cache.stats()["hit_rate"] if prediction_cache is not None else None
+)
+metrics.gauge("wine_api_registry_memory_bytes", "Memory used by loaded registry models", registry.memory_used_bytes)
+
+
+async def score_features(features: np.ndarray, loaded: LoadedModel) -> np.ndarray:
+    """
+    Clipped scores for a feature matrix. Cached rows skip the model; a
+    single uncached row goes through the micro-batcher when it is enabled.
+    """
+    if prediction_cache is None:
+        keys, missing = None, list(range(len(features)))
+        scores = np.empty(len(features))
+    else:
+        # Quantized with this model's feature order (registry models may differ from the default's)
+        feature_names = loaded.contract.feature_names
+        keys = [prediction_cache.make_key(row, loaded.version, feature_names) for row in features]
+        scores = np.empty(len(keys))
+        missing = []
+        for i, key in enumerate(keys):
+            cached = prediction_cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                scores[i] = cached
+
+    if not missing:
+        return scores
+
+    if batcher is not None and len(missing) == 1:
+        # Scored together with other concurrent requests for the same model, so the
+        # score is this model's even if a reload swaps the active one meanwhile
+        fresh = np.array([await batcher.submit(features[missing[0]], loaded)])
+    else:
+        fresh = await predict_matrix(features[missing], loaded)
+    scores[missing] = fresh
+
+    if keys is not None:
+        for i, score in zip(missing, fresh.tolist()):
+            prediction_cache.put(keys[i], score)
+    return scores
+
+
+reloader: Optional[ModelReloader] = None
+
+
+def start_reloader() -> ModelReloader:
+    """Watch the model source in the background and hot-swap new versions"""
+    global reloader
+    if MODEL_RELOAD_SOURCE == 's3':
+        from src.s3_utils import S3Handler
+        source = S3ModelSource(S3Handler(), MODEL_S3_KEY)
+    else:
+        source = LocalModelSource(current.path if current is not None and current.path else "model.pkl")
+
+    reloader = ModelReloader(
+        source,
+        install_model,
+        interval=MODEL_RELOAD_INTERVAL,
+        current_version=lambda: current.version if current is not None else None,
+    )
+    reloader.start()
+    return reloader
+
+
 @app.on_event("startup")
 async def startup_event():
     """Load model on startup"""
+    if batcher is not None:
+        batcher.start()
+    registry.discover(MODEL_REGISTRY_DIR)
     try:
         load_model()
         print("🚀 FastAPI server started successfully")
@@ -147,6 +378,18 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️  Warning: Could not load model - {e}")
         print("   API will start but predictions will fail until model is trained")
+    if MODEL_RELOAD_INTERVAL > 0:
+        start_reloader()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers"""
+    if reloader is not None:
+        reloader.stop()
+    if batcher is not None:
+        await batcher.stop()
+    executor.shutdown()
 
 
 @app.get("/", tags=["Root"])
@@ -159,7 +402,14 @@ async def root():
         "endpoints": {
             "health": "/health",
             "predict": "/predict",
+            "predict_batch": "/predict/batch",
+            "predict_stream": "/predict/stream",
+            "batching_stats": "/batching/stats",
+            "executor_stats": "/executor/stats",
+            "cache_stats": "/cache/stats",
             "model_info": "/model/info",
+            "models": "/models",
+            "metrics": "/metrics",
             "docs": "/docs",
             "redoc": "/redoc"
         }
@@ -169,60 +419,48 @@ async def root():
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Health check endpoint"""
-    model_loaded = model is not None
+    loaded = current
 
     return {
-        "status": "healthy" if model_loaded else "degraded",
+        "status": "healthy" if loaded is not None else "degraded",
         "service": "wine-quality-predictor",
         "version": "v1.0",
-        "model_loaded": model_loaded
+        "model_loaded": loaded is not None,
+        "model_version": loaded.version if loaded is not None else None,
+        "model_loaded_at": loaded.loaded_at.isoformat() if loaded is not None else None
     }
 
 
 @app.post("/predict", response_model=PredictionResponse, tags=["Prediction"])
-async def predict(request: PredictionRequest):
+async def predict(
+    request: PredictionRequest,
+    model_name: Optional[str] = Query(None, alias="model", description="Registry model to score with"),
+    x_model_name: Optional[str] = Header(None),
+):
     """
     Make a prediction for wine quality
 
     Returns a score between 0-10 indicating predicted wine quality
     """
+    timer = request_timer()
+    timer.mark("validate")
     try:
-        # Load model if not already loaded
-        if model is None:
-            load_model()
-
-        # Prepare features in the correct order
-        features = pd.DataFrame([{
-            'fixed acidity': request.fixed_acidity,
-            'volatile acidity': request.volatile_acidity,
-            'citric acid': request.citric_acid,
-            'residual sugar': request.residual_sugar,
-            'chlorides': request.chlorides,
-            'free sulfur dioxide': request.free_sulfur_dioxide,
-            'total sulfur dioxide': request.total_sulfur_dioxide,
-            'density': request.density,
-            'pH': request.pH,
-            'sulphates': request.sulphates,
-            'alcohol': request.alcohol,
-            'wine_type_encoded': request.wine_type_encoded
-        }])
-
-        # Make prediction
-        prediction = model.predict(features)
-        score = float(prediction[0])
-
-        # Clip to valid range (0-10)
-        score = max(0, min(10, score))
+        # Load model if not already loaded; this request sticks to it even if a reload swaps it
+        loaded = await resolve_model(model_name or x_model_name)
+        timer.model = model_name or x_model_name or "default"
+        timer.mark("load_model")
+
+        # Fill a row buffer in the contract's feature order
+        features = loaded.contract.fill_row(request)
+        timer.mark("featurize")
+
+        # Make prediction off the event loop (clipped to 0-10), or reuse a cached score
+        score = float((await score_features(features, loaded))[0])
+        timer.mark("predict")
 
         # Determine quality rating
-        if score < 5:
-            quality_rating = "Poor"
-        elif score < 6:
-            quality_rating = "Average"
-        elif score < 7:
-            quality_rating = "Good"
-        else:
-            quality_rating = "Excellent"
+        quality_rating = str(rate_scores(score))
+        timer.mark("rate")
 
         return {
             "prediction": score,
@@ -232,6 +470,8 @@ async def predict(request: PredictionRequest):
             "message": "Prediction successful"
         }
 
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(
             status_code=503,
@@ -244,34 +484,258 @@ async def predict(request: PredictionRequest):
         )
 
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse, tags=["Prediction"])
+async def predict_batch(
+    request: BatchPredictionRequest,
+    model_name: Optional[str] = Query(None, alias="model", description="Registry model to score with"),
+    x_model_name: Optional[str] = Header(None),
+):
+    """
+    Make predictions for many wines in one call
+
+    Records are packed into a single feature matrix and scored with one
+    model.predict call. Results are returned in request order.
+    """
+    timer = request_timer()
+    timer.mark("validate")
+    try:
+        loaded = await resolve_model(model_name or x_model_name)
+        timer.model = model_name or x_model_name or "default"
+        timer.mark("load_model")
+
+        # One contiguous (n_records, n_features) matrix in the contract's feature order
+        features = loaded.contract.fill_matrix(request.records)
+        timer.mark("featurize")
+
+        scores = await score_features(features, loaded)
+        timer.mark("predict")
+
+        ratings = rate_scores(scores)
+        predictions = [
+            {"prediction": score, "wine_quality_score": score, "quality_rating": rating}
+            for score, rating in zip(scores.tolist(), ratings.tolist())
+        ]
+        timer.mark("rate")
+
+        return {
+            "predictions": predictions,
+            "count": len(predictions),
+            "model_version": "v1.0",
+            "message": "Prediction successful"
+        }
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not found. Please train a model first using: python run_pipeline.py"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Prediction failed: {str(e)}"
+        )
+
+
+def format_scores(offset: int, scores: np.ndarray, errors: Optional[Dict[int, str]] = None) -> str:
+    """NDJSON lines for one scored chunk; rows in errors get {"row", "error"} instead of a prediction"""
+    ratings = rate_scores(scores).tolist()
+    lines = [
+        f'{{"row":{offset + i},"prediction":{score!r},"quality_rating":"{rating}"}}\n'
+        if score == score else f'{{"row":{offset + i},"prediction":null,"quality_rating":null}}\n'
+        for i, (score, rating) in enumerate(zip(scores.tolist(), ratings))
+    ]
+    for i, message in (errors or {}).items():
+        lines[i] = json.dumps({"row": offset + i, "error": message}) + "\n"
+    return "".join(lines)
+
+
+async def stream_scores(parser: StreamParser, body, ready: list, loaded: LoadedModel):
+    """Parse, score and emit the upload chunk by chunk, ending with a summary line"""
+    start = time.perf_counter()
+    rows = chunks = failed = 0
+
+    async def parsed_chunks():
+        for chunk in ready:
+            yield chunk
+        async for data in body:
+            for chunk in parser.feed(data):
+                yield chunk
+        for chunk in parser.flush():
+            yield chunk
+
+    error = None
+    try:
+        async for features, errors in parsed_chunks():
+            if errors:
+                # Score the valid rows only; the others get an error line each
+                valid = np.ones(len(features), dtype=bool)
+                valid[list(errors)] = False
+                scores = np.full(len(features), np.nan)
+                if valid.any():
+                    scores[valid] = await predict_matrix(features[valid], loaded)
+            else:
+                scores = await predict_matrix(features, loaded)
+            yield format_scores(rows, scores, errors)
+            rows += len(scores)
+            failed += len(errors)
+            chunks += 1
+    except ClientDisconnect:
+        raise
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        error = str(e)
+        print(f"❌ Stream scoring failed after {rows} rows: {e}")
+
+    seconds = time.perf_counter() - start
+    summary = {
+        "rows": rows,
+        "failed": failed,
+        "chunks": chunks,
+        "seconds": round(seconds, 6),
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+        "model_version": loaded.version,
+    }
+    if error is not None:
+        summary["error"] = error
+    yield json.dumps({"summary": summary}) + "\n"
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body keeps reading the request body after the
+    response has started.
+
+    Starlette's StreamingResponse also listens for a client disconnect on
+    receive() (ASGI spec < 2.4, e.g. uvicorn), and that listener would swallow
+    the rest of the upload. Here the body iterator is the only reader of
+    receive(); a disconnect reaches it as ClientDisconnect from request.stream().
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+@app.post("/predict/stream", tags=["Prediction"])
+async def predict_stream(
+    request: Request,
+    stream_format: Optional[str] = Query(None, alias="format", description="csv or ndjson (default: from Content-Type)"),
+    wine_type: Optional[str] = Query(None, description="red or white, for uploads without wine_type_encoded"),
+    model_name: Optional[str] = Query(None, alias="model", description="Registry model to score with"),
+    x_model_name: Optional[str] = Header(None),
+):
+    """
+    Score a large CSV or NDJSON upload
+
+    The body is parsed in chunks of STREAM_CHUNK_ROWS rows as it arrives and
+    each chunk is scored with one model.predict call, so memory stays flat
+    for any upload size. Predictions stream back as NDJSON
+    ({"row", "prediction", "quality_rating"} per line), followed by a
+    {"summary": ...} line with the row count and rows/sec. A row /predict
+    would reject (missing or non-numeric feature, value out of range) gets a
+    {"row", "error"} line instead, and the rest of the upload is still scored.
+    """
+    try:
+        loaded = await resolve_model(model_name or x_model_name)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not found. Please train a model first using: python run_pipeline.py"
+        )
+
+    if stream_format is None:
+        content_type = request.headers.get("content-type", "")
+        stream_format = "ndjson" if "json" in content_type else "csv"
+    if wine_type is not None and wine_type not in WINE_TYPE_CODES:
+        raise HTTPException(status_code=400, detail=f"wine_type must be one of {list(WINE_TYPE_CODES)}")
+    defaults = {"wine_type_encoded": WINE_TYPE_CODES[wine_type]} if wine_type is not None else None
+
+    body = request.stream()
+    ready = []
+    try:
+        parser = StreamParser(loaded.contract, stream_format, chunk_rows=STREAM_CHUNK_ROWS, defaults=defaults)
+        # Read up to the CSV header so a bad upload is a 400 rather than an error mid-stream
+        async for data in body:
+            ready += parser.feed(data)
+            if parser.header_read:
+                break
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return UploadStreamingResponse(stream_scores(parser, body, ready, loaded), media_type="application/x-ndjson")
+
+
+@app.get("/batching/stats", tags=["Prediction"])
+async def batching_stats():
+    """Micro-batching queue depth, batch-size distribution and added wait time"""
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+
+@app.get("/executor/stats", tags=["Prediction"])
+async def executor_stats():
+    """Inference executor configuration and in-flight model calls"""
+    return executor.stats()
+
+
+@app.get("/cache/stats", tags=["Prediction"])
+async def cache_stats():
+    """Prediction cache hit/miss/eviction counters"""
+    if prediction_cache is None:
+        return {"enabled": False}
+    model_version = current.version if current is not None else None
+    return {"enabled": True, "model_version": model_version, **prediction_cache.stats()}
+
+
 @app.get("/model/info", tags=["Model"])
 async def model_info():
     """Get information about the loaded model"""
-    if model is None:
+    loaded = current
+    if loaded is None:
         raise HTTPException(
             status_code=503,
             detail="No model loaded"
         )
 
     return {
-        "model_type": type(model).__name__,
+        "model_type": loaded.model_type,
         "problem_type": "Wine Quality Prediction (Regression)",
         "target": "quality (0-10 score)",
-        "features": [
-            "fixed acidity",
-            "volatile acidity",
-            "citric acid",
-            "residual sugar",
-            "chlorides",
-            "free sulfur dioxide",
-            "total sulfur dioxide",
-            "density",
-            "pH",
-            "sulphates",
-            "alcohol",
-            "wine_type_encoded"
-        ],
-        "version": "v1.0"
+        "features": loaded.contract.feature_names,
+        "version": "v1.0",
+        "model_version": loaded.version,
+        "loaded_at": loaded.loaded_at.isoformat(),
+        "source": loaded.source,
+        "hot_reload": {
+            "enabled": reloader is not None,
+            "reloads": reloader.reloads if reloader is not None else 0,
+            "last_error": reloader.last_error if reloader is not None else None
+        }
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Health"])
+async def prometheus_metrics():
+    """Request counters and latency histograms in Prometheus text format"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=false)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/models", tags=["Model"])
+async def list_models():
+    """Servable models, whether each is loaded, and its memory footprint"""
+    loaded = current
+    return {
+        "default": loaded.info() if loaded is not None else None,
+        **registry.stats()
     }
 
 
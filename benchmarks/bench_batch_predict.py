@@ -0,0 +1,73 @@
+"""
+Benchmark: /predict/batch vs looping over /predict
+
+Trains a small RandomForest on random data, injects it into the API and
+reports rows/sec for different batch sizes.
+
+Run: python benchmarks/bench_batch_predict.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api  # noqa: E402
+from src.feature_contract import FeatureContract  # noqa: E402
+from src.model_reloader import LoadedModel  # noqa: E402
+from src.inference import FEATURE_COLUMNS, REQUEST_FIELDS  # noqa: E402
+
+BATCH_SIZES = [1, 10, 100, 1000, 5000]
+# Looping over /predict is slow, so cap the number of single calls and extrapolate
+MAX_SINGLE_CALLS = 200
+
+
+def make_records(n: int, rng: np.random.Generator) -> list:
+    values = rng.random((n, len(REQUEST_FIELDS)))
+    values[:, -1] = rng.integers(0, 2, n)
+    records = []
+    for row in values:
+        record = dict(zip(REQUEST_FIELDS, row.tolist()))
+        record["density"] += 0.5
+        record["wine_type_encoded"] = int(record["wine_type_encoded"])
+        records.append(record)
+    return records
+
+
+def main():
+    rng = np.random.default_rng(42)
+    model = RandomForestRegressor(n_estimators=100, max_depth=12, random_state=42)
+    # Fit on a named frame like the training pipeline does
+    model.fit(pd.DataFrame(rng.random((2000, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS), rng.random(2000) * 10)
+    api.install_model(LoadedModel(model, FeatureContract.from_model(model), version="bench"))
+    # Measure model calls, not cache hits
+    api.prediction_cache = None
+
+    client = TestClient(api.app)
+
+    print(f"{'N':>6} | {'loop /predict rows/s':>22} | {'/predict/batch rows/s':>22} | {'speedup':>8}")
+    print("-" * 68)
+    for n in BATCH_SIZES:
+        records = make_records(n, rng)
+
+        single_calls = min(n, MAX_SINGLE_CALLS)
+        start = time.perf_counter()
+        for record in records[:single_calls]:
+            client.post("/predict", json=record)
+        loop_rate = single_calls / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = client.post("/predict/batch", json={"records": records})
+        batch_rate = n / (time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+
+        print(f"{n:>6} | {loop_rate:>22.0f} | {batch_rate:>22.0f} | {batch_rate / loop_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
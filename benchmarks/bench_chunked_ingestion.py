@@ -0,0 +1,105 @@
+"""
+Benchmark: whole-frame vs chunked ingestion + preprocessing, peak memory
+
+Writes a synthetic wine CSV (UCI column layout, ';'-separated), then runs
+each mode in a fresh interpreter and reports wall time and peak RSS:
+
+- full: pd.read_csv + DataPreProcessingStrategy.handle_data (what
+  IngestData/clean_df do)
+- chunked: iter_chunks + handle_chunks under a memory budget
+- spill: iter_chunks -> spill_to_parquet, then iter_parquet_chunks +
+  handle_chunks (the second pass reads Parquet)
+
+Run: python benchmarks/bench_chunked_ingestion.py [--rows 2000000] [--budget-mb 64]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ("full", "chunked", "spill")
+MB = 1024 * 1024
+
+
+def peak_rss_mb() -> float:
+    """VmHWM of this process (unlike ru_maxrss, it isn't inherited from the parent across exec)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not found in /proc/self/status")
+
+
+def child(mode: str, source: str, budget_mb: float, spill_dir: str) -> None:
+    """One mode in this interpreter; prints rows kept, seconds and peak RSS as JSON"""
+    import logging
+
+    import pandas as pd
+
+    from src.chunked_ingestion import iter_chunks, iter_parquet_chunks, spill_to_parquet
+    from src.data_cleaning import DataPreProcessingStrategy
+
+    logging.disable(logging.WARNING)
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    if mode == "full":
+        df = pd.read_csv(source, sep=";")
+        df["wine_type"] = "red"
+        rows = len(DataPreProcessingStrategy().handle_data(df))
+        spill = None
+    else:
+        chunks = iter_chunks(source, "red", memory_budget_mb=budget_mb)
+        if mode == "spill":
+            spill_started = time.perf_counter()
+            spill_to_parquet(chunks, spill_dir)
+            spill = time.perf_counter() - spill_started
+            chunks = iter_parquet_chunks(spill_dir, memory_budget_mb=budget_mb)
+        else:
+            spill = None
+        rows = sum(len(chunk) for chunk in DataPreProcessingStrategy().handle_chunks(chunks))
+    print(json.dumps({
+        "rows": rows,
+        "seconds": time.perf_counter() - started,
+        "spill_seconds": spill,
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked ingestion benchmark")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows in the synthetic CSV")
+    parser.add_argument("--budget-mb", type=float, default=64.0, help="Memory budget per chunk")
+    args = parser.parse_args()
+
+    from benchmarks.bench_dataset_cache import wine_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "wine.csv")
+        with open(source, "wb") as f:
+            f.write(wine_csv(args.rows))
+        print(f"{args.rows:,} rows, {os.path.getsize(source) / MB:.0f} MB CSV, budget {args.budget_mb:g} MB/chunk\n")
+        print(f"{'mode':<8} | {'rows kept':>10} | {'seconds':>7} | {'peak RSS MB':>11} | {'above import MB':>15}")
+        print("-" * 64)
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, source, str(args.budget_mb),
+                 os.path.join(tmp, "spill")],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            label = mode if result["spill_seconds"] is None else f"{mode} ({result['spill_seconds']:.1f}s writing)"
+            print(f"{mode:<8} | {result['rows']:>10,} | {result['seconds']:>7.1f} | {result['peak_mb']:>11.0f} | "
+                  f"{result['peak_mb'] - result['baseline_mb']:>15.0f}" + ("" if label == mode else f"   {label}"))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 6 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], float(sys.argv[4]), sys.argv[5])
+    else:
+        main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: compact wine dtypes vs pandas defaults
+
+Builds UCI-shaped red and white CSVs (quality driven by alcohol, volatile
+acidity and sulphates), then runs ingestion -> preprocessing -> split with
+DATA_COMPACT_DTYPES on and off and reports:
+
+- memory per stage (src.data_schema.memory_report)
+- parse time of the combined dataset
+- test R2 / MSE of each model trained on either frame
+
+Run: python benchmarks/bench_compact_dtypes.py [--red-rows 1599] [--white-rows 4898] [--scale 1]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import data_schema  # noqa: E402
+from src.data_cleaning import DataDivideStrategy, DataPreProcessingStrategy  # noqa: E402
+from src.data_ingestion import concat_frames, read_source  # noqa: E402
+from src.data_schema import memory_report  # noqa: E402
+from src.evaluation import MSE, R2Score  # noqa: E402
+from src.model_dev import LightGBMModel, LinearRegressionModel, RandomForestModel, XGBoostModel  # noqa: E402
+from tests.test_data_schema import wine_csv  # noqa: E402
+
+MODELS = [
+    ("LinearRegression", LinearRegressionModel(), {}),
+    ("RandomForest", RandomForestModel(), {"n_estimators": 100, "random_state": 42, "n_jobs": 1}),
+    ("LightGBM", LightGBMModel(), {"n_estimators": 200, "random_state": 42, "verbose": -1}),
+    ("XGBoost", XGBoostModel(), {"n_estimators": 200, "random_state": 42}),
+]
+
+
+def run(sources, compact: bool):
+    """Stage memory reports, parse ms and the train/test split with compact dtypes on or off"""
+    data_schema.DATA_COMPACT_DTYPES = compact
+    started = time.perf_counter()
+    df = concat_frames([read_source(url, wine_type) for url, wine_type in sources])
+    parse_ms = (time.perf_counter() - started) * 1000
+    reports = [memory_report(df, "ingested")]
+    processed = DataPreProcessingStrategy().handle_data(df)
+    reports.append(memory_report(processed, "preprocessed"))
+    split = DataDivideStrategy().handle_data(processed)
+    reports.append(memory_report(split[0], "X_train"))
+    return reports, parse_ms, split
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact dtype benchmark")
+    parser.add_argument("--red-rows", type=int, default=1599, help="Rows of the red CSV")
+    parser.add_argument("--white-rows", type=int, default=4898, help="Rows of the white CSV")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply both sizes (memory only, models skipped above 1)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = [
+            (wine_csv(os.path.join(tmp, "red.csv"), args.red_rows * args.scale, seed=1), "red"),
+            (wine_csv(os.path.join(tmp, "white.csv"), args.white_rows * args.scale, seed=2), "white"),
+        ]
+        default_reports, default_ms, default_split = run(sources, compact=False)
+        compact_reports, compact_ms, compact_split = run(sources, compact=True)
+
+    rows = default_reports[0]["rows"]
+    print(f"{rows:,} rows; parse {default_ms:.0f} ms (defaults) vs {compact_ms:.0f} ms (compact)\n")
+    print(f"{'stage':<13} | {'default MB':>10} | {'compact MB':>10} | {'saved':>6}")
+    print("-" * 48)
+    for default, compact in zip(default_reports, compact_reports):
+        saved = 1 - compact["bytes"] / default["bytes"]
+        print(f"{default['stage']:<13} | {default['bytes'] / 1e6:>10.2f} | {compact['bytes'] / 1e6:>10.2f} | {saved:>6.0%}")
+
+    if args.scale > 1:
+        return
+    print(f"\n{'model':<16} | {'R2 default':>10} | {'R2 compact':>10} | {'MSE default':>11} | {'MSE compact':>11}")
+    print("-" * 70)
+    for name, model, kwargs in MODELS:
+        scores = []
+        for X_train, X_test, y_train, y_test in (default_split, compact_split):
+            predictions = model.train(X_train, y_train, **kwargs).predict(X_test)
+            scores.append((R2Score().calculate_score(y_test, predictions), MSE().calculate_score(y_test, predictions)))
+        print(f"{name:<16} | {scores[0][0]:>10.4f} | {scores[1][0]:>10.4f} | {scores[0][1]:>11.4f} | {scores[1][1]:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
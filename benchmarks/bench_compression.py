@@ -0,0 +1,115 @@
+"""
+Benchmark: compressed model transport, per codec and level
+
+Uploads the production-sized RandomForest pickle (200 trees, depth 20)
+through S3Handler.upload_file with each codec/level to the local S3
+stand-in, throttled like S3, then cold-starts the Lambda handler against it
+in fresh interpreters (MODEL_FORMAT=pickle, empty /tmp) and reports:
+
+- size: object size in S3 and ratio
+- upload: compress + upload wall time
+- cold load: lambda_handler s3_fetch_ms + deserialize_ms (median of --runs)
+
+Run: python benchmarks/bench_compression.py [--latency-ms 20] [--mbps 80] [--runs 3]
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MB = 1024 * 1024
+CODECS = [("none", None), ("lz4", 0), ("lz4", 9), ("zstd", 1), ("zstd", 3), ("zstd", 9), ("zstd", 19)]
+
+
+def child() -> None:
+    """One cold start in this interpreter; prints its cold_start phases as JSON"""
+    import lambda_handler
+
+    lambda_handler.load_model_from_s3()
+    print(json.dumps(lambda_handler.cold_start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compressed model transport benchmark")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="First-byte latency per request")
+    parser.add_argument("--mbps", type=float, default=80.0, help="Bandwidth per connection, MB/s")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per codec")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from src.feature_contract import FeatureContract
+    from src.inference import FEATURE_COLUMNS
+    from src.s3_utils import S3Handler
+    from tests.local_s3 import LocalS3
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.random((6000, 12)) * 10, columns=FEATURE_COLUMNS)
+    y = X["alcohol"] * 0.4 + np.sin(X["pH"]) + rng.random(6000)
+    model = RandomForestRegressor(n_estimators=200, max_depth=20, random_state=42, n_jobs=1).fit(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            LocalS3(latency=args.latency_ms / 1000, bandwidth=args.mbps * MB) as s3:
+        model_path = os.path.join(tmp, "model.pkl")
+        with open(model_path, "wb") as f:
+            pickle.dump(model, f)
+        raw_size = os.path.getsize(model_path)
+        print(f"Model pickle {raw_size / MB:.1f} MB; S3 stand-in: {args.latency_ms:g} ms first byte, "
+              f"{args.mbps:g} MB/s per connection\n")
+        print(f"{'codec':<9} | {'size MB':>8} | {'ratio':>6} | {'upload ms':>9} | {'fetch ms':>8} | "
+              f"{'unpickle ms':>11} | {'cold load ms':>12}")
+        print("-" * 84)
+
+        contract = json.dumps(FeatureContract.from_model(model).to_dict()).encode()
+        for codec, level in CODECS:
+            bucket = f"bench-{codec}-{level}"
+            handler = S3Handler(bucket_name=bucket, region="us-east-1")
+            handler.s3_client = s3.client()
+            started = time.perf_counter()
+            assert handler.upload_file(model_path, "models/model.pkl", codec=codec, level=level)
+            upload_ms = (time.perf_counter() - started) * 1000
+            s3.put(bucket, "models/feature_contract.json", contract)
+            size = len(s3.objects[(bucket, "models/model.pkl")])
+
+            env = {
+                **os.environ,
+                "S3_BUCKET_NAME": bucket,
+                "S3_ENDPOINT_URL": s3.endpoint_url,
+                "AWS_ACCESS_KEY_ID": "bench",
+                "AWS_SECRET_ACCESS_KEY": "bench",
+                "AWS_DEFAULT_REGION": "us-east-1",
+                "MODEL_FORMAT": "pickle",
+                "BAKED_MODEL_PATH": os.path.join(tmp, "no-baked-model", "model.pkl"),
+            }
+            runs = []
+            for _ in range(args.runs):
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    out = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--child"],
+                        cwd=REPO_ROOT, env={**env, "MODEL_CACHE_DIR": cache_dir},
+                        capture_output=True, text=True, check=True,
+                    ).stdout
+                runs.append(json.loads(out.strip().splitlines()[-1]))
+            fetch_ms = float(np.median([run["s3_fetch_ms"] for run in runs]))
+            unpickle_ms = float(np.median([run["deserialize_ms"] for run in runs]))
+            label = codec if level is None else f"{codec}-{level}"
+            print(f"{label:<9} | {size / MB:>8.1f} | {raw_size / size:>6.2f} | {upload_ms:>9.0f} | {fetch_ms:>8.0f} | "
+                  f"{unpickle_ms:>11.0f} | {fetch_ms + unpickle_ms:>12.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == "--child":
+        child()
+    else:
+        main()
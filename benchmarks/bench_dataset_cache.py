@@ -0,0 +1,121 @@
+"""
+Benchmark: dataset ingestion with and without the Parquet dataset cache
+
+Serves a synthetic wine CSV (UCI column layout, ';'-separated) from a local
+HTTP server with first-byte latency and a bandwidth cap, then times:
+
+- no cache: pd.read_csv(url, sep=';'), what IngestData did before
+- first read: download + parse + write the Parquet copy
+- revalidated: conditional GET answered with 304 + Parquet read
+- offline: Parquet read only (DATASET_OFFLINE=true)
+
+Run: python benchmarks/bench_dataset_cache.py [--rows 1599 200000] [--latency-ms 150] [--mbps 5]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dataset_cache import DatasetCache  # noqa: E402
+
+MB = 1024 * 1024
+COLUMNS = [
+    "fixed acidity", "volatile acidity", "citric acid", "residual sugar", "chlorides",
+    "free sulfur dioxide", "total sulfur dioxide", "density", "pH", "sulphates", "alcohol", "quality",
+]
+
+
+def wine_csv(rows: int) -> bytes:
+    import pandas as pd
+
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(np.round(rng.random((rows, len(COLUMNS) - 1)) * 20, 4), columns=COLUMNS[:-1])
+    df["quality"] = rng.integers(3, 9, rows)
+    return df.to_csv(sep=";", index=False).encode()
+
+
+def serve(content: bytes, latency: float, bandwidth: float):
+    """HTTP server for one CSV with an ETag, throttled to latency + bandwidth"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            if self.headers.get("If-None-Match") == '"bench"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"bench"')
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            chunk = 64 * 1024
+            for offset in range(0, len(content), chunk):
+                self.wfile.write(content[offset:offset + chunk])
+                time.sleep(chunk / bandwidth)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_port}/wine.csv"
+
+
+def timed(fn, runs: int) -> float:
+    """Median wall time of fn() in ms"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parquet dataset cache benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1599, 200000], help="Dataset sizes")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="First-byte latency of the source")
+    parser.add_argument("--mbps", type=float, default=5.0, help="Source bandwidth, MB/s")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per measurement")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    import pandas as pd
+
+    print(f"Source: {args.latency_ms:g} ms first byte, {args.mbps:g} MB/s\n")
+    print(f"{'rows':>8} | {'CSV MB':>7} | {'Parquet MB':>10} | {'no cache ms':>11} | {'first read ms':>13} | "
+          f"{'revalidated ms':>14} | {'offline ms':>10}")
+    print("-" * 92)
+    for rows in args.rows:
+        content = wine_csv(rows)
+        httpd, url = serve(content, args.latency_ms / 1000, args.mbps * MB)
+        with tempfile.TemporaryDirectory() as tmp:
+            no_cache = timed(lambda: pd.read_csv(url, sep=";"), args.runs)
+
+            def first_read():
+                cache = DatasetCache(os.path.join(tmp, f"first-{time.perf_counter_ns()}"))
+                cache.read_csv(url, sep=";")
+
+            first = timed(first_read, args.runs)
+            cache = DatasetCache(os.path.join(tmp, "warm"))
+            cache.read_csv(url, sep=";")
+            revalidated = timed(lambda: cache.read_csv(url, sep=";"), args.runs)
+            offline_cache = DatasetCache(os.path.join(tmp, "warm"), offline=True)
+            offline = timed(lambda: offline_cache.read_csv(url, sep=";"), args.runs)
+            parquet_mb = os.path.getsize(cache.path(url, {"sep": ";"})) / MB
+        httpd.shutdown()
+        httpd.server_close()
+        print(f"{rows:>8} | {len(content) / MB:>7.2f} | {parquet_mb:>10.2f} | {no_cache:>11.0f} | {first:>13.0f} | "
+              f"{revalidated:>14.0f} | {offline:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Load test: /health latency while /predict is saturated
+
+Runs the API in-process (same event loop as the clients), keeps
+CONCURRENCY clients hammering /predict with a 200-tree RandomForest and
+probes /health every PROBE_INTERVAL seconds. Compares the inline executor
+(model.predict on the event loop) with the thread pool.
+
+Run: python benchmarks/bench_event_loop.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api  # noqa: E402
+from src.feature_contract import FeatureContract  # noqa: E402
+from src.model_reloader import LoadedModel  # noqa: E402
+from src.inference import FEATURE_COLUMNS  # noqa: E402
+from src.inference_executor import InferenceExecutor  # noqa: E402
+
+CONCURRENCY = 16
+DURATION = 5.0
+PROBE_INTERVAL = 0.05
+
+PAYLOAD = {
+    "fixed_acidity": 7.4,
+    "volatile_acidity": 0.7,
+    "citric_acid": 0.0,
+    "residual_sugar": 1.9,
+    "chlorides": 0.076,
+    "free_sulfur_dioxide": 11.0,
+    "total_sulfur_dioxide": 34.0,
+    "density": 0.9978,
+    "pH": 3.51,
+    "sulphates": 0.56,
+    "alcohol": 9.4,
+    "wine_type_encoded": 0
+}
+
+
+async def run_load(kind: str) -> dict:
+    api.executor = InferenceExecutor(kind=kind)
+    transport = httpx.ASGITransport(app=api.app)
+    stop_at = time.perf_counter() + DURATION
+    predictions = 0
+    health_latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def predict_worker():
+            nonlocal predictions
+            while time.perf_counter() < stop_at:
+                response = await client.post("/predict", json=PAYLOAD)
+                assert response.status_code == 200, response.text
+                predictions += 1
+
+        async def health_probe():
+            # Latency is measured from when the probe was due, so time spent
+            # waiting for a blocked event loop is included
+            due = time.perf_counter()
+            while True:
+                await client.get("/health")
+                health_latencies.append((time.perf_counter() - due) * 1000)
+                if time.perf_counter() >= stop_at:
+                    break
+                due = time.perf_counter() + PROBE_INTERVAL
+                await asyncio.sleep(PROBE_INTERVAL)
+
+        # Idle baseline
+        start = time.perf_counter()
+        for _ in range(20):
+            await client.get("/health")
+        idle = (time.perf_counter() - start) * 1000 / 20
+
+        await asyncio.gather(health_probe(), *(predict_worker() for _ in range(CONCURRENCY)))
+
+    api.executor.shutdown()
+    latencies = np.array(health_latencies)
+    return {
+        "kind": kind,
+        "predict_rps": predictions / DURATION,
+        "health_idle_ms": idle,
+        "health_p50_ms": float(np.percentile(latencies, 50)),
+        "health_p99_ms": float(np.percentile(latencies, 99)),
+        "health_max_ms": float(latencies.max()),
+        "probes": len(latencies),
+    }
+
+
+def main():
+    rng = np.random.default_rng(42)
+    model = RandomForestRegressor(n_estimators=200, max_depth=20, random_state=42)
+    model.fit(pd.DataFrame(rng.random((5000, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS), rng.random(5000) * 10)
+    api.install_model(LoadedModel(model, FeatureContract.from_model(model), version="bench"))
+    # Measure model calls, not cache hits
+    api.prediction_cache = None
+
+    print(f"{'executor':>8} | {'predict rps':>11} | {'health idle':>11} | {'health p50':>10} | {'health p99':>10} | {'health max':>10} | {'probes':>6}")
+    print("-" * 85)
+    for kind in ["inline", "thread"]:
+        r = asyncio.run(run_load(kind))
+        print(
+            f"{r['kind']:>8} | {r['predict_rps']:>11.1f} | {r['health_idle_ms']:>9.2f}ms | "
+            f"{r['health_p50_ms']:>8.2f}ms | {r['health_p99_ms']:>8.2f}ms | {r['health_max_ms']:>8.2f}ms | {r['probes']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark: per-request featurization cost
+
+Compares the old /predict path (dict -> one-row pd.DataFrame) with the
+feature contract filling a preallocated float buffer, and measures the
+model call with each input.
+
+Run: python benchmarks/bench_featurization.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import PredictionRequest  # noqa: E402
+from src.feature_contract import FeatureContract, silence_feature_name_warning  # noqa: E402
+from src.inference import FEATURE_COLUMNS  # noqa: E402
+
+NUMBER = 20000
+
+BODY = {
+    "fixed_acidity": 7.4,
+    "volatile_acidity": 0.7,
+    "citric_acid": 0.0,
+    "residual_sugar": 1.9,
+    "chlorides": 0.076,
+    "free_sulfur_dioxide": 11.0,
+    "total_sulfur_dioxide": 34.0,
+    "density": 0.9978,
+    "pH": 3.51,
+    "sulphates": 0.56,
+    "alcohol": 9.4,
+    "wine_type_encoded": 0
+}
+
+
+def dataframe_features(request):
+    """Featurization as /predict did it before the contract"""
+    return pd.DataFrame([{
+        'fixed acidity': request.fixed_acidity,
+        'volatile acidity': request.volatile_acidity,
+        'citric acid': request.citric_acid,
+        'residual sugar': request.residual_sugar,
+        'chlorides': request.chlorides,
+        'free sulfur dioxide': request.free_sulfur_dioxide,
+        'total sulfur dioxide': request.total_sulfur_dioxide,
+        'density': request.density,
+        'pH': request.pH,
+        'sulphates': request.sulphates,
+        'alcohol': request.alcohol,
+        'wine_type_encoded': request.wine_type_encoded
+    }])
+
+
+def report(label: str, stmt, number: int = NUMBER) -> float:
+    seconds = min(timeit.repeat(stmt, number=number, repeat=3)) / number
+    print(f"  {label:<48} {seconds * 1e6:>10.2f} µs")
+    return seconds
+
+
+def main():
+    silence_feature_name_warning()
+    request = PredictionRequest(**BODY)
+    model = LinearRegression().fit(
+        pd.DataFrame(np.random.rand(100, 12), columns=FEATURE_COLUMNS), np.random.rand(100)
+    )
+    contract = FeatureContract.from_model(model)
+    buffer = contract.new_row()
+    buffer32 = FeatureContract.from_model(model, dtype="float32").new_row()
+
+    print("Featurization only:")
+    before = report("dict -> pd.DataFrame (before)", lambda: dataframe_features(request))
+    after = report("contract.fill_row, preallocated float64", lambda: contract.fill_row(request, out=buffer))
+    report("contract.fill_row, preallocated float32", lambda: contract.fill_row(request, out=buffer32))
+    report("contract.fill_row, fresh buffer", lambda: contract.fill_row(request))
+    report("contract.fill_row_from_dict (Lambda)", lambda: contract.fill_row_from_dict(BODY, out=buffer))
+    print(f"  speedup: {before / after:.0f}x")
+
+    print("\nFeaturization + LinearRegression.predict:")
+    before = report("DataFrame path", lambda: model.predict(dataframe_features(request)), number=NUMBER // 4)
+    after = report("contract path", lambda: model.predict(contract.fill_row(request, out=buffer)), number=NUMBER // 4)
+    print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: Lambda batch events vs one invocation per record
+
+Loads the production-sized RandomForest (200 trees, depth 20) into the
+handler module, then scores N wines as N single-record invocations and as
+one JSON array invocation, with the prediction cache off.
+
+Run: python benchmarks/bench_lambda_batch.py
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lambda_handler  # noqa: E402
+from src.feature_contract import FeatureContract  # noqa: E402
+from src.tree_engine import compile_model  # noqa: E402
+
+BATCH_SIZES = [1, 10, 100, 1000, 10_000]
+
+
+def main():
+    rng = np.random.default_rng(42)
+    X = rng.random((6000, 12)) * 10
+    model = RandomForestRegressor(n_estimators=200, max_depth=20, random_state=42, n_jobs=1).fit(X, X[:, 10] * 0.6)
+    contract = FeatureContract.default()
+    lambda_handler.model = model
+    lambda_handler.tree_engine = compile_model(model)
+    lambda_handler.contract = contract
+    lambda_handler.row_buffer = contract.new_row()
+    lambda_handler.prediction_cache = None
+
+    samples = rng.random((max(BATCH_SIZES), 12)) * 10
+    records = [dict(zip(contract.request_fields, row.tolist())) for row in samples]
+
+    print(f"{'records':>8} | {'single ms':>10} | {'batch ms':>10} | {'single rec/s':>13} | {'batch rec/s':>12} | {'speedup':>7}")
+    print("-" * 76)
+    for n in BATCH_SIZES:
+        events = [{"body": json.dumps(record)} for record in records[:n]]
+        batch_event = {"body": json.dumps(records[:n])}
+
+        start = time.perf_counter()
+        for event in events:
+            lambda_handler.lambda_handler(event, None)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = lambda_handler.lambda_handler(batch_event, None)
+        batch = time.perf_counter() - start
+        assert json.loads(response["body"])["failed"] == 0
+
+        print(
+            f"{n:>8} | {single * 1e3:>10.1f} | {batch * 1e3:>10.1f} | "
+            f"{n / single:>13.0f} | {n / batch:>12.0f} | {single / batch:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
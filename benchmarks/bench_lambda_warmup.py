@@ -0,0 +1,93 @@
+"""
+Benchmark: first request after a Lambda cold start, with and without priming
+
+Bakes the production-sized RandomForest (200 trees, depth 20) as model.pkl
+and model.arrays, then in fresh interpreters loads it through
+lambda_handler.load_model_from_s3() and times the first and second request.
+"no prime" replaces lambda_handler.prime() with a no-op.
+
+Run: python benchmarks/bench_lambda_warmup.py
+"""
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+
+def child(prime: bool) -> None:
+    """One cold start in this interpreter; prints load/first/second request ms as JSON"""
+    import lambda_handler
+
+    if not prime:
+        lambda_handler.prime = lambda *args: None
+    lambda_handler.prediction_cache = None
+
+    start = time.perf_counter()
+    lambda_handler.load_model_from_s3()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for alcohol in (11.3, 9.1):
+        event = {"body": json.dumps({**lambda_handler.WARMUP_RECORD, "alcohol": alcohol})}
+        start = time.perf_counter()
+        lambda_handler.lambda_handler(event, None)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(json.dumps({"load_ms": load_ms, "first_ms": timings[0], "second_ms": timings[1]}))
+
+
+def main():
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from src.feature_contract import FeatureContract
+    from src.inference import FEATURE_COLUMNS, model_version_of
+    from src.model_artifact import save_artifact
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.random((6000, 12)) * 10, columns=FEATURE_COLUMNS)
+    y = X["alcohol"] * 0.4 + np.sin(X["pH"]) + rng.random(6000)
+    model = RandomForestRegressor(n_estimators=200, max_depth=20, random_state=42, n_jobs=1).fit(X, y)
+
+    print(f"{'format':<8} | {'priming':<8} | {'load ms':>8} | {'1st request ms':>14} | {'2nd request ms':>14}")
+    print("-" * 66)
+    with tempfile.TemporaryDirectory() as directory:
+        data = pickle.dumps(model)
+        with open(os.path.join(directory, "model.pkl"), "wb") as f:
+            f.write(data)
+        save_artifact(model, os.path.join(directory, "model.arrays"), FeatureContract.from_model(model), model_version_of(data))
+
+        for fmt in ("arrays", "pickle"):
+            for prime in (True, False):
+                env = {
+                    **os.environ,
+                    "BAKED_MODEL_PATH": os.path.join(directory, "model.pkl"),
+                    "MODEL_FORMAT": "auto" if fmt == "arrays" else "pickle",
+                }
+                results = []
+                for _ in range(RUNS):
+                    out = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--child", "prime" if prime else "none"],
+                        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+                    ).stdout
+                    results.append(json.loads(out.strip().splitlines()[-1]))
+                median = {key: float(np.median([r[key] for r in results])) for key in results[0]}
+                print(
+                    f"{fmt:<8} | {'prime' if prime else 'none':<8} | {median['load_ms']:>8.1f} | "
+                    f"{median['first_ms']:>14.3f} | {median['second_ms']:>14.3f}"
+                )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        child(sys.argv[2] == "prime")
+    else:
+        main()
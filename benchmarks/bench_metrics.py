@@ -0,0 +1,101 @@
+"""
+Benchmark: overhead of the /metrics instrumentation
+
+Measures the per-request cost of the stage timer and histogram flush on its
+own, then /predict latency with metrics switched on and off (alternating
+rounds so drift affects both sides equally).
+
+Run: python benchmarks/bench_metrics.py
+"""
+import os
+import sys
+import statistics
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LinearRegression
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api  # noqa: E402
+from src.feature_contract import FeatureContract  # noqa: E402
+from src.inference import FEATURE_COLUMNS  # noqa: E402
+from src.metrics import NULL_TIMER, Metrics, RequestTimer  # noqa: E402
+from src.model_reloader import LoadedModel  # noqa: E402
+
+STAGES = ["validate", "load_model", "featurize", "predict", "rate", "serialize"]
+NUMBER = 50000
+ROUNDS = 10
+REQUESTS_PER_ROUND = 300
+
+BODY = {
+    "fixed_acidity": 7.4, "volatile_acidity": 0.7, "citric_acid": 0.0,
+    "residual_sugar": 1.9, "chlorides": 0.076, "free_sulfur_dioxide": 11.0,
+    "total_sulfur_dioxide": 34.0, "density": 0.9978, "pH": 3.51,
+    "sulphates": 0.56, "alcohol": 9.4, "wine_type_encoded": 0
+}
+
+
+def instrumented_request(metrics: Metrics) -> None:
+    timer = RequestTimer()
+    for stage in STAGES:
+        timer.mark(stage)
+    metrics.record("/predict", 200, timer, time.perf_counter())
+
+
+def null_request() -> None:
+    timer = NULL_TIMER
+    for stage in STAGES:
+        timer.mark(stage)
+
+
+def request_latencies(client: TestClient) -> list:
+    latencies = []
+    for _ in range(REQUESTS_PER_ROUND):
+        start = time.perf_counter()
+        client.post("/predict", json=BODY)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    metrics = Metrics()
+    on = min(timeit.repeat(lambda: instrumented_request(metrics), number=NUMBER, repeat=3)) / NUMBER
+    off = min(timeit.repeat(null_request, number=NUMBER, repeat=3)) / NUMBER
+    print("Instrumentation only (6 stage marks + histogram flush):")
+    print(f"  enabled   {on * 1e6:>8.2f} µs/request")
+    print(f"  disabled  {off * 1e6:>8.2f} µs/request")
+
+    rng = np.random.default_rng(0)
+    model = LinearRegression().fit(
+        pd.DataFrame(rng.random((200, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS), rng.random(200) * 10
+    )
+    api.install_model(LoadedModel(model, FeatureContract.from_model(model), version="bench"))
+    # Measure model calls, not cache hits
+    api.prediction_cache = None
+    client = TestClient(api.app)
+    request_latencies(client)  # warm up
+
+    samples = {True: [], False: []}
+    for _ in range(ROUNDS):
+        for enabled in (True, False):
+            api.metrics.enabled = enabled
+            samples[enabled].extend(request_latencies(client))
+    api.metrics.enabled = True
+
+    print(f"\n/predict through TestClient ({ROUNDS * REQUESTS_PER_ROUND} requests each):")
+    for enabled, label in ((True, "metrics on"), (False, "metrics off")):
+        latencies = sorted(samples[enabled])
+        print(
+            f"  {label:<12} p50 {statistics.median(latencies) * 1e6:>8.1f} µs"
+            f"   p99 {latencies[int(len(latencies) * 0.99)] * 1e6:>8.1f} µs"
+        )
+    overhead = statistics.median(samples[True]) - statistics.median(samples[False])
+    print(f"  median overhead: {overhead * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
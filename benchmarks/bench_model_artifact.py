@@ -0,0 +1,126 @@
+"""
+Benchmark: memory-mapped model artifact vs pickle
+
+Saves each model type as model.pkl and model.arrays (as steps/save_model.py
+does), then loads each file in a fresh interpreter and reports load time
+(including importing the estimator's library), first single-row predict
+time, and resident memory after loading and after scoring 10k rows.
+
+Run: python benchmarks/bench_model_artifact.py
+"""
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feature_contract import FeatureContract  # noqa: E402
+from src.inference import model_version_of  # noqa: E402
+from src.model_artifact import save_artifact  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 3
+
+
+def make_models():
+    from lightgbm import LGBMRegressor
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+    from xgboost import XGBRegressor
+
+    return {
+        "RandomForest (200 trees, depth 20)": RandomForestRegressor(n_estimators=200, max_depth=20, random_state=42, n_jobs=1),
+        "LightGBM (200 trees)": LGBMRegressor(n_estimators=200, verbose=-1, n_jobs=1),
+        "XGBoost (200 trees, depth 8)": XGBRegressor(n_estimators=200, max_depth=8, n_jobs=1),
+        "LinearRegression": LinearRegression(),
+    }
+
+
+def rss_mb() -> float:
+    """Current resident set size"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def child(path: str) -> None:
+    """Load one model file in this fresh interpreter and print the measurements as JSON"""
+    from src.model_artifact import load_artifact
+
+    rows = np.random.default_rng(0).random((10_000, 12)) * 10
+    baseline = rss_mb()
+
+    start = time.perf_counter()
+    if path.endswith(".pkl"):
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+    else:
+        model = load_artifact(path)[0]
+    load_ms = (time.perf_counter() - start) * 1000
+    after_load = rss_mb()
+
+    start = time.perf_counter()
+    model.predict(rows[:1])
+    first_ms = (time.perf_counter() - start) * 1000
+    model.predict(rows)
+    after_predict = rss_mb()
+
+    print(json.dumps({
+        "load_ms": load_ms,
+        "first_predict_ms": first_ms,
+        "load_rss_mb": after_load - baseline,
+        "predict_rss_mb": after_predict - baseline,
+    }))
+
+
+def measure(path: str) -> dict:
+    """Median of RUNS fresh-interpreter loads"""
+    results = []
+    for _ in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", path],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return {key: float(np.median([r[key] for r in results])) for key in results[0]}
+
+
+def main():
+    import pandas as pd
+    from src.inference import FEATURE_COLUMNS
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.random((6000, 12)) * 10, columns=FEATURE_COLUMNS)
+    y = X["alcohol"] * 0.4 + np.sin(X["pH"]) + rng.random(6000)
+
+    print(f"{'model':<36} | {'format':<7} | {'size MB':>7} | {'load ms':>8} | {'1st pred ms':>11} | "
+          f"{'RSS load MB':>11} | {'RSS 10k MB':>10}")
+    print("-" * 110)
+    with tempfile.TemporaryDirectory() as directory:
+        for label, model in make_models().items():
+            model.fit(X, y)
+            data = pickle.dumps(model)
+            pickle_path = os.path.join(directory, "model.pkl")
+            artifact_path = os.path.join(directory, "model.arrays")
+            with open(pickle_path, "wb") as f:
+                f.write(data)
+            save_artifact(model, artifact_path, FeatureContract.from_model(model), model_version_of(data))
+
+            for fmt, path in (("pickle", pickle_path), ("arrays", artifact_path)):
+                result = measure(path)
+                print(
+                    f"{label:<36} | {fmt:<7} | {os.path.getsize(path) / 1e6:>7.1f} | {result['load_ms']:>8.1f} | "
+                    f"{result['first_predict_ms']:>11.2f} | {result['load_rss_mb']:>11.1f} | {result['predict_rss_mb']:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: multi-source ingestion, sequential vs concurrent
+
+1. Remote sources: red + white wine CSVs from a throttled local HTTP server,
+   loaded one after the other (the old combined path) vs load_sources()
+2. Large local files: several CSVs parsed one after the other vs
+   load_sources() (a process pool on multi-core hosts)
+3. Combine: pd.concat vs concat_frames, wall time and peak traced memory
+
+Run: python benchmarks/bench_multi_source.py [--latency-ms 150] [--mbps 5] [--local-files 4] [--local-rows 1000000]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_dataset_cache import serve, wine_csv  # noqa: E402
+from src.data_ingestion import concat_frames, load_sources, read_source  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def timed(fn, runs: int):
+    """(median wall time in ms, last result)"""
+    times, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return float(np.median(times)), result
+
+
+def traced_peak(fn) -> float:
+    """Peak memory traced while running fn, MB"""
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / MB
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-source ingestion benchmark")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="First-byte latency of the remote sources")
+    parser.add_argument("--mbps", type=float, default=5.0, help="Bandwidth per remote source, MB/s")
+    parser.add_argument("--local-files", type=int, default=4, help="Large local CSVs")
+    parser.add_argument("--local-rows", type=int, default=1_000_000, help="Rows per local CSV")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per measurement")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    import pandas as pd
+
+    print("1. Remote red (1,599 rows) + white (4,898 rows)")
+    red, white = serve(wine_csv(1599), args.latency_ms / 1000, args.mbps * MB), \
+        serve(wine_csv(4898), args.latency_ms / 1000, args.mbps * MB)
+    sources = [(red[1], "red"), (white[1], "white")]
+    sequential, _ = timed(lambda: pd.concat([read_source(*s) for s in sources], ignore_index=True), args.runs)
+    concurrent, _ = timed(lambda: concat_frames(load_sources(sources)), args.runs)
+    for httpd, _ in (red, white):
+        httpd.shutdown()
+        httpd.server_close()
+    print(f"   sequential {sequential:.0f} ms, concurrent {concurrent:.0f} ms\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.local_files):
+            path = os.path.join(tmp, f"wine-{i}.csv")
+            with open(path, "wb") as f:
+                f.write(wine_csv(args.local_rows))
+            paths.append((path, "red" if i % 2 else "white"))
+        size = sum(os.path.getsize(p) for p, _ in paths) / MB
+        print(f"2. {args.local_files} local files, {args.local_rows:,} rows each ({size:.0f} MB, {os.cpu_count()} cores)")
+        sequential, frames = timed(lambda: [read_source(*p) for p in paths], args.runs)
+        concurrent, _ = timed(lambda: load_sources(paths), args.runs)
+        pool = "process pool" if (os.cpu_count() or 1) > 1 else "threads (single core)"
+        print(f"   sequential {sequential:.0f} ms, load_sources {concurrent:.0f} ms ({pool})\n")
+
+    rows = sum(len(df) for df in frames)
+    print(f"3. Combine {len(frames)} frames ({rows:,} rows)")
+    concat_ms, _ = timed(lambda: pd.concat(frames, ignore_index=True), args.runs)
+    typed_ms, _ = timed(lambda: concat_frames(frames), args.runs)
+    concat_peak = traced_peak(lambda: pd.concat(frames, ignore_index=True))
+    typed_peak = traced_peak(lambda: concat_frames(frames))
+    print(f"   pd.concat     {concat_ms:.0f} ms, peak {concat_peak:.0f} MB")
+    print(f"   concat_frames {typed_ms:.0f} ms, peak {typed_peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
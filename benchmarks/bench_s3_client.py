@@ -0,0 +1,104 @@
+"""
+Benchmark: repeated small-object S3 reads with and without a pooled client
+
+Reads small objects (feature contract / manifest sized) from the local S3
+stand-in, which adds first-byte latency and a per-connection setup delay
+standing in for the TCP + TLS handshake:
+
+- client per read: boto3.client() for every read, as when every S3Handler()
+  (or request) built its own client and connection pool
+- shared client: src.s3_client.get_s3_client(), one client and keep-alive
+  connections reused across reads
+- threaded: 32 threads reading through one shared client whose pool is
+  botocore's default (10) or S3_MAX_POOL_CONNECTIONS (50); a pool smaller
+  than the threads discards connections and keeps reconnecting
+
+Run: python benchmarks/bench_s3_client.py [--reads 200] [--handshake-ms 30]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.s3_client import client_config, get_s3_client, reset_s3_clients  # noqa: E402
+from tests.local_s3 import LocalS3  # noqa: E402
+
+BUCKET = "bench-bucket"
+OBJECTS = 50
+THREADS = 32
+
+
+def read(client, i: int) -> float:
+    start = time.perf_counter()
+    client.get_object(Bucket=BUCKET, Key=f"small/{i % OBJECTS}.json")["Body"].read()
+    return (time.perf_counter() - start) * 1000
+
+
+def fresh_client(endpoint: str, **config):
+    return boto3.client(
+        "s3", region_name="us-east-1", endpoint_url=endpoint,
+        aws_access_key_id="bench", aws_secret_access_key="bench", config=client_config(**config),
+    )
+
+
+def report(label: str, samples, wall_s: float) -> None:
+    values = np.asarray(samples)
+    print(f"{label:<42} | {np.percentile(values, 50):>7.2f} | {np.percentile(values, 99):>7.2f} | "
+          f"{len(values) / wall_s:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pooled S3 client benchmark")
+    parser.add_argument("--reads", type=int, default=200, help="Reads per scenario")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="First-byte latency per GET")
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Setup delay per new connection")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+    with LocalS3(latency=args.latency_ms / 1000, connect_latency=args.handshake_ms / 1000) as s3:
+        for i in range(OBJECTS):
+            s3.put(BUCKET, f"small/{i}.json", os.urandom(2048))
+        endpoint = s3.endpoint_url
+        fresh_client(endpoint)  # load botocore's service models outside the measurements
+
+        print(f"{args.reads} reads of 2 KB objects; {args.latency_ms:g} ms first byte, "
+              f"{args.handshake_ms:g} ms per new connection\n")
+        print(f"{'scenario':<42} | {'p50 ms':>7} | {'p99 ms':>7} | {'reads/s':>9}")
+        print("-" * 74)
+
+        samples = []
+        start = time.perf_counter()
+        for i in range(args.reads):
+            begin = time.perf_counter()
+            read(fresh_client(endpoint), i)
+            samples.append((time.perf_counter() - begin) * 1000)
+        report("client per read (creation + read)", samples, time.perf_counter() - start)
+
+        reset_s3_clients()
+        client = get_s3_client("us-east-1", endpoint)
+        start = time.perf_counter()
+        samples = [read(get_s3_client("us-east-1", endpoint), i) for i in range(args.reads)]
+        report("shared client, sequential", samples, time.perf_counter() - start)
+
+        for label, pool in (("default pool (10)", 10), ("shared pool (50)", None)):
+            threaded = client if pool is None else fresh_client(endpoint, max_pool_connections=pool)
+            threaded_reads = args.reads * 4
+            with ThreadPoolExecutor(max_workers=THREADS) as executor:
+                # Connections are opened lazily; measure a warmed-up pool
+                list(executor.map(lambda i: read(threaded, i), range(THREADS)))
+                start = time.perf_counter()
+                samples = list(executor.map(lambda i: read(threaded, i), range(threaded_reads)))
+            report(f"{THREADS} threads, {label}", samples, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
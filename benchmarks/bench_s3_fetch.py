@@ -0,0 +1,94 @@
+"""
+Benchmark: model download + deserialize from S3
+
+Uploads the production-sized RandomForest pickle (raw, zstd and lz4) to the
+local S3 stand-in, throttled like S3 (first-byte latency, per-connection
+bandwidth), and compares:
+
+- download_file: boto3's managed transfer to a file, then read + unpickle
+  (the previous Lambda path)
+- ranged: src.s3_fetch.RangedFetcher into memory, then unpickle, across
+  concurrency and part sizes
+
+Run: python benchmarks/bench_s3_fetch.py [--latency-ms 20] [--mbps 80]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import lz4.frame
+import numpy as np
+import zstandard
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.s3_fetch import RangedFetcher  # noqa: E402
+from tests.local_s3 import LocalS3  # noqa: E402
+
+BUCKET = "bench-bucket"
+MB = 1024 * 1024
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="S3 model fetch benchmark")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="First-byte latency per GET")
+    parser.add_argument("--mbps", type=float, default=80.0, help="Bandwidth per connection, MB/s")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = rng.random((6000, 12)) * 10
+    model = RandomForestRegressor(n_estimators=200, max_depth=20, random_state=42, n_jobs=1).fit(X, X[:, 10] * 0.6)
+    raw = pickle.dumps(model)
+    pickle.loads(raw)  # import sklearn outside the measurements
+
+    objects = {"raw": raw}
+    objects["zstd-3"], zstd_ms = timed(lambda: zstandard.ZstdCompressor(level=3, threads=-1).compress(raw))
+    objects["lz4"], lz4_ms = timed(lambda: lz4.frame.compress(raw))
+    print(f"Model pickle {len(raw) / MB:.1f} MB; zstd-3 {len(objects['zstd-3']) / MB:.1f} MB ({zstd_ms:.0f} ms), "
+          f"lz4 {len(objects['lz4']) / MB:.1f} MB ({lz4_ms:.0f} ms)")
+    print(f"S3 stand-in: {args.latency_ms:g} ms first byte, {args.mbps:g} MB/s per connection\n")
+
+    with LocalS3(latency=args.latency_ms / 1000, bandwidth=args.mbps * MB) as s3, tempfile.TemporaryDirectory() as tmp:
+        for name, data in objects.items():
+            # Codec metadata as S3Handler.upload_file records it; the fetcher decompresses only on that
+            s3.put(BUCKET, name, data, metadata=None if name == "raw" else {"codec": name.split("-")[0]})
+        client = s3.client()
+
+        print(f"{'method':<28} | {'object':<7} | {'fetch ms':>9} | {'unpickle ms':>11} | {'total ms':>9}")
+        print("-" * 76)
+
+        def report(method, name, fetch_ms, unpickle_ms):
+            print(f"{method:<28} | {name:<7} | {fetch_ms:>9.0f} | {unpickle_ms:>11.0f} | {fetch_ms + unpickle_ms:>9.0f}")
+
+        path = os.path.join(tmp, "model.pkl")
+
+        def download_file():
+            client.download_file(BUCKET, "raw", path)
+            with open(path, "rb") as f:
+                return f.read()
+
+        content, fetch_ms = timed(download_file)
+        _, unpickle_ms = timed(lambda: pickle.loads(content))
+        report("download_file + read", "raw", fetch_ms, unpickle_ms)
+
+        for concurrency, part_mb in ((1, 8), (4, 8), (10, 8), (10, 4), (16, 8), (32, 2)):
+            fetcher = RangedFetcher(client, concurrency=concurrency, part_size=part_mb * MB)
+            for name in (("raw", "zstd-3", "lz4") if (concurrency, part_mb) == (10, 8) else ("raw",)):
+                (content, _), fetch_ms = timed(lambda: fetcher.fetch(BUCKET, name, spill_path=None))
+                assert content == raw
+                _, unpickle_ms = timed(lambda: pickle.loads(content))
+                report(f"ranged x{concurrency}, {part_mb} MB parts", name, fetch_ms, unpickle_ms)
+
+
+if __name__ == "__main__":
+    main()
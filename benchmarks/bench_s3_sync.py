@@ -0,0 +1,118 @@
+"""
+Benchmark: mirroring the artifact tree to and from S3
+
+Builds an artifact tree like the pipeline's (one large model, a model
+artifact, and many small params/metrics/dataset files), then against the
+local S3 stand-in, throttled like S3, compares:
+
+- sequential: S3Handler.upload_file / download_file one file after another
+  (what steps/save_model.py did), single-stream or with boto3's default
+  multipart settings
+- sync: S3Handler.sync_directory with parallel files and multipart parts
+- re-sync: sync_directory again with nothing changed (size + hash skip)
+
+Run: python benchmarks/bench_s3_sync.py [--latency-ms 20] [--mbps 80]
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from boto3.s3.transfer import TransferConfig
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.s3_utils import S3Handler  # noqa: E402
+from tests.local_s3 import LocalS3  # noqa: E402
+
+BUCKET = "bench-bucket"
+MB = 1024 * 1024
+
+
+def build_tree(root: str) -> int:
+    files = {"models/model.pkl": 96 * MB, "models/model.arrays": 48 * MB}
+    files.update({f"metrics/run_{i:02d}.json": 4096 for i in range(24)})
+    files.update({f"params/trial_{i:02d}.json": 512 for i in range(24)})
+    files.update({f"datasets/shard_{i}.parquet": 4 * MB for i in range(8)})
+    for relative, size in files.items():
+        path = os.path.join(root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+    return sum(files.values())
+
+
+def handler_for(s3, config: TransferConfig, workers: int) -> S3Handler:
+    handler = S3Handler(bucket_name=BUCKET, region="us-east-1", transfer_config=config)
+    # Enough pooled connections for every file's parts in flight
+    handler.s3_client = s3.client(max_pool_connections=max(10, workers * config.max_request_concurrency))
+    return handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="S3 artifact tree sync benchmark")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="First-byte latency per request")
+    parser.add_argument("--mbps", type=float, default=80.0, help="Bandwidth per connection, MB/s")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "artifacts")
+        total = build_tree(tree)
+        count = sum(len(files) for _, _, files in os.walk(tree))
+        print(f"Artifact tree: {count} files, {total / MB:.0f} MB; "
+              f"S3 stand-in: {args.latency_ms:g} ms first byte, {args.mbps:g} MB/s per connection\n")
+        print(f"{'method':<48} | {'upload s':>8} | {'download s':>10}")
+        print("-" * 74)
+
+        # Single stream per file: no multipart, no parallel files
+        single = TransferConfig(multipart_threshold=1 << 40, max_concurrency=1, use_threads=False)
+        configs = [
+            ("sequential, single stream", single, None),
+            ("sequential, boto3 default multipart (previous)", TransferConfig(), None),
+            ("sync x8 files, 8 MB parts x10", TransferConfig(multipart_threshold=8 * MB, multipart_chunksize=8 * MB, max_concurrency=10), 8),
+            ("sync x8 files, 16 MB parts x16", TransferConfig(multipart_threshold=16 * MB, multipart_chunksize=16 * MB, max_concurrency=16), 8),
+        ]
+        for label, config, workers in configs:
+            with LocalS3(latency=args.latency_ms / 1000, bandwidth=args.mbps * MB) as s3:
+                handler = handler_for(s3, config, workers or 1)
+                target = os.path.join(tmp, "copy")
+                shutil.rmtree(target, ignore_errors=True)
+                start = time.perf_counter()
+                if workers is None:
+                    for root, _, files in os.walk(tree):
+                        for name in files:
+                            path = os.path.join(root, name)
+                            handler.upload_file(path, "mirror/" + os.path.relpath(path, tree))
+                    upload_s = time.perf_counter() - start
+                    start = time.perf_counter()
+                    for key in handler.list_objects("mirror/"):
+                        path = os.path.join(target, key[len("mirror/"):])
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        handler.download_file(key, path)
+                    download_s = time.perf_counter() - start
+                else:
+                    handler.sync_directory(tree, "mirror", max_workers=workers)
+                    upload_s = time.perf_counter() - start
+                    start = time.perf_counter()
+                    handler.sync_directory(target, "mirror", direction="download", max_workers=workers)
+                    download_s = time.perf_counter() - start
+                print(f"{label:<48} | {upload_s:>8.2f} | {download_s:>10.2f}")
+
+                if label.startswith("sync x8 files, 8 MB"):
+                    start = time.perf_counter()
+                    result = handler.sync_directory(tree, "mirror", max_workers=workers)
+                    upload_s = time.perf_counter() - start
+                    start = time.perf_counter()
+                    handler.sync_directory(target, "mirror", direction="download", max_workers=workers)
+                    download_s = time.perf_counter() - start
+                    print(f"{'re-sync, nothing changed (' + str(len(result['skipped'])) + ' skipped)':<48} | "
+                          f"{upload_s:>8.2f} | {download_s:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
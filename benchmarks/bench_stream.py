@@ -0,0 +1,85 @@
+"""
+Benchmark: /predict/stream throughput and memory
+
+Feeds a synthetic UCI-format CSV (one pre-rendered piece repeated, never
+held whole in memory) through the streaming scorer and reports rows/sec,
+then the peak Python heap allocated in a second, traced pass. Peak memory
+should stay flat as the upload grows.
+
+Run: python benchmarks/bench_stream.py
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api  # noqa: E402
+from src.feature_contract import FeatureContract  # noqa: E402
+from src.inference import FEATURE_COLUMNS  # noqa: E402
+from src.model_reloader import LoadedModel  # noqa: E402
+from src.stream_parser import StreamParser  # noqa: E402
+
+ROW_COUNTS = [100_000, 1_000_000]
+UPLOAD_PIECE_ROWS = 2000  # rows per network read
+
+
+def upload_piece(rng: np.random.Generator) -> bytes:
+    values = rng.random((UPLOAD_PIECE_ROWS, len(FEATURE_COLUMNS)))
+    return ("\n".join(";".join(f"{v:.4f}" for v in row) for row in values) + "\n").encode()
+
+
+async def csv_upload(n_rows: int, piece: bytes):
+    """UCI-style ';' CSV body, produced piece by piece like a chunked upload"""
+    header = ";".join(f'"{name}"' for name in FEATURE_COLUMNS[:-1] + ["quality"])
+    yield (header + "\n").encode()
+    for _ in range(n_rows // UPLOAD_PIECE_ROWS):
+        yield piece
+
+
+async def run(n_rows: int, loaded: LoadedModel, piece: bytes, trace: bool) -> tuple:
+    parser = StreamParser(loaded.contract, "csv", chunk_rows=api.STREAM_CHUNK_ROWS)
+    body = csv_upload(n_rows, piece)
+
+    out_bytes = 0
+    summary = None
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    async for chunk in api.stream_scores(parser, body, [], loaded):
+        out_bytes += len(chunk)
+        summary = chunk
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    if trace:
+        tracemalloc.stop()
+    return seconds, peak, out_bytes, summary
+
+
+def main():
+    rng = np.random.default_rng(42)
+    model = RandomForestRegressor(n_estimators=50, max_depth=10, random_state=42, n_jobs=1)
+    model.fit(pd.DataFrame(rng.random((2000, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS), rng.random(2000) * 10)
+    loaded = LoadedModel(model, FeatureContract.from_model(model), version="bench")
+    api.executor = api.InferenceExecutor(kind="inline")
+
+    piece = upload_piece(rng)
+
+    print(f"chunk_rows={api.STREAM_CHUNK_ROWS}")
+    print(f"{'rows':>10} | {'seconds':>8} | {'rows/s':>10} | {'peak heap MB':>12} | {'output MB':>9}")
+    print("-" * 62)
+    for n_rows in ROW_COUNTS:
+        seconds, _, out_bytes, summary = asyncio.run(run(n_rows, loaded, piece, trace=False))
+        _, peak, _, _ = asyncio.run(run(n_rows, loaded, piece, trace=True))
+        print(f"{n_rows:>10} | {seconds:>8.2f} | {n_rows / seconds:>10.0f} | {peak / 1e6:>12.1f} | {out_bytes / 1e6:>9.1f}")
+    print(f"last summary: {summary.strip()}")
+
+
+if __name__ == "__main__":
+    main()
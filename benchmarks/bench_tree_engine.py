@@ -0,0 +1,76 @@
+"""
+Benchmark: flat-array tree engine vs native predict
+
+Trains the production-sized RandomForest (200 trees, depth 20) plus LightGBM
+and XGBoost models, checks the engine reproduces each native predict, then
+reports latency and rows/sec for batch sizes 1 to 100k.
+
+Run: python benchmarks/bench_tree_engine.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMRegressor
+from sklearn.ensemble import RandomForestRegressor
+from xgboost import XGBRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feature_contract import silence_feature_name_warning  # noqa: E402
+from src.inference import FEATURE_COLUMNS  # noqa: E402
+from src.tree_engine import TreeEnsemble  # noqa: E402
+
+BATCH_SIZES = [1, 10, 100, 1000, 10_000, 100_000]
+# Repeat small batches until at least this much time has been measured
+MIN_SECONDS = 0.5
+
+MODELS = {
+    "RandomForest (200 trees, depth 20)": lambda: RandomForestRegressor(
+        n_estimators=200, max_depth=20, random_state=42, n_jobs=1
+    ),
+    "LightGBM (200 trees)": lambda: LGBMRegressor(n_estimators=200, verbose=-1, n_jobs=1),
+    "XGBoost (200 trees, depth 8)": lambda: XGBRegressor(n_estimators=200, max_depth=8, n_jobs=1),
+}
+
+
+def seconds_per_call(fn, X: np.ndarray) -> float:
+    fn(X)  # warm up
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS or (len(X) >= 10_000 and calls >= 2):
+            return elapsed / calls
+
+
+def main():
+    silence_feature_name_warning()
+    rng = np.random.default_rng(42)
+    X_train = pd.DataFrame(rng.random((6000, len(FEATURE_COLUMNS))) * 10, columns=FEATURE_COLUMNS)
+    y_train = X_train["alcohol"] * 0.4 + np.sin(X_train["pH"]) + rng.random(6000)
+    X_all = rng.random((max(BATCH_SIZES), len(FEATURE_COLUMNS))) * 10
+
+    for label, make_model in MODELS.items():
+        model = make_model().fit(X_train, y_train)
+        ensemble = TreeEnsemble.from_model(model)
+        error = np.abs(ensemble.predict(X_all[:10_000]) - model.predict(X_all[:10_000])).max()
+
+        print(f"\n{label}: {ensemble.n_nodes} nodes, {ensemble.nbytes / 1e6:.1f} MB, max |engine - native| = {error:.2e}")
+        print(f"{'batch':>8} | {'native ms':>10} | {'engine ms':>10} | {'native rows/s':>14} | {'engine rows/s':>14} | {'speedup':>7}")
+        print("-" * 80)
+        for n in BATCH_SIZES:
+            X = X_all[:n]
+            native = seconds_per_call(model.predict, X)
+            engine = seconds_per_call(ensemble.predict, X)
+            print(
+                f"{n:>8} | {native * 1e3:>10.3f} | {engine * 1e3:>10.3f} | "
+                f"{n / native:>14.0f} | {n / engine:>14.0f} | {native / engine:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Local Lambda emulator: cold and warm latency of lambda_handler
+
+Serves a model from the local S3 stand-in (tests/local_s3.py) and invokes
+lambda_handler / health_check with API Gateway-shaped events:
+
+- cold: each run is a fresh interpreter with an empty /tmp, like a new
+  execution environment; the first /predict pays for import, download,
+  deserialize and priming
+- warm: one reused interpreter serves --warm-requests invocations per event
+  type (single /predict, /predict with a batch body, /health), with the
+  prediction cache off so every /predict reaches the model
+
+The JSON report (p50/p95/p99 latency, peak RSS, cold-start phase breakdown)
+is meant to be committed or kept per commit and compared with --compare.
+
+Run: python benchmarks/lambda_emulator.py [--format arrays|pickle] [--output report.json] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUCKET = "emulator-bucket"
+BATCH_SIZE = 100
+PERCENTILES = (50, 95, 99)
+
+
+def api_gateway_event(method: str, path: str, body: Any = None) -> Dict[str, Any]:
+    """REST API (proxy integration) event, as API Gateway sends it"""
+    return {
+        "resource": path,
+        "path": path,
+        "httpMethod": method,
+        "headers": {"Content-Type": "application/json", "Host": "localhost"},
+        "queryStringParameters": None,
+        "pathParameters": None,
+        "requestContext": {"resourcePath": path, "httpMethod": method, "stage": "local", "requestId": "emulator"},
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+def sample_records(n: int, seed: int) -> List[Dict[str, float]]:
+    from src.inference import REQUEST_FIELDS
+
+    rng = np.random.default_rng(seed)
+    rows = rng.random((n, len(REQUEST_FIELDS))) * [12, 1.2, 0.8, 10, 0.2, 50, 150, 0.01, 1, 1, 5, 1] + \
+        [4, 0.1, 0, 1, 0.01, 1, 6, 0.99, 2.8, 0.3, 8, 0]
+    rows[:, -1] = rows[:, -1].round()
+    return [dict(zip(REQUEST_FIELDS, row.tolist())) for row in rows]
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples_ms)
+    summary = {f"p{p}_ms": round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    summary.update(mean_ms=round(float(values.mean()), 3), n=len(values))
+    return summary
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def child(mode: str, result_path: str, warm_requests: int) -> None:
+    """One emulated execution environment; writes its measurements to result_path"""
+    started = time.perf_counter()
+    import lambda_handler
+
+    result: Dict[str, Any] = {}
+    records = sample_records(max(warm_requests, BATCH_SIZE), seed=1)
+
+    begin = time.perf_counter()
+    response = lambda_handler.lambda_handler(api_gateway_event("POST", "/predict", records[0]), None)
+    first_ms = (time.perf_counter() - begin) * 1000
+    if response["statusCode"] != 200:
+        raise RuntimeError(f"/predict failed: {response['body']}")
+    result["first_invoke_ms"] = first_ms
+    result["init_to_first_response_ms"] = (time.perf_counter() - started) * 1000
+    result["cold_start"] = dict(lambda_handler.cold_start)
+
+    if mode == "warm":
+        events = {
+            "predict": [api_gateway_event("POST", "/predict", record) for record in records[1:warm_requests + 1]],
+            "predict_batch": [api_gateway_event("POST", "/predict", records[:BATCH_SIZE])] * max(warm_requests // 10, 10),
+            "health": [api_gateway_event("GET", "/health")] * warm_requests,
+        }
+        result["warm"] = {}
+        for name, batch in events.items():
+            handler = lambda_handler.health_check if name == "health" else lambda_handler.lambda_handler
+            timings = []
+            for event in batch:
+                begin = time.perf_counter()
+                handler(event, None)
+                timings.append((time.perf_counter() - begin) * 1000)
+            result["warm"][name] = summarize(timings)
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    with open(result_path, "w") as f:
+        json.dump(result, f)
+
+
+def run_child(mode: str, env: Dict[str, str], warm_requests: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = os.path.join(tmp, "result.json")
+        # A fresh /tmp per execution environment, so cold runs really download
+        env = {**env, "MODEL_CACHE_DIR": tmp}
+        begin = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, result_path, str(warm_requests)],
+            cwd=REPO_ROOT, env=env, check=True, stdout=subprocess.DEVNULL,
+        )
+        wall_ms = (time.perf_counter() - begin) * 1000
+        with open(result_path) as f:
+            result = json.load(f)
+    result["process_wall_ms"] = wall_ms
+    return result
+
+
+def upload_model(s3, model_path: str, fmt: str) -> Dict[str, Any]:
+    """Put model.pkl, its contract and (for --format arrays) model.arrays into the stand-in bucket"""
+    import lambda_handler
+    from src.feature_contract import FeatureContract, load_contract
+    from src.inference import model_version_of
+    from src.model_artifact import save_artifact
+
+    with open(model_path, "rb") as f:
+        data = f.read()
+    model = pickle.loads(data)
+    contract = load_contract(model_path, model)
+    s3.put(BUCKET, lambda_handler.MODEL_KEY, data)
+    s3.put(BUCKET, lambda_handler.CONTRACT_KEY, json.dumps(contract.to_dict()).encode())
+    info = {"model_type": type(model).__name__, "pickle_mb": round(len(data) / 1e6, 1)}
+
+    if fmt == "arrays":
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.arrays")
+            save_artifact(model, path, FeatureContract.from_dict(contract.to_dict()), model_version_of(data))
+            with open(path, "rb") as f:
+                artifact = f.read()
+        s3.put(BUCKET, lambda_handler.ARTIFACT_KEY, artifact)
+        info["artifact_mb"] = round(len(artifact) / 1e6, 1)
+    return info
+
+
+def train_model(path: str, n_estimators: int) -> None:
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from src.inference import FEATURE_COLUMNS
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.random((6000, len(FEATURE_COLUMNS))) * 10, columns=FEATURE_COLUMNS)
+    y = X["alcohol"] * 0.4 + np.sin(X["pH"]) + rng.random(6000)
+    model = RandomForestRegressor(n_estimators=n_estimators, max_depth=20, random_state=42, n_jobs=1).fit(X, y)
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_report(args, model_info: Dict[str, Any], cold_runs: List[Dict], warm_run: Dict) -> Dict[str, Any]:
+    phases = ("import_ms", "s3_fetch_ms", "deserialize_ms", "first_predict_ms")
+    return {
+        "commit": git_commit(),
+        "config": {
+            "format": args.format,
+            "cold_runs": args.cold_runs,
+            "warm_requests": args.warm_requests,
+            "s3_latency_ms": args.latency_ms,
+            "s3_mbps_per_connection": args.mbps,
+            **model_info,
+        },
+        "cold": {
+            "first_invoke": summarize([run["first_invoke_ms"] for run in cold_runs]),
+            "init_to_first_response": summarize([run["init_to_first_response_ms"] for run in cold_runs]),
+            "process_wall": summarize([run["process_wall_ms"] for run in cold_runs]),
+            "phases_p50_ms": {
+                phase: round(float(np.median([run["cold_start"].get(phase, 0.0) for run in cold_runs])), 2)
+                for phase in phases
+            },
+            "model_source": sorted({run["cold_start"].get("model_source") for run in cold_runs}),
+            "peak_rss_mb": max(run["peak_rss_mb"] for run in cold_runs),
+        },
+        "warm": {**warm_run["warm"], "peak_rss_mb": warm_run["peak_rss_mb"]},
+    }
+
+
+def flatten(report: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    values = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> None:
+    """Print every numeric metric of two reports side by side"""
+    before, after = flatten(old), flatten(new)
+    print(f"\n{'metric':<48} | {old.get('commit', 'old'):>10} | {new.get('commit', 'new'):>10} | {'change':>8}")
+    print("-" * 86)
+    for key in sorted(set(before) & set(after)):
+        if key.startswith("config.") or key.endswith(".n"):
+            continue
+        change = f"{(after[key] - before[key]) / before[key]:+.1%}" if before[key] else ""
+        print(f"{key:<48} | {before[key]:>10.2f} | {after[key]:>10.2f} | {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=None, help="model.pkl to serve (default: train a 200-tree forest)")
+    parser.add_argument("--n-estimators", type=int, default=200, help="Trees in the trained forest")
+    parser.add_argument("--format", choices=("arrays", "pickle"), default="arrays", help="Upload model.arrays as well")
+    parser.add_argument("--cold-runs", type=int, default=5, help="Fresh-interpreter cold starts")
+    parser.add_argument("--warm-requests", type=int, default=500, help="Invocations per event type in the warm process")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="S3 stand-in first-byte latency")
+    parser.add_argument("--mbps", type=float, default=80.0, help="S3 stand-in bandwidth per connection, MB/s")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--compare", default=None, help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    from tests.local_s3 import LocalS3
+
+    with tempfile.TemporaryDirectory() as tmp, LocalS3(latency=args.latency_ms / 1000, bandwidth=args.mbps * 1e6) as s3:
+        model_path = args.model
+        if model_path is None:
+            model_path = os.path.join(tmp, "model.pkl")
+            print(f"🌲 Training a {args.n_estimators}-tree forest...")
+            train_model(model_path, args.n_estimators)
+        model_info = upload_model(s3, model_path, args.format)
+
+        env = {
+            **os.environ,
+            "S3_BUCKET_NAME": BUCKET,
+            "S3_ENDPOINT_URL": s3.endpoint_url,
+            "AWS_ACCESS_KEY_ID": "emulator",
+            "AWS_SECRET_ACCESS_KEY": "emulator",
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "BAKED_MODEL_PATH": os.path.join(tmp, "no-baked-model", "model.pkl"),
+            # Warm runs replay events; with the prediction cache on they'd measure cache hits, not the model
+            "PREDICTION_CACHE_SIZE": "0",
+            "PYTHONPATH": REPO_ROOT,
+        }
+        print(f"🧊 {args.cold_runs} cold starts...")
+        cold_runs = [run_child("cold", env, 0) for _ in range(args.cold_runs)]
+        print(f"🔥 Warm process, {args.warm_requests} invocations per event type...")
+        warm_run = run_child("warm", env, args.warm_requests)
+
+    report = build_report(args, model_info, cold_runs, warm_run)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main()
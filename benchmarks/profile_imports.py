@@ -0,0 +1,137 @@
+"""
+Profile: per-module import cost of the Lambda handler
+
+Runs `python -X importtime -c "import lambda_handler"` in fresh interpreters,
+takes the median of each module over the runs, and prints the slowest
+imports plus the self time summed per top-level package. Exits non-zero
+when the total exceeds --budget-ms or a forbidden package (training-only
+dependencies by default) gets imported, so it can run as a CI check.
+
+Run: python benchmarks/profile_imports.py [--module lambda_handler] [--runs 5] [--json report.json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages only the training pipeline needs; the handler must not import them
+TRAINING_PACKAGES = ["optuna", "xgboost", "lightgbm", "pandas", "mlflow", "zenml"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str, env: Dict[str, str]) -> List[Dict]:
+    """One -X importtime run: [{module, self_us, cumulative_us, depth}] for module and what it imported"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+
+    # Rows are printed after their children: module's subtree is the run of
+    # nested rows just before it (interpreter startup, e.g. site, comes earlier)
+    end = max(i for i, row in enumerate(rows) if row["module"] == module and row["depth"] == 0)
+    start = end
+    while start > 0 and rows[start - 1]["depth"] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def profile(module: str, runs: int, env: Dict[str, str]) -> Dict:
+    """Median self/cumulative time per module over several fresh interpreters"""
+    self_us, cumulative_us, depth = defaultdict(list), defaultdict(list), {}
+    for _ in range(runs):
+        for row in import_times(module, env):
+            self_us[row["module"]].append(row["self_us"])
+            cumulative_us[row["module"]].append(row["cumulative_us"])
+            depth.setdefault(row["module"], row["depth"])
+
+    modules = {
+        name: {
+            "self_ms": statistics.median(self_us[name]) / 1000,
+            "cumulative_ms": statistics.median(cumulative_us[name]) / 1000,
+            "depth": depth[name],
+        }
+        for name in self_us
+    }
+    packages = defaultdict(float)
+    for name, times in modules.items():
+        packages[name.split(".")[0]] += times["self_ms"]
+
+    return {
+        "module": module,
+        "runs": runs,
+        "total_ms": modules[module]["cumulative_ms"],
+        "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        "modules": modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="lambda_handler", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to take the median over")
+    parser.add_argument("--top", type=int, default=20, help="Slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when the total import time exceeds this")
+    parser.add_argument("--forbid", default=",".join(TRAINING_PACKAGES), help="Comma-separated packages that must not be imported")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the full report here")
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    report = profile(args.module, args.runs, env)
+    modules = report["modules"]
+
+    print(f"import {args.module}: {report['total_ms']:.1f} ms (median of {args.runs} runs, "
+          f"LAMBDA_IMPORT_MODE={os.getenv('LAMBDA_IMPORT_MODE', 'lean')})\n")
+
+    print(f"{'package':<24} | {'self ms':>8} | {'share':>6}")
+    print("-" * 46)
+    for package, ms in list(report["packages"].items())[:args.top]:
+        print(f"{package:<24} | {ms:>8.1f} | {ms / report['total_ms']:>6.1%}")
+
+    print(f"\n{'module (by cumulative)':<48} | {'self ms':>8} | {'cumul ms':>8}")
+    print("-" * 72)
+    slowest = sorted(modules.items(), key=lambda item: -item[1]["cumulative_ms"])[:args.top]
+    for name, times in slowest:
+        print(f"{name:<48} | {times['self_ms']:>8.1f} | {times['cumulative_ms']:>8.1f}")
+
+    forbidden = [p for p in args.forbid.split(",") if p and p in report["packages"]]
+    report["forbidden_imported"] = forbidden
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.json_path}")
+
+    failed = False
+    if forbidden:
+        print(f"\n❌ Training-only packages imported: {', '.join(forbidden)}")
+        failed = True
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"\n❌ Import time {report['total_ms']:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("\n✅ Import profile within limits")
+
+
+if __name__ == "__main__":
+    main()
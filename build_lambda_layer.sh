@@ -14,12 +14,14 @@ mkdir -p lambda_layer/python
 cd lambda_layer/python
 
 # Install dependencies for the layer
-echo "📦 Installing scikit-learn, numpy, scipy, joblib..."
+echo "📦 Installing scikit-learn, numpy, scipy, joblib, zstandard, lz4..."
 pip install \
     scikit-learn \
     numpy \
     scipy \
     joblib \
+    zstandard \
+    lz4 \
     --target . \
     --platform manylinux2014_x86_64 \
     --implementation cp \
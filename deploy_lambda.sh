@@ -30,15 +30,19 @@ cd lambda_package
 # Copy Lambda handler
 cp ../lambda_handler.py .
 
-# Copy only s3_utils.py (not entire src folder)
+# Copy only the serving modules the handler imports (same list as the Dockerfile)
 mkdir -p src
-cp ../src/s3_utils.py src/ 2>/dev/null || touch src/__init__.py
+for module in __init__ compression inference feature_contract prediction_cache s3_cache s3_client s3_fetch tree_engine model_artifact; do
+    cp "../src/${module}.py" src/
+done
 
 # Install ONLY scikit-learn and numpy (no pandas to reduce size)
 echo "📦 Installing scikit-learn + numpy (minimal)..."
 pip install --target . \
     scikit-learn \
     numpy \
+    zstandard \
+    lz4 \
     --platform manylinux2014_x86_64 \
     --implementation cp \
     --python-version 3.12 \
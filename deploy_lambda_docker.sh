@@ -74,6 +74,18 @@ rm /tmp/ecr-policy.json
 echo ""
 
 # Step 2: Build Docker image
+# BAKE_MODEL=true copies the current S3 model into the image so cold starts skip the S3 download
+mkdir -p baked_model
+rm -f baked_model/model.pkl baked_model/feature_contract.json baked_model/model.arrays
+if [ "${BAKE_MODEL:-false}" = "true" ]; then
+    echo "🍞 Baking s3://${BUCKET_NAME}/models/model.pkl into the image..."
+    aws s3 cp "s3://${BUCKET_NAME}/models/model.pkl" baked_model/model.pkl --region "$REGION"
+    aws s3 cp "s3://${BUCKET_NAME}/models/feature_contract.json" baked_model/feature_contract.json --region "$REGION" \
+        || echo "⚠️  No feature contract in S3, the handler will derive it from the model"
+    aws s3 cp "s3://${BUCKET_NAME}/models/model.arrays" baked_model/model.arrays --region "$REGION" \
+        || echo "⚠️  No model artifact in S3, the handler will unpickle the model"
+fi
+
 echo "🐳 Step 2: Building Docker image..."
 docker build --platform linux/amd64 -t "$ECR_REPO_NAME:$IMAGE_TAG" .
 echo "✅ Docker image built"
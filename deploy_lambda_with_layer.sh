@@ -34,12 +34,14 @@ mkdir -p lambda_layer/python
 cd lambda_layer/python
 
 # Install dependencies for the layer
-echo "📦 Installing scikit-learn, numpy, scipy, joblib..."
+echo "📦 Installing scikit-learn, numpy, scipy, joblib, zstandard, lz4..."
 pip install \
     scikit-learn \
     numpy \
     scipy \
     joblib \
+    zstandard \
+    lz4 \
     --target . \
     --platform manylinux2014_x86_64 \
     --implementation cp \
@@ -113,9 +115,11 @@ cd lambda_package
 # Copy Lambda handler
 cp ../lambda_handler.py .
 
-# Copy s3_utils
+# Copy only the serving modules the handler imports (same list as the Dockerfile)
 mkdir -p src
-cp ../src/s3_utils.py src/ 2>/dev/null || touch src/__init__.py
+for module in __init__ compression inference feature_contract prediction_cache s3_cache s3_client s3_fetch tree_engine model_artifact; do
+    cp "../src/${module}.py" src/
+done
 
 # NO dependencies installed - they come from layer
 echo "📏 Package size: $(du -sh . | cut -f1)"
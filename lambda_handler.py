@@ -2,42 +2,208 @@
 AWS Lambda handler for Wine Quality Prediction
 Loads model from S3 and serves predictions
 """
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import base64
 import json
 import pickle
 import os
-import boto3
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+# lean: boto3 (over half of the import time) is imported when S3 is first needed,
+# so a baked or already-loaded model never pays for it.
+# eager: import it during init, for provisioned concurrency where init runs before traffic.
+IMPORT_MODE = os.getenv('LAMBDA_IMPORT_MODE', 'lean')
+if IMPORT_MODE == 'eager':
+    import boto3  # noqa: F401
+
+from src.compression import decompress_bytes, is_compressed
+from src.feature_contract import CONTRACT_FILENAME, FeatureContract, contract_path_for, silence_feature_name_warning
+from src.inference import clip_scores, model_version_of, rate_scores
+from src.model_artifact import ARTIFACT_FILENAME, MODEL_FORMAT, current_artifact, load_artifact
+from src.prediction_cache import PredictionCache
+from src.s3_cache import fetch_cached
+from src.s3_client import get_s3_client
+from src.tree_engine import compile_model
+
+# Cold-start phase durations in ms (import, s3_fetch, deserialize, first_predict)
+cold_start = {'import_ms': round((time.perf_counter() - _IMPORT_STARTED) * 1000, 2)}
 
 # Global variables for model caching
 model = None
+model_version = None
+tree_engine = None  # flat-array copy of tree ensembles, faster than model.predict for one row
 s3_client = None
+# Keep-warm pings served by this execution environment
+warm_state = {'warmups': 0, 'last_warmup': None}
+
+# Feature order for the loaded model, and a row buffer reused across invocations
+contract = FeatureContract.default()
+row_buffer = contract.new_row()
+silence_feature_name_warning()
 
 # Configuration
 BUCKET_NAME = os.getenv('S3_BUCKET_NAME', 'wine-quality-mlops-sujan')
 MODEL_KEY = 'models/model.pkl'
+CONTRACT_KEY = f'models/{CONTRACT_FILENAME}'
+ARTIFACT_KEY = f'models/{ARTIFACT_FILENAME}'
 REGION = os.getenv('AWS_DEFAULT_REGION', 'us-east-2')  # Lambda provides AWS_DEFAULT_REGION
+S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL')  # e.g. a local S3 stand-in
+# Model copied into the image at build time (deploy_lambda_docker.sh with BAKE_MODEL=true); skips S3 entirely
+BAKED_MODEL_PATH = os.getenv(
+    'BAKED_MODEL_PATH', os.path.join(os.getenv('LAMBDA_TASK_ROOT', '/var/task'), 'baked_model', 'model.pkl')
+)
+# Downloads survive in /tmp for the life of the execution environment and are revalidated by ETag
+MODEL_CACHE_DIR = os.getenv('MODEL_CACHE_DIR', '/tmp')
+# Upper bound on records scored in one invocation (JSON array body or Records event)
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '10000'))
+# Representative sample (a typical red wine) run through the feature path by warm-ups
+WARMUP_RECORD = {
+    "fixed_acidity": 7.9, "volatile_acidity": 0.52, "citric_acid": 0.26,
+    "residual_sugar": 2.2, "chlorides": 0.079, "free_sulfur_dioxide": 14.0,
+    "total_sulfur_dioxide": 38.0, "density": 0.9968, "pH": 3.31,
+    "sulphates": 0.62, "alcohol": 10.2, "wine_type_encoded": 0
+}
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', '10000'))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', '3600'))
+
+# Scores for resubmitted measurements, kept for the life of the execution environment
+prediction_cache = (
+    PredictionCache(contract.feature_names, max_size=PREDICTION_CACHE_SIZE, ttl_seconds=PREDICTION_CACHE_TTL)
+    if PREDICTION_CACHE_SIZE > 0 else None
+)
+
+
+def load_contract_from_s3(loaded_model) -> FeatureContract:
+    """Download the feature contract saved next to the model, or derive it from the model"""
+    local_contract_path = os.path.join(MODEL_CACHE_DIR, CONTRACT_FILENAME)
+    try:
+        fetch_cached(s3_client, BUCKET_NAME, CONTRACT_KEY, local_contract_path)
+        return FeatureContract.load(local_contract_path)
+    except Exception as e:
+        print(f"⚠️  No feature contract in S3 ({e}), deriving it from the model")
+        return FeatureContract.from_model(loaded_model)
+
+
+def fetch_artifact() -> Optional[Tuple[str, Optional[bytes]]]:
+    """
+    (local path, in-memory content) of the model's memory-mappable artifact,
+    or None when S3 has no artifact at least as new as the pickle (e.g. a
+    model uploaded without one)
+    """
+    try:
+        fetched = fetch_cached(
+            s3_client, BUCKET_NAME, ARTIFACT_KEY, os.path.join(MODEL_CACHE_DIR, ARTIFACT_FILENAME), keep_in_memory=True
+        )
+        pickle_modified = s3_client.head_object(Bucket=BUCKET_NAME, Key=MODEL_KEY)['LastModified'].isoformat()
+    except Exception as e:
+        print(f"⚠️  No model artifact in S3 ({e}), unpickling the model")
+        return None
+    if fetched['last_modified'] < pickle_modified:
+        print(f"⚠️  s3://{BUCKET_NAME}/{ARTIFACT_KEY} is older than the model, unpickling the model")
+        return None
+    cold_start['model_source'] = 's3' if fetched['downloaded'] else 'tmp_cache'
+    cold_start['model_codec'] = fetched.get('codec')
+    print(f"✅ Model artifact s3://{BUCKET_NAME}/{ARTIFACT_KEY} ({fetched['etag']}) ready")
+    return os.path.join(MODEL_CACHE_DIR, ARTIFACT_FILENAME), fetched['data']
+
+
+def fetch_model() -> Tuple[str, Optional[bytes]]:
+    """
+    The current model: the baked-in copy, or an ETag-validated copy in /tmp.
+    The memory-mappable artifact is preferred over the pickle.
+
+    Returns:
+        (local path, content) - a fresh S3 download that fits in memory is
+        returned as content (its /tmp copy is written in the background),
+        otherwise content is None and the model is read from the path
+    """
+    global s3_client
+
+    baked_artifact = current_artifact(BAKED_MODEL_PATH)
+    if baked_artifact is not None:
+        cold_start['model_source'] = 'baked'
+        return baked_artifact, None
+    if os.path.exists(BAKED_MODEL_PATH):
+        cold_start['model_source'] = 'baked'
+        return BAKED_MODEL_PATH, None
+
+    # Shared pooled client (boto3 is imported here on first use)
+    if s3_client is None:
+        s3_client = get_s3_client(REGION, S3_ENDPOINT_URL)
+
+    if MODEL_FORMAT != 'pickle':
+        artifact = fetch_artifact()
+        if artifact is not None:
+            return artifact
+
+    local_model_path = os.path.join(MODEL_CACHE_DIR, 'model.pkl')
+    fetched = fetch_cached(s3_client, BUCKET_NAME, MODEL_KEY, local_model_path, keep_in_memory=True)
+    cold_start['model_source'] = 's3' if fetched['downloaded'] else 'tmp_cache'
+    cold_start['model_codec'] = fetched.get('codec')
+    print(f"✅ Model s3://{BUCKET_NAME}/{MODEL_KEY} ({fetched['etag']}) ready")
+    return local_model_path, fetched['data']
 
 
 def load_model_from_s3():
     """Download and load model from S3"""
-    global model, s3_client
+    global model, model_version, tree_engine, contract, row_buffer
 
     if model is not None:
         return model
 
     try:
-        # Initialize S3 client
-        if s3_client is None:
-            s3_client = boto3.client('s3', region_name=REGION)
-
-        # Download model from S3 to /tmp
-        local_model_path = '/tmp/model.pkl'
-        s3_client.download_file(BUCKET_NAME, MODEL_KEY, local_model_path)
-        print(f"✅ Downloaded model from s3://{BUCKET_NAME}/{MODEL_KEY}")
-
-        # Load model
-        with open(local_model_path, 'rb') as f:
-            model = pickle.load(f)
+        started = time.perf_counter()
+        local_model_path, data = fetch_model()
+        fetched = time.perf_counter()
+
+        # Load model (from memory when it was just downloaded, no /tmp round trip)
+        if os.path.basename(local_model_path) == ARTIFACT_FILENAME:
+            if data is None and is_compressed(local_model_path):
+                # A baked copy of an artifact uploaded compressed can't be mapped; decompress it into memory
+                with open(local_model_path, 'rb') as f:
+                    data = decompress_bytes(f.read())
+            # Arrays used in place: no unpickling, and sklearn/lightgbm/xgboost are never imported
+            loaded_model, loaded_contract, loaded_version = load_artifact(data if data is not None else local_model_path)
+        else:
+            if data is None:
+                with open(local_model_path, 'rb') as f:
+                    data = f.read()
+            # S3 downloads arrive decompressed; this covers a compressed baked copy
+            data = decompress_bytes(data)
+            loaded_model = pickle.loads(data)
+            loaded_version = model_version_of(data)
+            if local_model_path != BAKED_MODEL_PATH:
+                loaded_contract = load_contract_from_s3(loaded_model)
+            elif os.path.exists(contract_path_for(BAKED_MODEL_PATH)):
+                # Contracts uploaded before they went up uncompressed were baked as zstd/lz4 frames
+                with open(contract_path_for(BAKED_MODEL_PATH), 'rb') as f:
+                    loaded_contract = FeatureContract.from_dict(json.loads(decompress_bytes(f.read())))
+            else:
+                loaded_contract = FeatureContract.from_model(loaded_model)
+        loaded_engine = compile_model(loaded_model)
+        deserialized = time.perf_counter()
+
+        # First predict pays for page faults and lazy allocations before a request does
+        prime(loaded_model, loaded_engine, loaded_contract)
+        warmed = time.perf_counter()
+
+        contract = loaded_contract
+        row_buffer = contract.new_row()
+        model_version = loaded_version
+        tree_engine = loaded_engine
+        model = loaded_model
+        if prediction_cache is not None:
+            prediction_cache.invalidate(contract.feature_names)
+
+        cold_start.update(
+            s3_fetch_ms=round((fetched - started) * 1000, 2),
+            deserialize_ms=round((deserialized - fetched) * 1000, 2),
+            first_predict_ms=round((warmed - deserialized) * 1000, 2),
+        )
+        print(json.dumps({'cold_start': cold_start, 'model_version': model_version}))
         print("✅ Model loaded successfully")
 
         return model
@@ -47,21 +213,187 @@ def load_model_from_s3():
         raise
 
 
+def prime(loaded_model, loaded_engine, loaded_contract: FeatureContract) -> None:
+    """
+    Pre-touch the model's memory (all pages of a memory-mapped artifact) and
+    run WARMUP_RECORD through the single-record and batch feature paths.
+    The prediction cache is bypassed, so warm-ups don't skew its stats.
+    """
+    if loaded_engine is not None:
+        loaded_engine.touch()
+    row = loaded_contract.fill_row_from_dict(WARMUP_RECORD)
+    matrix, _, _ = loaded_contract.fill_matrix_from_dicts([WARMUP_RECORD, WARMUP_RECORD])
+    for features in (row, matrix):
+        if loaded_engine is not None:
+            prediction = loaded_engine.predict(features)
+        else:
+            prediction = loaded_model.predict(loaded_contract.model_input(features))
+        rate_scores(clip_scores(prediction))
+
+
+def is_warmup_event(event: Dict[str, Any]) -> bool:
+    """Keep-warm ping: {"warmup": true}, an EventBridge schedule or serverless-plugin-warmup"""
+    return (
+        event.get('warmup') is True
+        or event.get('detail-type') == 'Scheduled Event'
+        or event.get('source') == 'serverless-plugin-warmup'
+    )
+
+
+def warm_up() -> Dict[str, Any]:
+    """Load the model if this environment is cold, otherwise re-prime it. Returns the warm state"""
+    started = time.perf_counter()
+    cold = model is None
+    if cold:
+        load_model_from_s3()  # primes the new model
+    else:
+        prime(model, tree_engine, contract)
+    warm_state['warmups'] += 1
+    warm_state['last_warmup'] = time.time()
+    return {
+        'warm': True,
+        'was_cold': cold,
+        'model_version': model_version,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def score_features(features: np.ndarray) -> np.ndarray:
+    """Clipped 0-10 scores for a feature matrix, reusing cached scores of resubmitted samples"""
+    if prediction_cache is not None:
+        keys = [prediction_cache.make_key(row, model_version) for row in features]
+        cached = [prediction_cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(cached) if score is None]
+    else:
+        keys, cached, missing = None, None, list(range(len(features)))
+
+    scores = np.empty(len(features)) if cached is None else np.array(cached, dtype=np.float64)
+    if missing:
+        # One vectorized call for every uncached row
+        uncached = features if len(missing) == len(features) else features[missing]
+        if tree_engine is not None and len(uncached) <= tree_engine.max_rows:
+            prediction = tree_engine.predict(uncached)
+        else:
+            prediction = model.predict(contract.model_input(uncached))
+        fresh = clip_scores(prediction)
+        scores[missing] = fresh
+        if keys is not None:
+            for i, score in zip(missing, fresh.tolist()):
+                prediction_cache.put(keys[i], score)
+    return scores
+
+
+def score_records(records: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Score many JSON records with one model call.
+
+    Returns one result per record, in order: the prediction fields, or
+    {'error': ...} for a record that couldn't be scored.
+    """
+    features, kept, errors = contract.fill_matrix_from_dicts(records)
+    results: List[Dict[str, Any]] = [None] * len(records)
+    for i, message in errors.items():
+        results[i] = {'error': message}
+
+    if kept:
+        scores = score_features(features)
+        for i, score, rating in zip(kept, scores.tolist(), rate_scores(scores).tolist()):
+            results[i] = {'prediction': score, 'wine_quality_score': score, 'quality_rating': rating}
+    return results
+
+
+def decode_record(record: Dict[str, Any]) -> Any:
+    """Wine payload of an SQS message or Kinesis record"""
+    if 'kinesis' in record:
+        return json.loads(base64.b64decode(record['kinesis']['data']))
+    body = record.get('body')
+    return json.loads(body) if isinstance(body, str) else body
+
+
+def record_id(record: Dict[str, Any]) -> str:
+    """Identifier AWS expects in batchItemFailures (SQS messageId, Kinesis sequence number)"""
+    if 'kinesis' in record:
+        return record['kinesis']['sequenceNumber']
+    return record.get('messageId')
+
+
+def handle_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    SQS/Kinesis batch: score every record with one model call and report
+    the ones that failed in batchItemFailures (partial batch response), so
+    only those are retried.
+    """
+    if model is None:
+        load_model_from_s3()
+
+    payloads, failures = [], {}
+    for i, record in enumerate(records):
+        try:
+            payloads.append(decode_record(record))
+        except (ValueError, TypeError, KeyError) as e:
+            payloads.append(None)
+            failures[i] = f"Could not decode record: {e}"
+
+    try:
+        results = score_records(payloads)
+    except Exception as e:
+        # The model call itself failed: every record is retried
+        print(f"❌ Batch prediction failed: {e}")
+        results = [{'error': str(e)} for _ in records]
+
+    for i, message in failures.items():
+        results[i] = {'error': message}
+    for record, result in zip(records, results):
+        result['itemIdentifier'] = record_id(record)
+
+    failed = [{'itemIdentifier': result['itemIdentifier']} for result in results if 'error' in result]
+    print(f"✅ Scored {len(records) - len(failed)}/{len(records)} records")
+    return {'batchItemFailures': failed, 'results': results}
+
+
+def response(status_code: int, payload: Dict[str, Any], extra_headers: Dict[str, str] = None) -> Dict[str, Any]:
+    """API Gateway proxy response"""
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Headers': 'Content-Type',
+        'Access-Control-Allow-Methods': 'POST, OPTIONS'
+    }
+    headers.update(extra_headers or {})
+    return {'statusCode': status_code, 'headers': headers, 'body': json.dumps(payload)}
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda handler function
 
+    Accepts an API Gateway event whose body is one wine, a JSON array of
+    wines (or {"records": [...]}), or an SQS/Kinesis event with a Records list.
+
     Args:
-        event: API Gateway event (contains request body)
+        event: API Gateway event (contains request body) or SQS/Kinesis batch event
         context: Lambda context
 
     Returns:
-        API Gateway response with prediction
+        API Gateway response with prediction(s), or a partial batch response for Records events
     """
+    if is_warmup_event(event):
+        # Quiet fast path for keep-warm pings: no request logging, no prediction cache
+        try:
+            return response(200, warm_up())
+        except Exception as e:
+            print(f"❌ Warm-up failed: {e}")
+            return response(500, {'warm': False, 'error': str(e)})
+
+    if isinstance(event.get('Records'), list):
+        return handle_records(event['Records'])
+
     try:
         # Load model if not already loaded
-        if model is None:
+        cold = model is None
+        if cold:
             load_model_from_s3()
+        extra_headers = {'Server-Timing': server_timing()} if cold else None
 
         # Parse request body
         if isinstance(event.get('body'), str):
@@ -69,57 +401,49 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         else:
             body = event.get('body', {})
 
-        # Extract features as numpy array (avoids pandas dependency)
-        import numpy as np
-        features = np.array([[
-            body.get('fixed_acidity'),
-            body.get('volatile_acidity'),
-            body.get('citric_acid'),
-            body.get('residual_sugar'),
-            body.get('chlorides'),
-            body.get('free_sulfur_dioxide'),
-            body.get('total_sulfur_dioxide'),
-            body.get('density'),
-            body.get('pH'),
-            body.get('sulphates'),
-            body.get('alcohol'),
-            body.get('wine_type_encoded', 0)
-        ]])
-
-        # Make prediction
-        prediction = model.predict(features)
-        score = float(prediction[0])
-
-        # Clip to valid range
-        score = max(0, min(10, score))
+        if isinstance(body, dict) and isinstance(body.get('records'), list):
+            body = body['records']
+        if isinstance(body, list):
+            if not body or len(body) > MAX_BATCH_SIZE:
+                return response(400, {
+                    'error': f'Batch must contain 1 to {MAX_BATCH_SIZE} records',
+                    'message': 'Prediction failed'
+                })
+            results = score_records(body)
+            failed = sum('error' in result for result in results)
+            return response(200, {
+                'predictions': results,
+                'count': len(results),
+                'failed': failed,
+                'model_version': 'v1.0',
+                'message': 'Prediction successful' if not failed else f'{failed} record(s) failed'
+            }, extra_headers)
+
+        # Same validation as a batch record, so a wine scores (or fails) the same either way
+        error = contract.record_error(body)
+        if error is None:
+            try:
+                # Fill the reusable row buffer in the contract's feature order (no pandas)
+                features = contract.fill_row_from_dict(body, out=row_buffer)
+            except (TypeError, ValueError) as e:
+                error = f"Invalid value: {e}"
+        if error is not None:
+            return response(400, {'error': error, 'message': 'Prediction failed'})
+
+        # Reuse the score for a resubmitted sample, otherwise predict (clipped to 0-10)
+        score = float(score_features(features)[0])
 
         # Determine quality rating
-        if score < 5:
-            quality_rating = "Poor"
-        elif score < 6:
-            quality_rating = "Average"
-        elif score < 7:
-            quality_rating = "Good"
-        else:
-            quality_rating = "Excellent"
+        quality_rating = str(rate_scores(score))
 
         # Return response
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS'
-            },
-            'body': json.dumps({
-                'prediction': score,
-                'wine_quality_score': score,
-                'quality_rating': quality_rating,
-                'model_version': 'v1.0',
-                'message': 'Prediction successful'
-            })
-        }
+        return response(200, {
+            'prediction': score,
+            'wine_quality_score': score,
+            'quality_rating': quality_rating,
+            'model_version': 'v1.0',
+            'message': 'Prediction successful'
+        }, extra_headers)
 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -136,8 +460,30 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
 
+def server_timing() -> str:
+    """Cold-start phases as a Server-Timing header value"""
+    phases = ('import', 's3_fetch', 'deserialize', 'first_predict')
+    return ', '.join(
+        f"{phase};dur={cold_start[f'{phase}_ms']}" for phase in phases if f'{phase}_ms' in cold_start
+    )
+
+
 def health_check(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    """Health check endpoint for Lambda"""
+    """
+    Health check endpoint for Lambda.
+
+    A warm-up event (or ?warmup=true) loads and primes the model first, so the
+    same ping that checks health also keeps the instance warm.
+    """
+    warmup = None
+    query = (event or {}).get('queryStringParameters') or {}
+    if is_warmup_event(event or {}) or query.get('warmup') == 'true':
+        try:
+            warmup = warm_up()
+        except Exception as e:
+            print(f"❌ Warm-up failed: {e}")
+            warmup = {'warm': False, 'error': str(e)}
+
     return {
         'statusCode': 200,
         'headers': {
@@ -148,6 +494,13 @@ def health_check(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'status': 'healthy',
             'service': 'wine-quality-predictor',
             'version': 'v1.0',
-            'model_loaded': model is not None
+            'model_loaded': model is not None,
+            'model_version': model_version,
+            'warm': model is not None,
+            'warmups': warm_state['warmups'],
+            'warmup': warmup,
+            'tree_engine': tree_engine is not None,
+            'cold_start': cold_start,
+            'cache': prediction_cache.stats() if prediction_cache is not None else {'enabled': False}
         })
     }
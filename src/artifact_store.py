@@ -0,0 +1,288 @@
+"""
+Content-addressed artifact store on top of S3Handler.
+
+Artifacts (model.pkl, model.arrays, the feature contract, best_params.json)
+are stored once per content under their SHA-256:
+
+    <prefix>/sha256/<digest>        immutable blobs
+    <prefix>/manifest.json          name -> current digest, plus recent history
+
+Publishing uploads only blobs S3 doesn't have yet and then swaps the
+manifest with a conditional write (If-Match on its ETag), so two concurrent
+publishers can't silently drop each other's entries. Earlier versions stay
+addressable through the manifest history.
+
+Fetching re-reads the manifest with If-None-Match (a 304 when nothing was
+published) and serves blobs from a local on-disk cache, capped in size and
+evicted least recently used first, so unchanged content is never downloaded
+twice.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from src.compression import S3_UPLOAD_CODEC
+from src.s3_fetch import RangedFetcher
+from src.s3_utils import sha256_file
+
+ARTIFACT_STORE_PREFIX = os.getenv('ARTIFACT_STORE_PREFIX', 'artifacts')
+ARTIFACT_CACHE_DIR = os.getenv('ARTIFACT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'wine-quality-artifacts'))
+ARTIFACT_CACHE_MAX_MB = float(os.getenv('ARTIFACT_CACHE_MAX_MB', '2048'))
+# Versions kept per name in the manifest history
+MANIFEST_HISTORY = int(os.getenv('ARTIFACT_MANIFEST_HISTORY', '20'))
+# Attempts at swapping the manifest when another publisher got there first
+MANIFEST_RETRIES = 5
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _error_code(error: ClientError) -> str:
+    return error.response.get("Error", {}).get("Code", "")
+
+
+class LocalArtifactCache:
+    """Blobs on local disk, named by digest, evicted least recently used first past max_bytes"""
+
+    def __init__(self, directory: str = ARTIFACT_CACHE_DIR, max_bytes: int = int(ARTIFACT_CACHE_MAX_MB * 1024 * 1024)) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest)
+
+    def get(self, digest: str) -> Optional[str]:
+        """Path of a cached blob (marking it recently used), or None"""
+        path = self.path(digest)
+        try:
+            # mtime is the recency mark: atime is unreliable on relatime/noatime mounts
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def add(self, digest: str, source_path: str) -> str:
+        """Move a verified file into the cache and evict to the size cap; returns its cached path"""
+        path = self.path(digest)
+        os.replace(source_path, path)
+        self.evict(keep=digest)
+        return path
+
+    def entries(self):
+        """(mtime, size, digest) of every cached blob, oldest first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not DIGEST_PATTERN.match(name):
+                continue
+            try:
+                stat = os.stat(self.path(name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+        return sorted(entries)
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least recently used blobs until the cache fits max_bytes; returns bytes freed"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, digest in entries:
+            if total - freed <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            try:
+                os.remove(self.path(digest))
+            except FileNotFoundError:
+                continue
+            freed += size
+            logging.info(f"🧹 Evicted {digest[:12]} ({size / 1e6:.1f} MB) from the artifact cache")
+        return freed
+
+
+class ArtifactStore:
+    """Content-addressed artifacts in an S3 bucket, with a local cache"""
+
+    def __init__(self, s3_handler, prefix: str = ARTIFACT_STORE_PREFIX, cache: Optional[LocalArtifactCache] = None) -> None:
+        """
+        Args:
+            s3_handler: src.s3_utils.S3Handler for the artifact bucket
+            prefix: Key prefix of the blobs and the manifest
+            cache: Local blob cache (default: ARTIFACT_CACHE_DIR, capped at ARTIFACT_CACHE_MAX_MB)
+        """
+        self.s3_handler = s3_handler
+        self.prefix = prefix.rstrip("/")
+        self.cache = cache or LocalArtifactCache()
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_etag: Optional[str] = None
+
+    @property
+    def manifest_key(self) -> str:
+        return f"{self.prefix}/manifest.json"
+
+    def blob_key(self, digest: str) -> str:
+        return f"{self.prefix}/sha256/{digest}"
+
+    @property
+    def _manifest_copy(self) -> str:
+        # One local manifest copy per bucket/prefix, so its ETag survives restarts
+        name = hashlib.sha256(f"{self.s3_handler.bucket_name}/{self.manifest_key}".encode()).hexdigest()[:16]
+        return os.path.join(self.cache.directory, f"manifest-{name}.json")
+
+    def _load_manifest_copy(self) -> None:
+        if self._manifest is not None:
+            return
+        try:
+            with open(self._manifest_copy, 'r') as f:
+                saved = json.load(f)
+            self._manifest, self._manifest_etag = saved["manifest"], saved["etag"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def manifest(self) -> Dict[str, Any]:
+        """
+        The current manifest, re-validated with If-None-Match.
+
+        Returns:
+            {"current": {name: entry}, "history": {name: [entry, ...]}}, empty for a new store
+        """
+        self._load_manifest_copy()
+        try:
+            content, etag = self.s3_handler.get_if_changed(self.manifest_key, self._manifest_etag)
+        except ClientError as e:
+            if _error_code(e) not in ("NoSuchKey", "404"):
+                raise
+            self._manifest, self._manifest_etag = {"current": {}, "history": {}}, None
+            return self._manifest
+        if content is None:
+            logging.info(f"♻️  Manifest unchanged (ETag {etag})")
+            return self._manifest
+
+        self._manifest, self._manifest_etag = json.loads(content), etag
+        try:
+            with open(self._manifest_copy, 'w') as f:
+                json.dump({"etag": etag, "manifest": self._manifest}, f)
+        except OSError as e:
+            logging.warning(f"⚠️  Could not keep a local manifest copy: {e}")
+        return self._manifest
+
+    def _upload_blob(self, path: str, digest: str) -> bool:
+        """Upload a blob unless S3 already has it; True when it was uploaded"""
+        key = self.blob_key(digest)
+        try:
+            self.s3_handler.s3_client.head_object(Bucket=self.s3_handler.bucket_name, Key=key)
+            logging.info(f"♻️  {os.path.basename(path)} already stored as {digest[:12]}, not uploading")
+            return False
+        except ClientError as e:
+            if _error_code(e) not in ("404", "NoSuchKey", "NotFound"):
+                raise
+        # Digests are of the uncompressed content; the fetcher decompresses before verifying
+        if not self.s3_handler.upload_file(path, key, codec=S3_UPLOAD_CODEC):
+            raise RuntimeError(f"Could not upload {path} to s3://{self.s3_handler.bucket_name}/{key}")
+        return True
+
+    def publish(self, files: Dict[str, str]) -> Dict[str, str]:
+        """
+        Store files and point the manifest's current entries at them.
+
+        Args:
+            files: Artifact name -> local file (e.g. {"model.pkl": "model.pkl"})
+
+        Returns:
+            Artifact name -> SHA-256 digest
+
+        Raises:
+            RuntimeError: if a blob can't be uploaded or the manifest keeps changing underneath
+        """
+        entries = {}
+        for name, path in files.items():
+            digest = sha256_file(path)
+            self._upload_blob(path, digest)
+            entries[name] = {
+                "sha256": digest,
+                "size": os.path.getsize(path),
+                "published": datetime.now(timezone.utc).isoformat(),
+            }
+
+        for _ in range(MANIFEST_RETRIES):
+            # Re-read right before the swap; If-Match makes the write fail if anyone published in between
+            manifest = json.loads(json.dumps(self.manifest()))
+            for name, entry in entries.items():
+                manifest["current"][name] = entry
+                history = [old for old in manifest["history"].get(name, []) if old["sha256"] != entry["sha256"]]
+                manifest["history"][name] = [entry] + history[:MANIFEST_HISTORY - 1]
+            body = json.dumps(manifest, indent=2).encode()
+            try:
+                if self._manifest_etag:
+                    etag = self.s3_handler.put_bytes(self.manifest_key, body, if_match=self._manifest_etag)
+                else:
+                    etag = self.s3_handler.put_bytes(self.manifest_key, body, if_none_match="*")
+            except ClientError as e:
+                if _error_code(e) not in ("PreconditionFailed", "412", "ConditionalRequestConflict", "NoSuchKey", "404"):
+                    raise
+                logging.info("🔁 Manifest changed while publishing, retrying")
+                continue
+            self._manifest, self._manifest_etag = manifest, etag
+            logging.info(f"✅ Published {', '.join(entries)} to s3://{self.s3_handler.bucket_name}/{self.manifest_key}")
+            return {name: entry["sha256"] for name, entry in entries.items()}
+        raise RuntimeError(f"Manifest s3://{self.s3_handler.bucket_name}/{self.manifest_key} kept changing, gave up publishing")
+
+    def fetch(self, name: str, local_path: Optional[str] = None, digest: Optional[str] = None) -> str:
+        """
+        Local file with an artifact's content, downloaded only if it isn't cached.
+
+        Args:
+            name: Artifact name in the manifest
+            local_path: Copy the content here (None returns the cached blob, which must not be modified)
+            digest: A specific version (default: the manifest's current one)
+
+        Returns:
+            Path of the content (local_path, or the cached blob)
+
+        Raises:
+            KeyError: if the manifest has no such artifact
+            ValueError: if the downloaded content doesn't match its digest
+        """
+        if digest is None:
+            entry = self.manifest()["current"].get(name)
+            if entry is None:
+                raise KeyError(f"No artifact '{name}' in s3://{self.s3_handler.bucket_name}/{self.manifest_key}")
+            digest = entry["sha256"]
+
+        path = self.cache.get(digest)
+        if path is not None:
+            logging.info(f"♻️  {name} ({digest[:12]}) served from the artifact cache")
+        else:
+            path = self._download(digest)
+            logging.info(f"✅ Downloaded {name} ({digest[:12]}) into the artifact cache")
+
+        if local_path is None:
+            return path
+        partial = local_path + ".part"
+        shutil.copyfile(path, partial)
+        os.replace(partial, local_path)
+        return local_path
+
+    def _download(self, digest: str) -> str:
+        partial = os.path.join(self.cache.directory, f"{digest}.part")
+        _, size = RangedFetcher(self.s3_handler.s3_client).fetch(
+            self.s3_handler.bucket_name, self.blob_key(digest), partial, memory_limit=0
+        )
+        if not os.path.exists(partial):
+            open(partial, 'wb').close()  # empty blob
+        actual = sha256_file(partial)
+        if actual != digest:
+            os.remove(partial)
+            raise ValueError(f"Blob {digest} downloaded with SHA-256 {actual}, refusing to cache it")
+        return self.cache.add(digest, partial)
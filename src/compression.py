@@ -0,0 +1,169 @@
+"""
+Compression codecs for artifacts moved through S3.
+
+Uploads are compressed with zstd (or lz4) at a chosen level, and the codec is
+recorded in the object's metadata (x-amz-meta-codec) next to the
+uncompressed size. Readers pick the codec from that metadata, or from the
+frame magic number when all they have is the bytes (a copy made with
+`aws s3 cp`), so compressed and plain objects can sit side by side.
+"""
+import logging
+import os
+from typing import Dict, Optional
+
+# Codec and level for model/params uploads ("none" uploads as-is)
+S3_UPLOAD_CODEC = os.getenv('S3_UPLOAD_CODEC', 'zstd').lower()
+S3_UPLOAD_LEVEL = os.getenv('S3_UPLOAD_LEVEL')
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+LZ4_FRAME_MAGIC = b"\x04\x22\x4d\x18"
+CODECS = ("zstd", "lz4")
+# zstd 3 is its own default (fast, most of the ratio); lz4 0 is its fast mode
+DEFAULT_LEVELS = {"zstd": 3, "lz4": 0}
+COPY_CHUNK = 1024 * 1024
+
+
+def detect_codec(metadata: Optional[Dict[str, str]], prefix: bytes) -> Optional[str]:
+    """Codec an object was compressed with: its 'codec' metadata, else the frame magic number"""
+    codec = (metadata or {}).get('codec')
+    if codec in CODECS:
+        return codec
+    if prefix.startswith(ZSTD_MAGIC):
+        return "zstd"
+    if prefix.startswith(LZ4_FRAME_MAGIC):
+        return "lz4"
+    return None
+
+
+class Decompressor:
+    """A codec's streaming decompressor whose corrupt-frame errors (ZstdError, lz4's RuntimeError) are ValueErrors"""
+
+    def __init__(self, codec: str, stream) -> None:
+        self.codec = codec
+        self._stream = stream
+
+    def decompress(self, chunk: bytes) -> bytes:
+        try:
+            return self._stream.decompress(chunk)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Corrupt {self.codec} frame: {e}") from e
+
+    @property
+    def eof(self) -> bool:
+        return getattr(self._stream, "eof", True)
+
+
+def decompressor(codec: Optional[str]) -> Optional[Decompressor]:
+    """Streaming decompressor with a decompress(chunk) -> bytes method (None for raw objects)"""
+    if codec == "zstd":
+        import zstandard
+        return Decompressor(codec, zstandard.ZstdDecompressor().decompressobj())
+    if codec == "lz4":
+        import lz4.frame
+        return Decompressor(codec, lz4.frame.LZ4FrameDecompressor())
+    if codec is not None:
+        raise ValueError(f"Unsupported codec '{codec}'")
+    return None
+
+
+def upload_codec(codec: Optional[str] = None, level: Optional[int] = None):
+    """
+    (codec, level) to upload with: the arguments, else S3_UPLOAD_CODEC / S3_UPLOAD_LEVEL.
+
+    Returns:
+        (None, None) for uncompressed uploads
+    """
+    codec = (codec or S3_UPLOAD_CODEC).lower()
+    if codec == "none":
+        return None, None
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported codec '{codec}', expected one of {CODECS} or 'none'")
+    if level is None:
+        level = int(S3_UPLOAD_LEVEL) if S3_UPLOAD_LEVEL else DEFAULT_LEVELS[codec]
+    return codec, level
+
+
+def compress_file(source: str, target: str, codec: str, level: int) -> int:
+    """
+    Stream-compress source into target.
+
+    Args:
+        source: File to compress
+        target: Compressed output
+        codec: "zstd" or "lz4"
+        level: Compression level (zstd 1-22 or negative for faster, lz4 0-16)
+
+    Returns:
+        Compressed size in bytes
+    """
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        if codec == "zstd":
+            import zstandard
+            # threads=-1: one worker per core, compressing blocks in parallel
+            zstandard.ZstdCompressor(level=level, threads=-1).copy_stream(src, dst)
+        elif codec == "lz4":
+            import lz4.frame
+            with lz4.frame.LZ4FrameCompressor(compression_level=level) as compressor:
+                dst.write(compressor.begin())
+                for chunk in iter(lambda: src.read(COPY_CHUNK), b""):
+                    dst.write(compressor.compress(chunk))
+                dst.write(compressor.flush())
+        else:
+            raise ValueError(f"Unsupported codec '{codec}'")
+    return os.path.getsize(target)
+
+
+def is_compressed(path: str) -> bool:
+    """Whether a file starts with a zstd/lz4 frame"""
+    with open(path, 'rb') as f:
+        return detect_codec(None, f.read(4)) is not None
+
+
+def decompress_bytes(data: bytes) -> bytes:
+    """data itself, or its decompressed content when it is a zstd/lz4 frame"""
+    stream = decompressor(detect_codec(None, bytes(data[:4])))
+    if stream is None:
+        return data
+    content = stream.decompress(data)
+    if not stream.eof:
+        raise ValueError("Compressed content ends in the middle of a frame")
+    return content
+
+
+def decompress_file(path: str, codec: Optional[str] = None) -> Optional[str]:
+    """
+    Decompress a zstd/lz4 file in place (plain files are left alone).
+
+    Args:
+        path: File to decompress
+        codec: Codec the file is known to be compressed with (e.g. from the
+            object's metadata); None detects it from the frame magic number
+
+    Returns:
+        The codec that was undone, or None
+    """
+    if codec is None:
+        with open(path, 'rb') as f:
+            codec = detect_codec(None, f.read(4))
+    if codec is None:
+        return None
+
+    partial = path + ".decompressing"
+    stream = decompressor(codec)
+    try:
+        with open(path, 'rb') as src, open(partial, 'wb') as dst:
+            for chunk in iter(lambda: src.read(COPY_CHUNK), b""):
+                dst.write(stream.decompress(chunk))
+    except ValueError:
+        os.remove(partial)
+        raise
+    if not stream.eof:
+        os.remove(partial)
+        raise ValueError(f"{path} ends in the middle of a {codec} frame")
+    compressed_size = os.path.getsize(path)
+    os.replace(partial, path)
+    logging.info(f"🗜️  Decompressed {path} ({codec}, {compressed_size / 1e6:.1f} -> {os.path.getsize(path) / 1e6:.1f} MB)")
+    return codec
+
@@ -1,12 +1,15 @@
 import logging
 from abc import ABC,abstractmethod 
-from typing import Union,Tuple
+from typing import Dict, Iterable, Iterator, Optional, Union, Tuple
 
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from typing_extensions import Annotated
 
+from src.chunked_ingestion import DATA_MEMORY_BUDGET_MB, iter_parquet_chunks
+from src.data_schema import apply_schema, encode_wine_type, memory_report
+
 class Datastrategy(ABC):
     """
     Abstract class defiininng strategy for handling data
@@ -41,6 +44,7 @@ class DataPreProcessingStrategy(Datastrategy):
         """
         try:
             logging.info(f"Starting preprocessing. Dataset shape: {data.shape}")
+            memory_report(data, "preprocessing input")
             logging.info(f"Columns: {list(data.columns)}")
 
             # Check for missing values
@@ -53,9 +57,9 @@ class DataPreProcessingStrategy(Datastrategy):
                     if data[col].isnull().any():
                         data[col].fillna(data[col].median(), inplace=True)
 
-            # Encode wine_type if present (red=0, white=1)
+            # Encode wine_type if present (red=0, white=1, as int8)
             if 'wine_type' in data.columns:
-                data['wine_type_encoded'] = data['wine_type'].map({'red': 0, 'white': 1})
+                data['wine_type_encoded'] = encode_wine_type(data['wine_type'])
                 data = data.drop('wine_type', axis=1)
                 logging.info("Encoded wine_type column")
 
@@ -69,13 +73,95 @@ class DataPreProcessingStrategy(Datastrategy):
             if removed_duplicates > 0:
                 logging.info(f"Removed {removed_duplicates} duplicate rows")
 
+            # Keep the compact dtypes (float32 measurements, int8 quality) set at ingestion
+            data = apply_schema(data)
+
             logging.info(f"Preprocessing complete. Final shape: {data.shape}")
+            memory_report(data, "preprocessing output")
             logging.info(f"Final columns: {list(data.columns)}")
 
             return data
         except Exception as e:
             logging.error(f"Error in preprocessing: {e}")
             raise e
+
+    def handle_chunks(self, chunks: Iterable[pd.DataFrame], fill_values: Optional[Dict[str, float]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Preprocess a stream of chunks (see src.chunked_ingestion) without holding more than one.
+
+        Applies the same steps as handle_data, chunk by chunk. Duplicates are
+        dropped across chunks by keeping a sorted array of 64-bit row hashes
+        (8 bytes per row seen, not the rows themselves). Missing values are
+        filled from fill_values, e.g. medians from an earlier pass over a
+        spilled dataset; columns without one use the chunk's own median.
+
+        Args:
+            chunks: Raw chunks with the same columns
+            fill_values: Column -> value to fill missing values with
+
+        Yields:
+            Preprocessed chunks (empty chunks are skipped)
+        """
+        try:
+            seen = np.empty(0, dtype=np.uint64)
+            total = kept = 0
+            for chunk in chunks:
+                total += len(chunk)
+                numeric_columns = chunk.select_dtypes(include=[np.number]).columns
+                missing = [col for col in numeric_columns if chunk[col].isnull().any()]
+                if missing:
+                    fill = {col: (fill_values or {}).get(col, chunk[col].median()) for col in missing}
+                    logging.warning(f"Filling missing values in {missing} at rows {chunk.index[0]}+")
+                    chunk = chunk.fillna(fill)
+
+                if 'wine_type' in chunk.columns:
+                    chunk = chunk.assign(wine_type_encoded=encode_wine_type(chunk['wine_type']))
+                    chunk = chunk.drop('wine_type', axis=1)
+                chunk = apply_schema(chunk.select_dtypes(include=[np.number]))
+
+                # Drop rows already seen in this chunk or an earlier one
+                hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                if len(seen):
+                    earlier = seen[np.minimum(np.searchsorted(seen, hashes), len(seen) - 1)] == hashes
+                else:
+                    earlier = np.zeros(len(hashes), dtype=bool)
+                keep = ~earlier & ~pd.Series(hashes).duplicated().to_numpy()
+                # Two sorted runs: a stable (merge) sort combines them in linear time
+                seen = np.concatenate([seen, np.sort(hashes[keep])])
+                seen.sort(kind='stable')
+                chunk = chunk[keep]
+
+                kept += len(chunk)
+                if len(chunk):
+                    yield chunk
+
+            logging.info(f"Chunked preprocessing complete: kept {kept} of {total} rows ({total - kept} duplicates removed)")
+        except Exception as e:
+            logging.error(f"Error in chunked preprocessing: {e}")
+            raise e
+
+    def handle_spill(self, directory: str, memory_budget_mb: float = DATA_MEMORY_BUDGET_MB) -> pd.DataFrame:
+        """
+        Preprocess a spilled dataset (see src.chunked_ingestion.spill_to_parquet) into one frame.
+
+        The raw rows are read back and cleaned chunk by chunk with
+        handle_chunks; only the cleaned, deduplicated numeric rows in their
+        compact dtypes are combined. That frame is what the model trains on,
+        so it still has to fit in memory; the raw CSV never does.
+
+        Args:
+            directory: Dataset root written by spill_to_parquet
+            memory_budget_mb: Memory one raw chunk may take
+
+        Returns:
+            pd.DataFrame: Preprocessed data, as handle_data would return it
+        """
+        chunks = list(self.handle_chunks(iter_parquet_chunks(directory, memory_budget_mb=memory_budget_mb)))
+        if not chunks:
+            raise ValueError(f"{directory} holds no rows to train on")
+        data = apply_schema(pd.concat(chunks))
+        memory_report(data, "preprocessing output")
+        return data
         
 class DataDivideStrategy(Datastrategy):
     """Strategy to divide wine quality data into train/test"""
@@ -87,8 +173,9 @@ class DataDivideStrategy(Datastrategy):
         Target variable: 'quality' (wine quality score from 0-10)
         """
         try:
-            # The target variable for wine quality dataset is 'quality'
-            X = data.drop("quality", axis=1)
+            # The target variable for wine quality dataset is 'quality'.
+            # Compact dtypes are for storage; models train and score on float64 features
+            X = data.drop("quality", axis=1).astype(np.float64)
             y = data["quality"]
 
             logging.info(f"Splitting data: Features shape: {X.shape}, Target shape: {y.shape}")
@@ -106,6 +193,7 @@ class DataDivideStrategy(Datastrategy):
             y_test = pd.Series(y_test, name="quality")
 
             logging.info(f"Train set: {len(X_train)} samples, Test set: {len(X_test)} samples")
+            memory_report(X_train, "X_train")
 
             return X_train, X_test, y_train, y_test
         except Exception as e:
@@ -0,0 +1,172 @@
+"""
+Concurrent loading of multi-source wine datasets.
+
+ingest_df used to fetch and parse the red and white CSVs one after the other
+and then pd.concat them. load_sources() loads every declared source at once:
+
+- URLs and small local files go to a thread pool. Fetching is I/O-bound, and
+  pandas' C parser releases the GIL for most of a parse.
+- Local files of DATA_PARSE_PROCESS_MB or more are parsed in a process pool
+  (spawned workers, like the inference executor's), so several large files
+  parse on separate cores. Single-core hosts keep them on threads.
+
+concat_frames() then combines the frames into columns preallocated with
+their final dtype, so each value is copied once into place. Categorical
+columns are unioned, so they stay categorical. pd.concat turns categoricals
+whose categories differ (red-only and white-only wine_type) into object
+columns.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.data_schema import csv_dtypes, wine_type_column
+from src.dataset_cache import DatasetCache, combined_hash, is_remote
+
+DATA_INGEST_WORKERS = int(os.getenv('DATA_INGEST_WORKERS', '4'))
+# Local files at least this large are parsed in worker processes
+DATA_PARSE_PROCESS_MB = float(os.getenv('DATA_PARSE_PROCESS_MB', '64'))
+
+MB = 1024 * 1024
+
+
+def read_source(data_url: str, wine_type: str, cache: Optional[DatasetCache] = None) -> pd.DataFrame:
+    """
+    One wine CSV (';'-separated, as the UCI files are) in the src.data_schema dtypes, with its wine_type column.
+
+    Args:
+        data_url: URL or local path of the CSV
+        wine_type: Value of the wine_type column ("red" or "white")
+        cache: Local Parquet cache to serve the dataset from (None always downloads and parses)
+
+    Returns:
+        The frame; with a cache, attrs["dataset_sha256"] holds the hash of the source bytes
+    """
+    # Parsed straight into the compact schema (float32 measurements, int8 quality)
+    read_kwargs = {'sep': ';'}
+    if csv_dtypes() is not None:
+        read_kwargs['dtype'] = csv_dtypes()
+    if cache is not None:
+        df = cache.read_csv(data_url, **read_kwargs)
+    else:
+        df = pd.read_csv(data_url, **read_kwargs)
+    df['wine_type'] = wine_type_column(wine_type, len(df))
+    return df
+
+
+def _parse_in_process(source: str) -> bool:
+    # With one core a worker process only adds spawn and pickling costs
+    if is_remote(source) or (os.cpu_count() or 1) < 2:
+        return False
+    try:
+        return os.path.getsize(source) >= DATA_PARSE_PROCESS_MB * MB
+    except OSError:
+        return False
+
+
+def load_sources(
+    sources: Sequence[Tuple[str, str]],
+    cache: Optional[DatasetCache] = None,
+    max_workers: int = DATA_INGEST_WORKERS,
+) -> List[pd.DataFrame]:
+    """
+    Load several sources concurrently.
+
+    Args:
+        sources: (data_url, wine_type) pairs
+        cache: Local Parquet cache (shared by threads; each worker process opens the same directory)
+        max_workers: Threads, and processes for large local files
+
+    Returns:
+        One frame per source, in the order given
+    """
+    if len(sources) == 1:
+        return [read_source(*sources[0], cache=cache)]
+
+    in_process = [_parse_in_process(url) for url, _ in sources]
+    workers = max(1, min(max_workers, len(sources)))
+    threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+    processes = None
+    if any(in_process):
+        processes = ProcessPoolExecutor(
+            max_workers=min(workers, sum(in_process)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    try:
+        futures = [
+            (processes if parse_here else threads).submit(read_source, url, wine_type, cache)
+            for (url, wine_type), parse_here in zip(sources, in_process)
+        ]
+        frames = [future.result() for future in futures]
+    finally:
+        threads.shutdown(wait=False, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=False, cancel_futures=True)
+    logging.info(
+        f"📥 Loaded {len(sources)} sources concurrently "
+        f"({sum(in_process)} parsed in worker processes): {sum(len(df) for df in frames)} records"
+    )
+    return frames
+
+
+def _column_dtype(frames: Sequence[pd.DataFrame], column: str):
+    """Dtype of a column once the frames are stacked ("category" for categoricals), or None if unsupported"""
+    dtypes = [df[column].dtype for df in frames]
+    if all(isinstance(dtype, np.dtype) and dtype.kind in "biuf" for dtype in dtypes):
+        return np.result_type(*dtypes)
+    if all(dtype == object for dtype in dtypes):
+        return np.dtype(object)
+    if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+        return "category"
+    return None
+
+
+def concat_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Stack frames with identical columns into one, filling preallocated typed columns.
+
+    Categorical columns are combined with the union of their categories, and
+    other extension dtypes (strings, nullable integers) column by column with
+    pd.concat. Frames whose columns differ are combined with pd.concat.
+
+    Returns:
+        The combined frame with a fresh RangeIndex; attrs["dataset_sha256"] is
+        the combined hash when every frame carries one
+    """
+    if len(frames) == 1:
+        return frames[0]
+
+    columns = list(frames[0].columns)
+    same_columns = all(list(df.columns) == columns for df in frames)
+    if not same_columns:
+        combined = pd.concat(frames, ignore_index=True)
+    else:
+        total = sum(len(df) for df in frames)
+        data = {}
+        for column in columns:
+            dtype = _column_dtype(frames, column)
+            if dtype is None:
+                data[column] = pd.concat([df[column] for df in frames], ignore_index=True).array
+                continue
+            if isinstance(dtype, str):  # "category"
+                data[column] = union_categoricals([df[column].array for df in frames])
+                continue
+            values = np.empty(total, dtype=dtype)
+            offset = 0
+            for df in frames:
+                values[offset:offset + len(df)] = df[column].to_numpy(copy=False)
+                offset += len(df)
+            data[column] = values
+        combined = pd.DataFrame(data, columns=columns, copy=False)
+
+    digests = [df.attrs.get("dataset_sha256") for df in frames]
+    combined.attrs = {}
+    if all(digests):
+        combined.attrs["dataset_sha256"] = combined_hash(digests)
+    return combined
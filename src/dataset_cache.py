@@ -0,0 +1,230 @@
+"""
+Local Parquet cache for ingested datasets.
+
+IngestData used to download and re-parse the UCI CSVs on every pipeline run.
+DatasetCache keeps each parsed frame as Parquet, keyed by its source URL, and
+re-validates it with a conditional GET (If-None-Match on the ETag,
+If-Modified-Since on Last-Modified). An unchanged dataset is one 304 and a
+Parquet read. Local files are validated by size and modification time
+instead.
+
+The Parquet file carries the pandas dtypes and a "wine_quality" metadata
+entry with the validators, the column dtypes and the SHA-256 of the raw
+source bytes. That hash is attached to the frame as df.attrs["dataset_sha256"]
+so downstream steps can tell which data a model was trained on.
+
+With DATASET_OFFLINE=true (or offline=True) a cached dataset is served
+without touching the network, and a missing one is an error. When the source
+can't be reached, the cached copy is used with a warning.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+DATASET_CACHE_DIR = os.getenv('DATASET_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'wine-quality-datasets'))
+DATASET_CACHE_MAX_MB = float(os.getenv('DATASET_CACHE_MAX_MB', '512'))
+DATASET_OFFLINE = os.getenv('DATASET_OFFLINE', 'false').lower() == 'true'
+DATASET_FETCH_TIMEOUT = float(os.getenv('DATASET_FETCH_TIMEOUT', '30'))
+
+METADATA_KEY = b"wine_quality"
+
+
+def is_remote(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+def combined_hash(digests) -> str:
+    """One SHA-256 for a dataset assembled from several sources, in order"""
+    return hashlib.sha256("\n".join(digests).encode()).hexdigest()
+
+
+class DatasetCache:
+    """Parsed datasets as Parquet files on local disk, evicted least recently used first past max_bytes"""
+
+    def __init__(
+        self,
+        directory: str = DATASET_CACHE_DIR,
+        max_bytes: int = int(DATASET_CACHE_MAX_MB * 1024 * 1024),
+        offline: bool = DATASET_OFFLINE,
+        timeout: float = DATASET_FETCH_TIMEOUT,
+    ) -> None:
+        """
+        Args:
+            directory: Where the Parquet files live
+            max_bytes: Size cap of the cache directory
+            offline: Serve cached datasets without re-validating them
+            timeout: Seconds to wait on the source before falling back to the cache
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.timeout = timeout
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, source: str, read_kwargs: Optional[Dict[str, Any]] = None) -> str:
+        # Parse options are part of the key: the same URL read with another separator is another frame
+        key = json.dumps([source, read_kwargs or {}], sort_keys=True, default=str)
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest()[:32] + ".parquet")
+
+    def metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        """The wine_quality metadata of a cached file, or None if it isn't cached (or unreadable)"""
+        import pyarrow.parquet as pq
+
+        try:
+            schema_metadata = pq.read_schema(path).metadata or {}
+            return json.loads(schema_metadata[METADATA_KEY])
+        except (OSError, KeyError, ValueError) as e:
+            if os.path.exists(path):
+                logging.warning(f"⚠️  Ignoring unreadable cached dataset {path}: {e}")
+            return None
+
+    def read_csv(self, source: str, **read_kwargs) -> pd.DataFrame:
+        """
+        pd.read_csv(source, **read_kwargs), served from the cache while the source is unchanged.
+
+        Args:
+            source: http(s) URL or local path of the CSV
+            **read_kwargs: Passed to pd.read_csv (e.g. sep=';')
+
+        Returns:
+            The parsed frame, with attrs "dataset_sha256" (raw source bytes) and "dataset_source"
+
+        Raises:
+            RuntimeError: offline, with no cached copy of the source
+        """
+        path = self.path(source, read_kwargs)
+        cached = self.metadata(path)
+
+        if cached is not None and self.offline:
+            logging.info(f"📴 Offline: serving cached {source} ({cached['sha256'][:12]})")
+            return self._read(path, cached)
+        if self.offline:
+            raise RuntimeError(f"Offline mode and no cached copy of {source} in {self.directory}")
+
+        try:
+            content, validators = self._fetch(source, cached)
+        except (urllib.error.URLError, OSError) as e:
+            if cached is None:
+                raise
+            logging.warning(f"⚠️  Could not reach {source} ({e}), serving cached copy from {cached['fetched']}")
+            return self._read(path, cached)
+
+        if content is None:
+            logging.info(f"♻️  {source} unchanged, serving cached copy ({cached['sha256'][:12]})")
+            return self._read(path, cached)
+
+        digest = hashlib.sha256(content).hexdigest()
+        if cached is not None and cached['sha256'] == digest:
+            # Same bytes under new validators (e.g. a re-upload): keep the parse, refresh the validators
+            logging.info(f"♻️  {source} re-served with identical content ({digest[:12]})")
+            df = self._read(path, cached)
+        else:
+            df = pd.read_csv(io.BytesIO(content), **read_kwargs)
+            logging.info(f"📥 Parsed {source}: {len(df)} rows, {len(content) / 1e6:.2f} MB ({digest[:12]})")
+        entry = {
+            "source": source,
+            "sha256": digest,
+            "size": len(content),
+            "rows": len(df),
+            "dtypes": {str(column): str(dtype) for column, dtype in df.dtypes.items()},
+            "fetched": datetime.now(timezone.utc).isoformat(),
+            **validators,
+        }
+        self._write(path, df, entry)
+        df.attrs.update({"dataset_sha256": digest, "dataset_source": source})
+        return df
+
+    def _fetch(self, source: str, cached: Optional[Dict[str, Any]]) -> Tuple[Optional[bytes], Dict[str, Any]]:
+        """(content, validators) of the source, or (None, {}) when the cached copy is still current"""
+        if not is_remote(source):
+            stat = os.stat(source)
+            validators = {"mtime_ns": stat.st_mtime_ns, "file_size": stat.st_size}
+            if cached is not None and all(cached.get(k) == v for k, v in validators.items()):
+                return None, {}
+            with open(source, 'rb') as f:
+                return f.read(), validators
+
+        request = urllib.request.Request(source)
+        if cached is not None and cached.get("etag"):
+            request.add_header("If-None-Match", cached["etag"])
+        if cached is not None and cached.get("last_modified"):
+            request.add_header("If-Modified-Since", cached["last_modified"])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content = response.read()
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                return None, {}
+            raise
+        return content, validators
+
+    def _read(self, path: str, entry: Dict[str, Any]) -> pd.DataFrame:
+        df = pd.read_parquet(path)
+        os.utime(path)  # mtime is the recency mark for eviction
+        df.attrs.update({"dataset_sha256": entry["sha256"], "dataset_source": entry["source"]})
+        return df
+
+    def _write(self, path: str, df: pd.DataFrame, entry: Dict[str, Any]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # preserve_index=False: ingested frames carry a plain RangeIndex
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[METADATA_KEY] = json.dumps(entry).encode()
+        partial = path + ".part"
+        try:
+            pq.write_table(table.replace_schema_metadata(metadata), partial)
+            os.replace(partial, path)
+        except OSError as e:
+            # The cache is an optimization: a full or read-only disk must not fail ingestion
+            logging.warning(f"⚠️  Could not cache {entry['source']}: {e}")
+            if os.path.exists(partial):
+                os.remove(partial)
+            return
+        self.evict(keep=path)
+
+    def entries(self):
+        """(mtime, size, path) of every cached dataset, oldest first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least recently used datasets until the cache fits max_bytes; returns bytes freed"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total - freed <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            freed += size
+            logging.info(f"🧹 Evicted {os.path.basename(path)} ({size / 1e6:.1f} MB) from the dataset cache")
+        return freed
@@ -0,0 +1,252 @@
+"""
+Feature contract shared by training and serving.
+
+Saved next to model.pkl by steps/save_model.py so the FastAPI app and the
+Lambda handler assemble feature rows in exactly the order the model was
+trained on, straight into a float buffer without going through pandas.
+"""
+import json
+import logging
+import os
+import warnings
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.inference import FEATURE_COLUMNS, REQUEST_BOUNDS, REQUEST_FIELDS
+
+CONTRACT_FILENAME = "feature_contract.json"
+
+# Values used when a request omits an optional feature
+FEATURE_DEFAULTS = {"wine_type_encoded": 0}
+
+# Per REQUEST_BOUNDS constraint: the comparison a value violating it satisfies, and its symbol
+BOUND_VIOLATIONS = {"ge": (np.less, ">="), "gt": (np.less_equal, ">"), "le": (np.greater, "<="), "lt": (np.greater_equal, "<")}
+
+
+class FeatureContract:
+    """
+    Ordered feature names, request field names and dtype for one model.
+    """
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        request_fields: List[str],
+        dtype: str = "float64",
+        feature_names_in: Optional[List[str]] = None,
+        requires_frame: bool = False,
+    ) -> None:
+        """
+        Args:
+            feature_names: Training column names, in model input order
+            request_fields: Request field for each feature, same order
+            dtype: Row buffer dtype ("float64" or "float32")
+            feature_names_in: The trained estimator's feature_names_in_, if any
+            requires_frame: Model must be called with a named DataFrame (e.g. XGBoost)
+        """
+        if len(feature_names) != len(request_fields):
+            raise ValueError("feature_names and request_fields must have the same length")
+        if dtype not in ("float64", "float32"):
+            raise ValueError(f"Unsupported dtype '{dtype}'")
+
+        self.feature_names = list(feature_names)
+        self.request_fields = list(request_fields)
+        self.dtype = dtype
+        self.feature_names_in = list(feature_names_in) if feature_names_in is not None else None
+        self.requires_frame = requires_frame
+
+        self._np_dtype = np.dtype(dtype)
+        self._getter = attrgetter(*self.request_fields)
+        self._defaults = [FEATURE_DEFAULTS.get(field) for field in self.request_fields]
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    @classmethod
+    def default(cls, dtype: str = "float64") -> "FeatureContract":
+        """Contract for the standard 12 wine features"""
+        return cls(FEATURE_COLUMNS, REQUEST_FIELDS, dtype=dtype)
+
+    @classmethod
+    def from_model(cls, model: Any, dtype: str = "float64") -> "FeatureContract":
+        """
+        Build the contract for a trained estimator, following its
+        feature_names_in_ order when it was fitted on a named frame.
+        """
+        names_in = getattr(model, "feature_names_in_", None)
+        names_in = [str(name) for name in names_in] if names_in is not None else None
+        requires_frame = type(model).__module__.startswith("xgboost")
+
+        feature_names, request_fields = FEATURE_COLUMNS, REQUEST_FIELDS
+        if names_in is not None:
+            # LightGBM reports "fixed acidity" as "fixed_acidity"
+            column_for = {column.replace(" ", "_"): column for column in FEATURE_COLUMNS}
+            if sorted(name.replace(" ", "_") for name in names_in) != sorted(column_for):
+                raise ValueError(f"Model features {names_in} don't match the wine features {FEATURE_COLUMNS}")
+            field_for = dict(zip(FEATURE_COLUMNS, REQUEST_FIELDS))
+            feature_names = [column_for[name.replace(" ", "_")] for name in names_in]
+            request_fields = [field_for[name] for name in feature_names]
+
+        n_features_in = getattr(model, "n_features_in_", None)
+        if n_features_in is not None and n_features_in != len(feature_names):
+            raise ValueError(f"Model expects {n_features_in} features, contract has {len(feature_names)}")
+
+        return cls(feature_names, request_fields, dtype=dtype, feature_names_in=names_in, requires_frame=requires_frame)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "feature_names": self.feature_names,
+            "request_fields": self.request_fields,
+            "dtype": self.dtype,
+            "feature_names_in": self.feature_names_in,
+            "requires_frame": self.requires_frame,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeatureContract":
+        return cls(
+            data["feature_names"],
+            data["request_fields"],
+            dtype=data.get("dtype", "float64"),
+            feature_names_in=data.get("feature_names_in"),
+            requires_frame=data.get("requires_frame", False),
+        )
+
+    def save(self, path: str) -> None:
+        """Write the contract as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureContract":
+        """Read a contract written by save()"""
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def new_row(self) -> np.ndarray:
+        """Allocate a (1, n_features) row buffer"""
+        return np.empty((1, self.n_features), dtype=self._np_dtype)
+
+    def fill_row(self, request: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Copy a validated request (attribute access, e.g. a pydantic model)
+        into a (1, n_features) buffer. Missing values become NaN.
+
+        Args:
+            request: Object exposing the request fields as attributes
+            out: Buffer from new_row() to reuse, allocated when omitted
+        """
+        if out is None:
+            out = self.new_row()
+        # numpy stores None as NaN in float buffers
+        out[0] = self._getter(request)
+        return out
+
+    def fill_row_from_dict(self, body: Dict[str, Any], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Copy a JSON request body into a (1, n_features) buffer"""
+        if out is None:
+            out = self.new_row()
+        out[0] = [body.get(field, default) for field, default in zip(self.request_fields, self._defaults)]
+        return out
+
+    def record_error(self, body: Any) -> Optional[str]:
+        """Why a JSON record can't be scored (not an object, required fields missing), or None"""
+        if not isinstance(body, dict):
+            return "Record must be a JSON object"
+        missing = [
+            field for field, default in zip(self.request_fields, self._defaults)
+            if default is None and body.get(field) is None
+        ]
+        if missing:
+            return f"Missing fields: {missing}"
+        return None
+
+    def matrix_errors(self, matrix: np.ndarray) -> Dict[int, str]:
+        """
+        Why rows of a parsed (n, n_features) matrix can't be scored, by row
+        index: a required feature missing (NaN) or a value outside
+        REQUEST_BOUNDS, as /predict would reject the record. Checked column
+        by column, so clean chunks cost a few vectorized comparisons.
+        """
+        missing: Dict[int, List[str]] = {}
+        violations: Dict[int, List[str]] = {}
+        for j, (field, default) in enumerate(zip(self.request_fields, self._defaults)):
+            column = matrix[:, j]
+            if default is None:
+                for i in np.flatnonzero(np.isnan(column)).tolist():
+                    missing.setdefault(i, []).append(field)
+            # NaN compares False, so a missing value is never also out of bounds
+            for constraint, bound in REQUEST_BOUNDS.get(field, {}).items():
+                violates, symbol = BOUND_VIOLATIONS[constraint]
+                for i in np.flatnonzero(violates(column, bound)).tolist():
+                    violations.setdefault(i, []).append(f"{field} must be {symbol} {bound}")
+
+        errors = {i: [f"Missing fields: {fields}"] for i, fields in missing.items()}
+        for i, messages in violations.items():
+            errors.setdefault(i, []).extend(messages)
+        return {i: "; ".join(errors[i]) for i in sorted(errors)}
+
+    def fill_matrix_from_dicts(self, bodies: List[Any]) -> Tuple[np.ndarray, List[int], Dict[int, str]]:
+        """
+        Pack JSON records into one matrix, skipping invalid ones.
+
+        Returns:
+            (matrix of the valid records, their indices in bodies, error message by index of each invalid record)
+        """
+        matrix = np.empty((len(bodies), self.n_features), dtype=self._np_dtype)
+        kept: List[int] = []
+        errors: Dict[int, str] = {}
+        for i, body in enumerate(bodies):
+            error = self.record_error(body)
+            if error is not None:
+                errors[i] = error
+                continue
+            try:
+                matrix[len(kept)] = [body.get(field, default) for field, default in zip(self.request_fields, self._defaults)]
+            except (TypeError, ValueError) as e:
+                errors[i] = f"Invalid value: {e}"
+                continue
+            kept.append(i)
+        return matrix[:len(kept)], kept, errors
+
+    def fill_matrix(self, requests: List[Any]) -> np.ndarray:
+        """Pack many validated requests into one contiguous (n, n_features) matrix"""
+        return np.array([self._getter(request) for request in requests], dtype=self._np_dtype)
+
+    def model_input(self, features: np.ndarray) -> Any:
+        """Wrap a feature matrix the way the model needs it (a frame only when required)"""
+        if not self.requires_frame:
+            return features
+        import pandas as pd
+        return pd.DataFrame(features, columns=self.feature_names, copy=False)
+
+
+def contract_path_for(model_path: str) -> str:
+    """Contract location next to a model file"""
+    return os.path.join(os.path.dirname(model_path), CONTRACT_FILENAME)
+
+
+def load_contract(model_path: Optional[str], model: Any) -> FeatureContract:
+    """
+    Load the contract saved next to model_path, or derive it from the
+    model when none was saved (models trained before contracts existed).
+    """
+    if model_path is not None:
+        path = contract_path_for(model_path)
+        if os.path.exists(path):
+            contract = FeatureContract.load(path)
+            logging.info(f"Loaded feature contract from {path}")
+            return contract
+    return FeatureContract.from_model(model)
+
+
+def silence_feature_name_warning() -> None:
+    """
+    Estimators fitted on a named frame warn when called with a plain array.
+    The contract already guarantees the column order, so the warning is noise
+    on the hot path.
+    """
+    warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
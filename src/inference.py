@@ -0,0 +1,67 @@
+"""
+Shared prediction helpers for the FastAPI app and the Lambda handler.
+Only depends on numpy so it can be imported inside the Lambda image.
+"""
+import hashlib
+
+import numpy as np
+
+# Column names the model was trained on, in training order
+FEATURE_COLUMNS = [
+    "fixed acidity",
+    "volatile acidity",
+    "citric acid",
+    "residual sugar",
+    "chlorides",
+    "free sulfur dioxide",
+    "total sulfur dioxide",
+    "density",
+    "pH",
+    "sulphates",
+    "alcohol",
+    "wine_type_encoded",
+]
+
+# Request field names, in the same order as FEATURE_COLUMNS
+REQUEST_FIELDS = [
+    "fixed_acidity",
+    "volatile_acidity",
+    "citric_acid",
+    "residual_sugar",
+    "chlorides",
+    "free_sulfur_dioxide",
+    "total_sulfur_dioxide",
+    "density",
+    "pH",
+    "sulphates",
+    "alcohol",
+    "wine_type_encoded",
+]
+
+# Value constraints of the request fields (pydantic Field keywords), shared by
+# /predict's PredictionRequest and the row checks of the bulk-scoring paths
+REQUEST_BOUNDS = {
+    **{field: {"ge": 0} for field in REQUEST_FIELDS},
+    "density": {"gt": 0},
+    "pH": {"ge": 0, "le": 14},
+    "wine_type_encoded": {"ge": 0, "le": 1},
+}
+
+# Upper bounds of the Poor/Average/Good bands; everything above is Excellent
+QUALITY_THRESHOLDS = np.array([5.0, 6.0, 7.0])
+QUALITY_LABELS = np.array(["Poor", "Average", "Good", "Excellent"])
+
+
+def clip_scores(predictions) -> np.ndarray:
+    """Clip raw model output to the valid 0-10 quality range"""
+    return np.clip(np.asarray(predictions, dtype=np.float64), 0, 10)
+
+
+def rate_scores(scores: np.ndarray) -> np.ndarray:
+    """Map clipped scores to Poor/Average/Good/Excellent labels"""
+    return QUALITY_LABELS[np.searchsorted(QUALITY_THRESHOLDS, scores, side="right")]
+
+
+def model_version_of(data: bytes) -> str:
+    """Short content hash identifying a serialized model"""
+    return hashlib.sha256(data).hexdigest()[:12]
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+
+# Models held by a process-pool worker: model path -> (version, model, tree engine)
+_worker_models: Dict[str, Tuple[str, Any, Any]] = {}
+
+
+class StaleModelPath(RuntimeError):
+    """The file at a model's path now holds a different version (e.g. overwritten by a retrain)"""
+
+
+def _worker_predict(features: np.ndarray, model_path: str, version: str, columns: Optional[list]) -> np.ndarray:
+    """Score a feature matrix in a process-pool worker, loading each model version once"""
+    from src.model_artifact import ARTIFACT_FILENAME
+    from src.model_reloader import load_model_artifact, load_pickled_model
+
+    entry = _worker_models.get(model_path)
+    if entry is None or entry[0] != version:
+        if os.path.basename(model_path) == ARTIFACT_FILENAME:
+            # Mapped read-only, so every worker shares the same pages
+            loaded = load_model_artifact(model_path)
+        else:
+            # Same loader as the API process, so zstd/lz4 pickles work here too
+            loaded = load_pickled_model(model_path)
+        entry = (loaded.version, loaded.model, loaded.engine)
+        _worker_models[model_path] = entry
+        if loaded.version != version:
+            # Scoring with it would report (and cache) one model's scores under another's version
+            raise StaleModelPath(f"{model_path} holds version {loaded.version}, not {version}")
+
+    _, model, engine = entry
+    if engine is not None and len(features) <= engine.max_rows:
+        return engine.predict(features)
+    if columns is not None:
+        import pandas as pd
+        features = pd.DataFrame(features, columns=columns, copy=False)
+    return np.asarray(model.predict(features))
+
+
+class InferenceExecutor:
+    """
+    Runs model calls off the event loop.
+
+    - "thread": a thread pool sized to the number of cores (sklearn/LightGBM
+      release the GIL for most of predict)
+    - "process": a process pool for GIL-bound models; each worker loads a
+      model from its pickle or artifact path once per version. A model whose
+      file has since been overwritten with another version is scored on the
+      thread pool with the in-memory model instead
+    - "inline": run on the calling thread (previous behaviour)
+
+    At most max_in_flight calls are dispatched at once; further callers wait.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            kind: "thread", "process" or "inline"
+            max_workers: Pool size, defaults to the number of cores
+            max_in_flight: Maximum concurrent model calls, defaults to 2 * max_workers
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}', expected one of {EXECUTOR_KINDS}")
+
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # (path, version) pairs whose file no longer holds that version
+        self._stale: Set[Tuple[str, str]] = set()
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._processes
+
+    async def predict(self, features: np.ndarray, loaded) -> np.ndarray:
+        """
+        Score a feature matrix without blocking the event loop.
+
+        Args:
+            features: (n_records, n_features) matrix
+            loaded: src.model_reloader.LoadedModel to score with
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        self.waiting += 1
+        async with self._semaphore:
+            self.waiting -= 1
+            self.in_flight += 1
+            try:
+                if self.kind == "inline":
+                    return loaded.predict(features)
+
+                loop = asyncio.get_running_loop()
+                # Workers map the artifact when the model was loaded from one (shared pages), else unpickle
+                model_path = loaded.artifact_path or loaded.path
+                if self.kind == "process" and model_path is not None and (model_path, loaded.version) not in self._stale:
+                    columns = loaded.contract.feature_names if loaded.contract.requires_frame else None
+                    try:
+                        return await loop.run_in_executor(
+                            self._process_pool(), _worker_predict, features, model_path, loaded.version, columns
+                        )
+                    except StaleModelPath as e:
+                        logging.warning(f"{e}; scoring version {loaded.version} on the thread pool")
+                        self._stale.add((model_path, loaded.version))
+                if self.kind == "process":
+                    # Models not loaded from a pickle (e.g. MLflow) can't be shipped to workers
+                    logging.debug("Model has no pickle path, scoring on the thread pool")
+                return await loop.run_in_executor(self._thread_pool(), loaded.predict, features)
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        """Shut down the worker pools"""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._processes = None
+
+    def stats(self) -> dict:
+        """Pool configuration and current load"""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+        }
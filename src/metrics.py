@@ -0,0 +1,212 @@
+"""
+Low-overhead request metrics for the FastAPI app, exported in Prometheus text format.
+
+Handlers mark stage boundaries on a per-request timer; the timer is flushed
+into fixed-bucket histograms once, when the response starts. With metrics
+disabled every timer is a shared no-op object.
+"""
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by a tuple of label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets=LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            label_text = _format_labels(self.label_names, labels)
+            prefix = label_text[1:-1] + "," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{label_text} {total:.9g}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._values: Dict[tuple, int] = {}
+
+    def inc(self, labels: tuple, amount: int = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RequestTimer:
+    """
+    Stage spans for one request, measured with the monotonic perf_counter.
+
+    mark(stage) closes the span that started at the previous mark (or at
+    the start of the request).
+    """
+
+    __slots__ = ("start", "last", "model", "stages")
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        self.start = perf_counter() if start is None else start
+        self.last = self.start
+        self.model = "default"
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        now = perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+
+class _NullTimer:
+    """Timer used when metrics are off or outside a request"""
+
+    __slots__ = ()
+
+    def mark(self, stage: str) -> None:
+        pass
+
+    @property
+    def model(self) -> str:
+        return "default"
+
+    @model.setter
+    def model(self, value: str) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+_current_timer: ContextVar = ContextVar("request_timer", default=NULL_TIMER)
+
+
+def request_timer():
+    """The timer of the request being handled (a no-op timer when metrics are off)"""
+    return _current_timer.get()
+
+
+class Metrics:
+    """Request/error counters and per-stage, per-model latency histograms"""
+
+    def __init__(self, enabled: bool = True, namespace: str = "wine_api") -> None:
+        self.enabled = enabled
+        self.requests = Counter(f"{namespace}_requests_total", "HTTP requests by endpoint and status", ("endpoint", "status"))
+        self.errors = Counter(f"{namespace}_errors_total", "Requests that failed with a 5xx or an exception", ("endpoint",))
+        self.request_latency = Histogram(
+            f"{namespace}_request_duration_seconds", "End-to-end request latency", ("endpoint", "model")
+        )
+        self.stage_latency = Histogram(
+            f"{namespace}_stage_duration_seconds", "Latency of each request stage", ("endpoint", "stage", "model")
+        )
+        self._gauges: List[Tuple[str, str, Callable[[], Optional[float]]]] = []
+        self._lock = threading.Lock()
+
+    def gauge(self, name: str, help_text: str, fn: Callable[[], Optional[float]]) -> None:
+        """Register a value read at scrape time (None skips the sample)"""
+        self._gauges.append((name, help_text, fn))
+
+    def record(self, endpoint: str, status: int, timer: RequestTimer, end: float) -> None:
+        """Flush a finished request's spans into the counters and histograms"""
+        model = timer.model
+        with self._lock:
+            self.requests.inc((endpoint, str(status)))
+            if status >= 500:
+                self.errors.inc((endpoint,))
+            self.request_latency.observe((endpoint, model), end - timer.start)
+            for stage, seconds in timer.stages:
+                self.stage_latency.observe((endpoint, stage, model), seconds)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = (
+                self.requests.render()
+                + self.errors.render()
+                + self.request_latency.render()
+                + self.stage_latency.render()
+            )
+        for name, help_text, fn in self._gauges:
+            value = fn()
+            if value is not None:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that times each HTTP request.
+
+    The span from request start to the first handler mark covers body parsing
+    and pydantic validation; the span from the last handler mark to the
+    response start covers response validation and JSON serialization.
+    """
+
+    def __init__(self, app, metrics: Metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.metrics.enabled:
+            return await self.app(scope, receive, send)
+
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timer.stages:
+                    timer.mark("serialize")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_timer.reset(token)
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            self.metrics.record(endpoint, status, timer, perf_counter())
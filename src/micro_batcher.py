@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-row predictions into one model call.
+
+    Rows submitted from many requests are queued; a background task collects
+    them until either max_batch_size rows are waiting or max_wait_ms has
+    passed since the first row arrived, scores them with one predict_fn call
+    per model and hands every caller its own result. Each row is scored by
+    the model its caller submitted it with, even if the active model is
+    swapped while it waits.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray, Any], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        """
+        Args:
+            predict_fn: Scores a (n_rows, n_features) matrix with a model, returns n_rows scores
+            max_batch_size: Maximum number of rows scored in one call
+            max_wait_ms: Maximum time the first row of a batch waits for others
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Stats
+        self.requests = 0
+        self.batches = 0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+        self._recent_waits = deque(maxlen=2048)
+
+    def start(self) -> None:
+        """Start the background batching task on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+            logging.info(
+                f"Micro-batcher started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait * 1000:g})"
+            )
+
+    async def stop(self) -> None:
+        """Stop the background task, failing any rows still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            _, _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    async def submit(self, row: np.ndarray, model: Any = None) -> float:
+        """
+        Queue one feature row and wait for its score.
+
+        Args:
+            row: 1-D feature vector
+            model: Model to score the row with, passed through to predict_fn
+        Returns:
+            score: float
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, model, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[Tuple[np.ndarray, Any, asyncio.Future, float]]:
+        """Wait for the first row, then gather more until the batch is full or the deadline passes"""
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already queued without yielding
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            collected = await self._collect()
+            dispatched = time.perf_counter()
+
+            # One model call per model (keyed by identity: models needn't be hashable)
+            groups: Dict[int, list] = {}
+            for item in collected:
+                groups.setdefault(id(item[1]), []).append(item)
+
+            for batch in groups.values():
+                self._record(len(batch), [dispatched - enqueued for _, _, _, enqueued in batch])
+                try:
+                    features = np.vstack([row for row, _, _, _ in batch])
+                    result = self.predict_fn(features, batch[0][1])
+                    if asyncio.iscoroutine(result):
+                        result = await result
+                    scores = np.asarray(result, dtype=np.float64).tolist()
+                except Exception as e:
+                    logging.error(f"Micro-batch prediction failed: {e}")
+                    for _, _, future, _ in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, _, future, _), score in zip(batch, scores):
+                    if not future.done():
+                        future.set_result(score)
+
+    def _record(self, batch_size: int, waits: List[float]) -> None:
+        self.batches += 1
+        self.requests += batch_size
+        for i, upper in enumerate(BATCH_SIZE_BUCKETS):
+            if batch_size <= upper:
+                self.batch_size_counts[i] += 1
+                break
+        else:
+            self.batch_size_counts[-1] += 1
+
+        self.total_wait += sum(waits)
+        self.max_wait_seen = max(self.max_wait_seen, max(waits))
+        self._recent_waits.extend(waits)
+
+    def stats(self) -> dict:
+        """Queue depth, batch-size distribution and added wait time"""
+        labels = [f"<={upper}" for upper in BATCH_SIZE_BUCKETS] + [f">{BATCH_SIZE_BUCKETS[-1]}"]
+        recent = np.array(self._recent_waits) * 1000.0 if self._recent_waits else np.zeros(1)
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "batch_size_distribution": dict(zip(labels, self.batch_size_counts)),
+            "wait_ms": {
+                "mean": self.total_wait * 1000.0 / self.requests if self.requests else 0.0,
+                "max": self.max_wait_seen * 1000.0,
+                "p50_recent": float(np.percentile(recent, 50)),
+                "p99_recent": float(np.percentile(recent, 99)),
+            },
+        }
@@ -0,0 +1,194 @@
+"""
+Memory-mappable model artifacts.
+
+An alternative to model.pkl for models whose fitted state is a few NumPy
+arrays (tree ensembles via src.tree_engine, linear models). The file is a
+small JSON header followed by the raw, 64-byte aligned arrays:
+
+    b"WQMODEL1" | uint64 header length | JSON header | padding | array | padding | array ...
+
+Loading maps the file read-only and wraps the arrays in place, so nothing
+is deserialized or copied: pages are read from disk (or the page cache)
+when a prediction first touches them, and processes loading the same file
+share them. The estimator's library (sklearn, lightgbm, xgboost) is never
+imported.
+"""
+import json
+import logging
+import os
+import struct
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from src.feature_contract import FeatureContract
+from src.tree_engine import ARRAY_FIELDS, TreeEnsemble
+
+ARTIFACT_FILENAME = "model.arrays"
+MAGIC = b"WQMODEL1"
+ALIGNMENT = 64
+
+# auto: serve model.arrays when it sits next to model.pkl and is at least as new; pickle: always unpickle
+MODEL_FORMAT = os.getenv('MODEL_FORMAT', 'auto').lower()
+
+
+class LinearModel:
+    """Linear regression as coefficients and an intercept"""
+
+    def __init__(self, coef: np.ndarray, intercept: float, source: str = "") -> None:
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.source = source
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Predictions for a (n_records, n_features) matrix"""
+        return np.asarray(features, dtype=np.float64) @ self.coef + self.intercept
+
+
+def artifact_path_for(model_path: str) -> str:
+    """Artifact location next to a model file"""
+    return os.path.join(os.path.dirname(model_path), ARTIFACT_FILENAME)
+
+
+def _export(model: Any) -> Tuple[str, Dict[str, np.ndarray], Dict[str, Any]]:
+    """(kind, arrays, scalar params) of a fitted estimator"""
+    if isinstance(model, TreeEnsemble):
+        ensemble = model
+    elif hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.ndim != 1:
+            raise ValueError(f"{type(model).__name__} has {coef.shape} coefficients, only single-output models are supported")
+        return "linear", {"coef": coef}, {"intercept": float(np.asarray(model.intercept_)), "source": type(model).__name__}
+    else:
+        ensemble = TreeEnsemble.from_model(model)
+    return "tree_ensemble", {name: getattr(ensemble, name) for name in ARRAY_FIELDS}, ensemble.params
+
+
+def save_artifact(model: Any, path: str, contract: FeatureContract, model_version: str) -> None:
+    """
+    Write model as a memory-mappable artifact.
+
+    Args:
+        model: Fitted tree ensemble or linear regressor
+        path: Output file (written to path + ".part", then renamed)
+        contract: Feature order of the model's input
+        model_version: Version of the pickled model this artifact mirrors
+
+    Raises:
+        ValueError: if the model can't be expressed as arrays
+    """
+    kind, arrays, params = _export(model)
+
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({
+        "kind": kind,
+        "model_type": type(model).__name__ if kind == "linear" else params["source"],
+        "model_version": model_version,
+        # Array models take plain matrices, whatever the estimator needed
+        "contract": {**contract.to_dict(), "requires_frame": False},
+        "params": params,
+        "arrays": layout,
+    }).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    partial = path + ".part"
+    with open(partial, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(partial, path)
+    logging.info(f"💾 Model artifact ({kind}, {offset / 1e6:.1f} MB of arrays) saved to {path}")
+
+
+def _parse_header(read) -> Tuple[Dict[str, Any], int]:
+    """(header, offset of the first array), reading the start of an artifact with read(n)"""
+    if read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a model artifact")
+    (length,) = struct.unpack("<Q", read(8))
+    header = json.loads(read(length))
+    return header, -(-(len(MAGIC) + 8 + length) // ALIGNMENT) * ALIGNMENT
+
+
+def read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """(header, offset of the first array) of an artifact file"""
+    with open(path, 'rb') as f:
+        try:
+            return _parse_header(f.read)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}")
+
+
+def load_artifact(source: Union[str, bytes, bytearray], mmap: bool = True) -> Tuple[Any, FeatureContract, str]:
+    """
+    Open an artifact written by save_artifact.
+
+    Args:
+        source: Artifact file, or its content already in memory (e.g. fetched from S3)
+        mmap: Map the file read-only (False reads it into memory)
+
+    Returns:
+        (model with a predict(matrix) method, feature contract, model version)
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        position = [0]
+
+        def read(n):
+            chunk = bytes(view[position[0]:position[0] + n])
+            position[0] += n
+            return chunk
+
+        header, data_start = _parse_header(read)
+        buffer = np.frombuffer(source, dtype=np.uint8)
+    else:
+        header, data_start = read_header(source)
+        if mmap:
+            buffer = np.memmap(source, dtype=np.uint8, mode='r')
+        else:
+            buffer = np.fromfile(source, dtype=np.uint8)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        start = data_start + spec["offset"]
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    params = header["params"]
+    if header["kind"] == "tree_ensemble":
+        model = TreeEnsemble(**arrays, **params)
+    elif header["kind"] == "linear":
+        model = LinearModel(arrays["coef"], params["intercept"], source=params["source"])
+    else:
+        raise ValueError(f"Unknown artifact kind '{header['kind']}'")
+    return model, FeatureContract.from_dict(header["contract"]), header["model_version"]
+
+
+def current_artifact(model_path: str) -> Optional[str]:
+    """
+    The artifact to serve instead of model_path, or None to unpickle.
+
+    Used when MODEL_FORMAT allows it and the artifact is at least as new as
+    the pickle, so a model re-saved without an artifact isn't shadowed.
+    """
+    if MODEL_FORMAT == 'pickle':
+        return None
+    path = artifact_path_for(model_path)
+    try:
+        artifact_mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if os.path.exists(model_path) and os.stat(model_path).st_mtime_ns > artifact_mtime:
+        logging.warning(f"⚠️  {path} is older than {model_path}, unpickling instead")
+        return None
+    return path
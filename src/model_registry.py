@@ -0,0 +1,140 @@
+import glob
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from src.model_reloader import LoadedModel, load_model_file
+
+
+class ModelRegistry:
+    """
+    Named models served side by side.
+
+    Models are registered by name and pickle path and loaded lazily on first
+    use. When a memory budget is set, the least recently used models are
+    unloaded until the loaded set fits; requests already holding a model keep
+    their reference until they finish.
+    """
+
+    def __init__(self, memory_budget_bytes: Optional[int] = None) -> None:
+        """
+        Args:
+            memory_budget_bytes: Upper bound on the summed footprint of loaded models (None = unlimited)
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self._paths: Dict[str, str] = {}
+        self._loaded: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+        self.loads = 0
+        self.evictions = 0
+
+    def register(self, name: str, path: str) -> None:
+        """Register a model pickle under a name (loaded on first use)"""
+        with self._lock:
+            if self._paths.get(name) != path:
+                self._loaded.pop(name, None)
+            self._paths[name] = path
+
+    def discover(self, directory: str) -> List[str]:
+        """Register every <directory>/<name>/model.pkl, as written by steps/save_model.py"""
+        names = []
+        for path in sorted(glob.glob(os.path.join(directory, "*", "model.pkl"))):
+            name = os.path.basename(os.path.dirname(path))
+            self.register(name, path)
+            names.append(name)
+        if names:
+            logging.info(f"Registered models from {directory}: {names}")
+        return names
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._paths)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._paths
+
+    def loaded(self, name: str) -> Optional[LoadedModel]:
+        """
+        The model registered under name if it is already loaded, else None (never loads).
+
+        Raises:
+            KeyError: if no model is registered under name
+        """
+        with self._lock:
+            if name not in self._paths:
+                raise KeyError(name)
+            loaded = self._loaded.get(name)
+            if loaded is not None:
+                self._loaded.move_to_end(name)
+            return loaded
+
+    def get(self, name: str) -> LoadedModel:
+        """
+        Return a loaded model by name, loading it if needed.
+
+        Raises:
+            KeyError: if no model is registered under name
+        """
+        with self._lock:
+            loaded = self._loaded.get(name)
+            if loaded is not None:
+                self._loaded.move_to_end(name)
+                return loaded
+            if name not in self._paths:
+                raise KeyError(name)
+            path = self._paths[name]
+
+        # Deserialize outside the registry lock so other models keep serving
+        with self._load_lock:
+            with self._lock:
+                loaded = self._loaded.get(name)
+            if loaded is None:
+                loaded = load_model_file(path, source=f"registry:{name}")
+                loaded.warm()
+                self.loads += 1
+                logging.info(f"✅ Loaded model '{name}' from {path} ({loaded.memory_bytes / 1e6:.1f} MB)")
+
+        with self._lock:
+            self._loaded[name] = loaded
+            self._loaded.move_to_end(name)
+            self._evict(keep=name)
+        return loaded
+
+    def unload(self, name: str) -> None:
+        with self._lock:
+            self._loaded.pop(name, None)
+
+    def memory_used_bytes(self) -> int:
+        return sum(loaded.memory_bytes or 0 for loaded in self._loaded.values())
+
+    def _evict(self, keep: str) -> None:
+        if self.memory_budget_bytes is None:
+            return
+        while self.memory_used_bytes() > self.memory_budget_bytes and len(self._loaded) > 1:
+            name = next(iter(self._loaded))
+            if name == keep:
+                break
+            del self._loaded[name]
+            self.evictions += 1
+            logging.info(f"♻️  Unloaded model '{name}' to stay within the memory budget")
+
+    def stats(self) -> dict:
+        """Per-model load state and memory footprint"""
+        with self._lock:
+            models = {}
+            for name, path in self._paths.items():
+                loaded = self._loaded.get(name)
+                models[name] = {"path": path, "loaded": loaded is not None}
+                if loaded is not None:
+                    models[name].update(loaded.info())
+            return {
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "memory_used_bytes": self.memory_used_bytes(),
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "models": models,
+            }
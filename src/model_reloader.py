@@ -0,0 +1,259 @@
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from src.compression import decompress_bytes
+from src.feature_contract import CONTRACT_FILENAME, FeatureContract, load_contract
+from src.inference import model_version_of
+from src.model_artifact import artifact_path_for, current_artifact, load_artifact, read_header
+from src.tree_engine import compile_model
+
+
+class LoadedModel:
+    """
+    A deserialized model together with everything needed to serve it.
+
+    Servers keep one LoadedModel reference and replace it in a single
+    assignment, so a request that grabbed the old reference finishes on the
+    old model while new requests see the new one.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        contract: FeatureContract,
+        version: str,
+        path: Optional[str] = None,
+        source: str = "local",
+        memory_bytes: Optional[int] = None,
+        artifact_path: Optional[str] = None,
+        model_type: Optional[str] = None,
+    ) -> None:
+        self.model = model
+        self.contract = contract
+        self.version = version
+        # The model's pickle (what the reloader watches), and the artifact actually mapped, if any
+        self.path = path
+        self.artifact_path = artifact_path
+        self.source = source
+        # The trained estimator's class, also for models served from their array form
+        self.model_type = model_type or type(model).__name__
+        # Flat-array copy of tree ensembles, used for small batches
+        self.engine = compile_model(model)
+        # Approximate resident size; the pickle size tracks the array payload of a fitted model
+        if memory_bytes is not None and self.engine is not None and self.engine is not model:
+            memory_bytes += self.engine.nbytes
+        self.memory_bytes = memory_bytes
+        self.loaded_at = datetime.now(timezone.utc)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Raw model output for a (n_records, n_features) matrix"""
+        if self.engine is not None and len(features) <= self.engine.max_rows:
+            return self.engine.predict(features)
+        return self.model.predict(self.contract.model_input(features))
+
+    def warm(self) -> None:
+        """Run one prediction so lazy allocations happen off the request path"""
+        self.predict(np.zeros((1, self.contract.n_features), dtype=self.contract.dtype))
+
+    def info(self) -> dict:
+        return {
+            "model_type": self.model_type,
+            "model_version": self.version,
+            "loaded_at": self.loaded_at.isoformat(),
+            "source": self.source,
+            "memory_bytes": self.memory_bytes,
+            "tree_engine": self.engine is not None,
+        }
+
+
+def load_pickled_model(path: str, source: Optional[str] = None) -> LoadedModel:
+    """Load a pickled model (plain or zstd/lz4 compressed) and the feature contract saved next to it"""
+    with open(path, 'rb') as f:
+        data = decompress_bytes(f.read())
+    model = pickle.loads(data)
+    return LoadedModel(
+        model,
+        load_contract(path, model),
+        model_version_of(data),
+        path=path,
+        source=source or f"file:{path}",
+        memory_bytes=len(data),
+    )
+
+
+def load_model_artifact(path: str, source: Optional[str] = None, model_path: Optional[str] = None) -> LoadedModel:
+    """
+    Memory-map a model artifact (src.model_artifact); the contract, version and model type are in its header.
+
+    Args:
+        path: Artifact file
+        source: Where the model came from (default: file:<path>)
+        model_path: The pickle the artifact mirrors, kept as LoadedModel.path
+    """
+    model, contract, version = load_artifact(path)
+    header, _ = read_header(path)
+    return LoadedModel(
+        model,
+        contract,
+        version,
+        path=model_path,
+        source=source or f"file:{path}",
+        memory_bytes=os.path.getsize(path),
+        artifact_path=path,
+        model_type=header.get("model_type"),
+    )
+
+
+def load_model_file(path: str, source: Optional[str] = None) -> LoadedModel:
+    """Load the model saved at path, from its memory-mappable artifact when there is a current one"""
+    artifact = current_artifact(path)
+    if artifact is not None:
+        return load_model_artifact(artifact, source=source, model_path=path)
+    return load_pickled_model(path, source=source)
+
+
+class LocalModelSource:
+    """
+    Model pickle on local disk, changes detected by mtime and size.
+
+    The artifact next to it is part of the fingerprint too, so an artifact
+    written (or deleted) after the pickle is picked up.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def fingerprint(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        try:
+            artifact = os.stat(artifact_path_for(self.path))
+            artifact_stat = (artifact.st_mtime_ns, artifact.st_size)
+        except FileNotFoundError:
+            artifact_stat = None
+        return stat.st_mtime_ns, stat.st_size, artifact_stat
+
+    def load(self) -> LoadedModel:
+        return load_model_file(self.path)
+
+    def __str__(self) -> str:
+        return f"file:{self.path}"
+
+
+class S3ModelSource:
+    """Model pickle in S3, changes detected by the object's ETag"""
+
+    def __init__(self, s3_handler, s3_key: str = "models/model.pkl", download_dir: Optional[str] = None) -> None:
+        """
+        Args:
+            s3_handler: src.s3_utils.S3Handler for the model bucket
+            s3_key: Key of the model pickle
+            download_dir: Where new versions are downloaded (a temp dir by default)
+        """
+        self.s3_handler = s3_handler
+        self.s3_key = s3_key
+        self.download_dir = download_dir or tempfile.mkdtemp(prefix="wine-model-")
+
+    def fingerprint(self) -> Optional[str]:
+        return self.s3_handler.get_etag(self.s3_key)
+
+    def load(self) -> LoadedModel:
+        local_path = os.path.join(self.download_dir, os.path.basename(self.s3_key))
+        if not self.s3_handler.download_file(self.s3_key, local_path):
+            raise RuntimeError(f"Could not download s3://{self.s3_handler.bucket_name}/{self.s3_key}")
+
+        # The contract is optional for older models
+        contract_key = f"{os.path.dirname(self.s3_key)}/{CONTRACT_FILENAME}"
+        contract_path = os.path.join(self.download_dir, CONTRACT_FILENAME)
+        if not self.s3_handler.download_file(contract_key, contract_path) and os.path.exists(contract_path):
+            os.remove(contract_path)
+
+        return load_pickled_model(local_path, source=str(self))
+
+    def __str__(self) -> str:
+        return f"s3://{self.s3_handler.bucket_name}/{self.s3_key}"
+
+
+class ModelReloader:
+    """
+    Background thread that watches a model source and hot-swaps new versions.
+
+    When the source's fingerprint changes, the new model is deserialized and
+    warmed on the reloader thread, then handed to on_swap. Requests never wait
+    for a reload.
+    """
+
+    def __init__(
+        self,
+        source,
+        on_swap: Callable[[LoadedModel], None],
+        interval: float = 30.0,
+        current_version: Optional[Callable[[], Optional[str]]] = None,
+    ) -> None:
+        """
+        Args:
+            source: LocalModelSource or S3ModelSource
+            on_swap: Installs the new LoadedModel (a single reference assignment)
+            interval: Seconds between checks
+            current_version: Returns the active model version, so an unchanged
+                model re-saved under a new fingerprint is not swapped
+        """
+        self.source = source
+        self.on_swap = on_swap
+        self.interval = interval
+        self.current_version = current_version
+
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._fingerprint = source.fingerprint()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check_once(self) -> bool:
+        """Reload if the source changed. Returns True when a new model was swapped in"""
+        try:
+            fingerprint = self.source.fingerprint()
+            if fingerprint is None or fingerprint == self._fingerprint:
+                return False
+
+            loaded = self.source.load()
+            self._fingerprint = fingerprint
+            if self.current_version is not None and loaded.version == self.current_version():
+                return False
+
+            loaded.warm()
+            self.on_swap(loaded)
+            self.reloads += 1
+            self.last_error = None
+            logging.info(f"🔄 Hot-swapped model {loaded.version} from {self.source}")
+            return True
+        except Exception as e:
+            # Keep serving the current model and retry on the next check
+            self.last_error = str(e)
+            logging.error(f"❌ Model reload from {self.source} failed: {e}")
+            return False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check_once()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+            self._thread.start()
+            logging.info(f"Watching {self.source} for new models every {self.interval:g}s")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
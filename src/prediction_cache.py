@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Decimal places each measurement is reported with in the UCI wine data.
+# Feature vectors that agree at this precision are the same wine sample.
+FEATURE_PRECISION = {
+    "fixed acidity": 2,
+    "volatile acidity": 3,
+    "citric acid": 2,
+    "residual sugar": 2,
+    "chlorides": 3,
+    "free sulfur dioxide": 1,
+    "total sulfur dioxide": 1,
+    "density": 5,
+    "pH": 2,
+    "sulphates": 2,
+    "alcohol": 2,
+    "wine_type_encoded": 0,
+}
+DEFAULT_PRECISION = 6
+
+
+class PredictionCache:
+    """
+    Bounded in-process cache of prediction scores.
+
+    Keys are the feature vector quantized to each feature's measurement
+    precision plus the model version, so a new model never serves scores
+    from the old one. Models whose contracts order features differently
+    (e.g. registry models) pass their feature names to make_key, so each
+    row is quantized column by column with its own feature's precision.
+    Entries are evicted least-recently-used once max_size is reached and
+    expire after ttl_seconds.
+    """
+
+    def __init__(self, feature_names: List[str], max_size: int = 10000, ttl_seconds: float = 3600.0) -> None:
+        """
+        Args:
+            feature_names: Feature order of the rows that will be looked up
+            max_size: Maximum number of cached scores
+            ttl_seconds: Lifetime of a cached score
+        """
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._scales: Dict[Tuple[str, ...], np.ndarray] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.set_features(feature_names)
+
+    def set_features(self, feature_names: List[str]) -> None:
+        """Set the default feature order used to quantize rows"""
+        self._scale = self.scale_for(feature_names)
+
+    def scale_for(self, feature_names: Sequence[str]) -> np.ndarray:
+        """Per-column quantization factors (10**decimals) for a feature order, computed once per order"""
+        names = tuple(feature_names)
+        scale = self._scales.get(names)
+        if scale is None:
+            decimals = [FEATURE_PRECISION.get(name, DEFAULT_PRECISION) for name in names]
+            scale = self._scales[names] = np.power(10.0, decimals)
+        return scale
+
+    def make_key(self, row: np.ndarray, model_version: str, feature_names: Optional[Sequence[str]] = None) -> Hashable:
+        """
+        Quantize a 1-D feature row to measurement precision.
+
+        Args:
+            row: Feature values
+            model_version: Version of the model scoring the row
+            feature_names: Feature order of row (default: the one set by set_features)
+        """
+        scale = self._scale if feature_names is None else self.scale_for(feature_names)
+        quantized = np.rint(np.asarray(row, dtype=np.float64) * scale).astype(np.int64)
+        return model_version, quantized.tobytes()
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """Return the cached score, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            score, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key: Hashable, score: float) -> None:
+        """Store a score, evicting the least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = (score, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, feature_names: Optional[List[str]] = None, model_version: Optional[str] = None) -> None:
+        """
+        Drop cached scores, e.g. when a new model is loaded.
+
+        Args:
+            feature_names: New default feature order, if it changed
+            model_version: Drop only this model's entries (default: every entry)
+        """
+        with self._lock:
+            if model_version is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == model_version]:
+                    del self._entries[key]
+            self.invalidations += 1
+            if feature_names is not None:
+                self.set_features(feature_names)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
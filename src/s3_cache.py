@@ -0,0 +1,124 @@
+"""
+ETag-validated local copies of S3 objects.
+
+A sidecar JSON file next to each downloaded object records the S3 ETag and
+version it was downloaded at. A HEAD request decides whether the local copy
+is still current, so a reused Lambda execution environment (or a restarted
+server) skips re-downloading an unchanged model.
+
+Downloads go through src.s3_fetch (parallel ranged GETs, compressed objects
+decompressed on the fly), and the local copy holds the decompressed content.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from src.s3_fetch import RangedFetcher
+
+SIDECAR_SUFFIX = ".s3meta.json"
+
+# Copies still being written after an in-memory fetch: local path -> writer thread
+_pending_copies: Dict[str, threading.Thread] = {}
+
+
+def sidecar_path(local_path: str) -> str:
+    return local_path + SIDECAR_SUFFIX
+
+
+def read_sidecar(local_path: str) -> Optional[Dict[str, Any]]:
+    """The recorded S3 metadata of a local copy, or None if there is no valid copy"""
+    try:
+        with open(sidecar_path(local_path), 'r') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(local_path) or os.path.getsize(local_path) != meta.get("local_size", meta.get("size")):
+        return None
+    return meta
+
+
+def _write_copy(data: bytes, local_path: str, remote: Dict[str, Any]) -> None:
+    """Persist content fetched into memory, then its sidecar"""
+    try:
+        partial = local_path + ".part"
+        with open(partial, 'wb') as f:
+            f.write(data)
+        os.replace(partial, local_path)
+        with open(sidecar_path(local_path), 'w') as f:
+            json.dump(remote, f)
+    except OSError as e:
+        logging.warning(f"⚠️  Could not keep a local copy at {local_path}: {e}")
+
+
+def fetch_cached(
+    s3_client,
+    bucket: str,
+    key: str,
+    local_path: str,
+    keep_in_memory: bool = False,
+    fetcher: Optional[RangedFetcher] = None,
+) -> Dict[str, Any]:
+    """
+    Make local_path an up-to-date copy of s3://bucket/key.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket name
+        key: Object key
+        local_path: Where the copy lives (its sidecar goes next to it)
+        keep_in_memory: Return a download that fits in memory as "data" and
+            write local_path in the background, so the caller can deserialize
+            without a round trip through the file
+        fetcher: RangedFetcher to download with (a default one for s3_client)
+
+    Returns:
+        dict with etag, version_id, size, last_modified (ISO 8601), downloaded
+        (False when the local copy was reused) and data (the content when it
+        was kept in memory, otherwise None)
+
+    Raises:
+        botocore.exceptions.ClientError: if the object can't be read
+    """
+    # A copy from an earlier in-memory fetch may still be being written
+    pending = _pending_copies.pop(local_path, None)
+    if pending is not None:
+        pending.join()
+
+    head = s3_client.head_object(Bucket=bucket, Key=key)
+    remote = {
+        "bucket": bucket,
+        "key": key,
+        "etag": head["ETag"],
+        "version_id": head.get("VersionId"),
+        "size": head["ContentLength"],
+        "last_modified": head["LastModified"].isoformat(),
+        "codec": head.get("Metadata", {}).get("codec"),
+    }
+
+    cached = read_sidecar(local_path)
+    if cached is not None and all(cached.get(field) == remote[field] for field in ("bucket", "key", "etag", "version_id")):
+        logging.info(f"♻️  s3://{bucket}/{key} unchanged (ETag {remote['etag']}), using {local_path}")
+        return {**remote, "downloaded": False, "data": None}
+
+    # Download next to the target and rename, so a crash never leaves a torn file behind a valid sidecar
+    if os.path.exists(sidecar_path(local_path)):
+        os.remove(sidecar_path(local_path))
+    partial = local_path + ".part"
+    fetcher = fetcher or RangedFetcher(s3_client)
+    data, local_size = fetcher.fetch(bucket, key, partial, head=head, memory_limit=None if keep_in_memory else 0)
+    remote["local_size"] = local_size
+
+    if data is None:
+        os.replace(partial, local_path)
+        with open(sidecar_path(local_path), 'w') as f:
+            json.dump(remote, f)
+        logging.info(f"✅ Downloaded s3://{bucket}/{key} to {local_path}")
+    else:
+        # The caller deserializes from memory now; the copy for a later restart is written off the critical path
+        writer = threading.Thread(target=_write_copy, args=(data, local_path, remote), daemon=True)
+        _pending_copies[local_path] = writer
+        writer.start()
+        logging.info(f"✅ Downloaded s3://{bucket}/{key} into memory ({local_size / 1e6:.1f} MB)")
+    return {**remote, "downloaded": True, "data": data}
@@ -0,0 +1,86 @@
+"""
+Process-wide, pooled S3 clients.
+
+Creating a boto3 client loads the service model and resolves credentials and
+endpoints (tens of milliseconds), and every client owns its own urllib3
+connection pool, so a client per S3Handler (or per request) also pays a new
+TCP/TLS handshake per object. get_s3_client() builds one client per
+(region, endpoint) and shares it: boto3 clients are thread-safe, and the
+pool is sized for the parallel transfers in src.s3_fetch and
+S3Handler.sync_directory.
+
+Clients are dropped in a forked child (pre-forked API workers), since pooled
+sockets inherited from the parent must not be shared between processes.
+boto3 is imported on first use, so the Lambda handler can import this module
+without paying for it.
+"""
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+S3_MAX_POOL_CONNECTIONS = int(os.getenv('S3_MAX_POOL_CONNECTIONS', '50'))
+S3_CONNECT_TIMEOUT = float(os.getenv('S3_CONNECT_TIMEOUT', '5'))
+S3_READ_TIMEOUT = float(os.getenv('S3_READ_TIMEOUT', '60'))
+# standard retries with jittered backoff; adaptive also rate-limits the client on throttling
+S3_RETRY_MODE = os.getenv('S3_RETRY_MODE', 'standard')
+S3_MAX_ATTEMPTS = int(os.getenv('S3_MAX_ATTEMPTS', '5'))
+S3_TCP_KEEPALIVE = os.getenv('S3_TCP_KEEPALIVE', 'true').lower() == 'true'
+S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL')  # e.g. a local S3 stand-in
+
+_clients: Dict[Tuple[Optional[str], Optional[str]], Any] = {}
+_lock = threading.Lock()
+
+
+def client_config(**overrides):
+    """botocore Config for the shared clients (overrides replace individual settings)"""
+    from botocore.config import Config
+
+    settings = {
+        "max_pool_connections": S3_MAX_POOL_CONNECTIONS,
+        "connect_timeout": S3_CONNECT_TIMEOUT,
+        "read_timeout": S3_READ_TIMEOUT,
+        "retries": {"mode": S3_RETRY_MODE, "max_attempts": S3_MAX_ATTEMPTS},
+        "tcp_keepalive": S3_TCP_KEEPALIVE,
+    }
+    settings.update(overrides)
+    return Config(**settings)
+
+
+def get_s3_client(region: Optional[str] = None, endpoint_url: Optional[str] = None):
+    """
+    The shared S3 client for a region and endpoint, created on first use.
+
+    Args:
+        region: AWS region (None uses boto3's default resolution)
+        endpoint_url: Custom endpoint (default: S3_ENDPOINT_URL)
+
+    Returns:
+        boto3 S3 client, safe to use from several threads
+    """
+    key = (region, endpoint_url or S3_ENDPOINT_URL)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            import boto3
+
+            # Created under the lock: boto3's default session isn't safe to build clients from concurrently
+            client = boto3.client('s3', region_name=region, endpoint_url=key[1], config=client_config())
+            _clients[key] = client
+            logging.info(f"🔌 S3 client for {region or 'default region'} ready (pool of {S3_MAX_POOL_CONNECTIONS})")
+    return client
+
+
+def reset_s3_clients() -> None:
+    """Forget the shared clients (new ones are created on next use)"""
+    global _lock
+    _clients.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked worker builds its own clients rather than sharing the parent's sockets (or a held lock)
+    os.register_at_fork(after_in_child=reset_s3_clients)
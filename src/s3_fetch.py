@@ -0,0 +1,149 @@
+"""
+Parallel ranged S3 downloads with streaming decompression.
+
+An object is fetched as fixed-size byte ranges by a small thread pool. Parts
+are fed to the decompressor in order while later parts are still in flight,
+so download and decompression overlap and at most `concurrency` parts are
+held at once. Objects uploaded zstd or lz4 (frame) compressed are detected
+from the codec in their metadata; an object without one comes down as stored,
+even if it starts with a frame magic number (e.g. a .zst file synced as-is).
+
+The decompressed content is collected in memory and only spilled to a file
+once it outgrows the memory limit, so a model that fits can be deserialized
+straight from the returned bytes.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from src.compression import decompressor
+
+# Matches botocore's default max_pool_connections, so every part gets a pooled connection
+S3_FETCH_CONCURRENCY = int(os.getenv('S3_FETCH_CONCURRENCY', '10'))
+S3_FETCH_PART_SIZE = int(float(os.getenv('S3_FETCH_PART_SIZE_MB', '8')) * 1024 * 1024)
+# Largest decompressed object kept in memory; unset uses a share of the function's (or machine's) memory
+S3_FETCH_MEMORY_LIMIT_MB = os.getenv('S3_FETCH_MEMORY_LIMIT_MB')
+
+
+def memory_limit_bytes() -> int:
+    """
+    Largest object to keep in memory. Half of the Lambda function's memory
+    (the deserialized model needs about as much again), otherwise a quarter
+    of the memory currently available.
+    """
+    if S3_FETCH_MEMORY_LIMIT_MB is not None:
+        return int(float(S3_FETCH_MEMORY_LIMIT_MB) * 1024 * 1024)
+    lambda_mb = os.getenv('AWS_LAMBDA_FUNCTION_MEMORY_SIZE')
+    if lambda_mb:
+        return int(lambda_mb) * 1024 * 1024 // 2
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024 // 4
+    except OSError:
+        pass
+    return 256 * 1024 * 1024
+
+
+class RangedFetcher:
+    """Downloads S3 objects as concurrent byte-range GETs"""
+
+    def __init__(self, s3_client, concurrency: int = S3_FETCH_CONCURRENCY, part_size: int = S3_FETCH_PART_SIZE) -> None:
+        """
+        Args:
+            s3_client: boto3 S3 client (thread-safe, shared by the workers)
+            concurrency: Parts downloaded at once
+            part_size: Bytes per range request
+        """
+        if concurrency < 1 or part_size < 1:
+            raise ValueError("concurrency and part_size must be positive")
+        self.s3_client = s3_client
+        self.concurrency = concurrency
+        self.part_size = part_size
+
+    def _get_range(self, bucket: str, key: str, start: int, end: int, etag: str, version_id: Optional[str]) -> bytes:
+        extra = {"VersionId": version_id} if version_id else {}
+        # IfMatch fails the part (instead of mixing versions) if the object is replaced mid-download
+        response = self.s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag, **extra)
+        return response["Body"].read()
+
+    def iter_parts(self, bucket: str, key: str, head: Dict[str, Any]) -> Iterator[bytes]:
+        """Raw parts of the object in order, with up to concurrency parts in flight"""
+        size = head["ContentLength"]
+        ranges = [(start, min(start + self.part_size, size) - 1) for start in range(0, size, self.part_size)]
+        if not ranges:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(ranges)), thread_name_prefix="s3-fetch") as pool:
+            pending = []
+            next_part = 0
+            for index in range(len(ranges)):
+                # Sliding window: keep the pool busy without buffering the whole object
+                while next_part < len(ranges) and next_part < index + self.concurrency:
+                    start, end = ranges[next_part]
+                    pending.append(pool.submit(
+                        self._get_range, bucket, key, start, end, head["ETag"], head.get("VersionId")
+                    ))
+                    next_part += 1
+                yield pending[index].result()
+                pending[index] = None
+
+    def iter_content(self, bucket: str, key: str, head: Dict[str, Any]) -> Iterator[bytes]:
+        """Decompressed content of the object, chunk by chunk"""
+        # Only the upload's codec metadata counts, as in S3Handler.download_file
+        codec = (head.get("Metadata") or {}).get("codec")
+        stream = decompressor(codec)
+        for part in self.iter_parts(bucket, key, head):
+            chunk = stream.decompress(part) if stream else part
+            if chunk:
+                yield chunk
+        if stream and not stream.eof:
+            raise ValueError(f"s3://{bucket}/{key} ended in the middle of a {codec} frame")
+
+    def fetch(
+        self,
+        bucket: str,
+        key: str,
+        spill_path: Optional[str],
+        head: Optional[Dict[str, Any]] = None,
+        memory_limit: Optional[int] = None,
+    ) -> Tuple[Optional[bytearray], int]:
+        """
+        Download and decompress an object.
+
+        Args:
+            bucket: Bucket name
+            key: Object key
+            spill_path: File the content is written to once it exceeds memory_limit
+                (None keeps everything in memory)
+            head: head_object response, if the caller already has one
+            memory_limit: Bytes to keep in memory (0 writes straight to spill_path)
+
+        Returns:
+            (content, size): content is None when it was spilled to spill_path
+            (returned without a copy, so it is a bytearray)
+        """
+        head = head or self.s3_client.head_object(Bucket=bucket, Key=key)
+        limit = memory_limit_bytes() if memory_limit is None else memory_limit
+
+        buffer = bytearray()
+        spill = None
+        size = 0
+        try:
+            for chunk in self.iter_content(bucket, key, head):
+                size += len(chunk)
+                if spill is None and spill_path is not None and size > limit:
+                    if limit:
+                        logging.info(f"s3://{bucket}/{key} exceeds {limit / 1e6:.0f} MB in memory, spilling to {spill_path}")
+                    spill = open(spill_path, 'wb')
+                    spill.write(buffer)
+                    buffer = None
+                if spill is not None:
+                    spill.write(chunk)
+                else:
+                    buffer += chunk
+        finally:
+            if spill is not None:
+                spill.close()
+        return (buffer if spill is None else None), size
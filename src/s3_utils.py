@@ -1,45 +1,408 @@
-import boto3
+import hashlib
 import logging
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
+from src.compression import S3_UPLOAD_CODEC, compress_file, decompress_file, upload_codec
+from src.s3_client import get_s3_client
+from src.s3_fetch import RangedFetcher
+
+MB = 1024 * 1024
+
+# Multipart settings for upload_file/download_file (boto3's defaults: 8 MB parts, 10 threads)
+S3_MULTIPART_THRESHOLD_MB = float(os.getenv('S3_MULTIPART_THRESHOLD_MB', '8'))
+S3_MULTIPART_CHUNK_MB = float(os.getenv('S3_MULTIPART_CHUNK_MB', '8'))
+S3_TRANSFER_CONCURRENCY = int(os.getenv('S3_TRANSFER_CONCURRENCY', '10'))
+# Files transferred at once by sync_directory / upload_files
+S3_SYNC_CONCURRENCY = int(os.getenv('S3_SYNC_CONCURRENCY', '8'))
+
+HASH_CHUNK = MB
+
+
+def sha256_file(path: str) -> str:
+    """Hex SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def md5_file(path: str) -> str:
+    """Hex MD5 of a file's content (the ETag of a single-part upload)"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TransferProgress:
+    """
+    Bytes moved by one or more transfers, fed by boto3's Callback.
+
+    boto3 calls it from its worker threads with the bytes of each chunk; the
+    optional callback gets this object after every update, e.g. to drive a
+    progress bar from fraction and throughput.
+    """
+
+    def __init__(self, total: int, label: str = "", callback: Optional[Callable[["TransferProgress"], None]] = None) -> None:
+        self.total = total
+        self.label = label
+        self.transferred = 0
+        self.started = time.perf_counter()
+        self._callback = callback
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_amount: int) -> None:
+        with self._lock:
+            self.transferred += bytes_amount
+        if self._callback is not None:
+            self._callback(self)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def fraction(self) -> float:
+        return self.transferred / self.total if self.total else 1.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second so far"""
+        return self.transferred / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.transferred / 1e6:.1f} MB in {self.elapsed:.2f}s ({self.throughput / 1e6:.1f} MB/s)"
+
+
 class S3Handler:
     """Handle S3 operations for model and parameter storage"""
 
-    def __init__(self, bucket_name: str = None, region: str = None):
+    def __init__(self, bucket_name: str = None, region: str = None, transfer_config: Optional[TransferConfig] = None):
         self.bucket_name = bucket_name or os.getenv('AWS_BUCKET_NAME', 'wine-quality-mlops-sujan')
         self.region = region or os.getenv('AWS_REGION', 'us-east-2')
-        self.s3_client = boto3.client('s3', region_name=self.region)
+        # Shared with every other S3Handler (and the servers) in this process, with its connection pool
+        self.s3_client = get_s3_client(self.region)
+        self.transfer_config = transfer_config or TransferConfig(
+            multipart_threshold=int(S3_MULTIPART_THRESHOLD_MB * MB),
+            multipart_chunksize=int(S3_MULTIPART_CHUNK_MB * MB),
+            max_concurrency=S3_TRANSFER_CONCURRENCY,
+        )
+
+    def upload_file(
+        self,
+        local_file: str,
+        s3_key: str,
+        callback: Optional[Callable[[int], None]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        codec: Optional[str] = None,
+        level: Optional[int] = None,
+    ) -> bool:
+        """
+        Upload a file to S3 (multipart above S3_MULTIPART_THRESHOLD_MB)
 
-    def upload_file(self, local_file: str, s3_key: str) -> bool:
-        """Upload a file to S3"""
+        Args:
+            local_file: File to upload
+            s3_key: Destination key
+            callback: Called with the bytes of each chunk sent (e.g. a TransferProgress)
+            metadata: User metadata stored with the object
+            codec: Compress on the way up ("zstd", "lz4"; "none" or None uploads as-is).
+                The codec, level, uncompressed size and SHA-256 go into the object's metadata.
+            level: Compression level (default: S3_UPLOAD_LEVEL, else the codec's default)
+        """
+        progress = TransferProgress(0)
+        codec, level = upload_codec(codec, level) if codec else (None, None)
+        upload_path = local_file
         try:
-            self.s3_client.upload_file(local_file, self.bucket_name, s3_key)
-            logging.info(f"✅ Uploaded {local_file} to s3://{self.bucket_name}/{s3_key}")
+            if codec:
+                fd, upload_path = tempfile.mkstemp(prefix="upload-", suffix=f".{codec}")
+                os.close(fd)
+                started = time.perf_counter()
+                compressed_size = compress_file(local_file, upload_path, codec, level)
+                size = os.path.getsize(local_file)
+                metadata = {
+                    **(metadata or {}),
+                    "codec": codec,
+                    "codec-level": str(level),
+                    "uncompressed-size": str(size),
+                    "sha256": sha256_file(local_file),
+                }
+                logging.info(
+                    f"🗜️  {local_file} {codec}-{level}: {size / 1e6:.1f} -> {compressed_size / 1e6:.1f} MB "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+            extra = {"ExtraArgs": {"Metadata": metadata}} if metadata else {}
+            self.s3_client.upload_file(
+                upload_path, self.bucket_name, s3_key, Config=self.transfer_config,
+                Callback=self._chain(progress, callback), **extra
+            )
+            logging.info(f"✅ Uploaded {local_file} to s3://{self.bucket_name}/{s3_key} ({progress})")
             return True
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
             logging.error(f"❌ Failed to upload {local_file}: {e}")
             return False
+        finally:
+            if upload_path != local_file and os.path.exists(upload_path):
+                os.remove(upload_path)
+
+    def download_file(self, s3_key: str, local_file: str, callback: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        Download a file from S3 (ranged parts above S3_MULTIPART_THRESHOLD_MB).
+        Objects uploaded compressed (a codec in their metadata) are
+        decompressed in place, so local_file always holds the original
+        content. Objects stored compressed on purpose (e.g. a .zst file
+        synced as-is) come down as they are.
 
-    def download_file(self, s3_key: str, local_file: str) -> bool:
-        """Download a file from S3"""
+        Args:
+            s3_key: Object key
+            local_file: Destination file
+            callback: Called with the bytes of each chunk received (e.g. a TransferProgress)
+        """
+        progress = TransferProgress(0)
         try:
-            self.s3_client.download_file(self.bucket_name, s3_key, local_file)
-            logging.info(f"✅ Downloaded s3://{self.bucket_name}/{s3_key} to {local_file}")
+            metadata = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key).get('Metadata', {})
+            self.s3_client.download_file(
+                self.bucket_name, s3_key, local_file, Config=self.transfer_config, Callback=self._chain(progress, callback)
+            )
+            codec = metadata.get('codec')
+            if codec and os.path.exists(local_file):
+                decompress_file(local_file, codec)
+            logging.info(f"✅ Downloaded s3://{self.bucket_name}/{s3_key} to {local_file} ({progress})")
             return True
         except ClientError as e:
             logging.error(f"❌ Failed to download {s3_key}: {e}")
             return False
+        except ValueError as e:
+            # Corrupt or truncated compressed object: don't leave the undecompressed bytes behind
+            logging.error(f"❌ Failed to decompress {s3_key}: {e}")
+            if os.path.exists(local_file):
+                os.remove(local_file)
+            return False
+
+    @staticmethod
+    def _chain(*callbacks) -> Callable[[int], None]:
+        callbacks = [callback for callback in callbacks if callback is not None]
+
+        def callback(bytes_amount: int) -> None:
+            for each in callbacks:
+                each(bytes_amount)
+        return callback
+
+    def list_objects(self, s3_prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Key -> {"size", "etag"} of every object under a prefix"""
+        objects = {}
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=s3_prefix):
+            for item in page.get('Contents', []):
+                objects[item['Key']] = {"size": item['Size'], "etag": item['ETag']}
+        return objects
+
+    def same_content(self, local_file: str, s3_key: str, remote: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Whether a local file already matches an object: same size, then the same
+        SHA-256 (recorded in the object's metadata by sync and compressed
+        uploads) or, for single-part uploads without it, the same MD5 ETag.
+        Compressed objects are compared by their uncompressed size.
+        """
+        if remote is None:
+            remote = self.list_objects(s3_key).get(s3_key)
+        if remote is None or not os.path.exists(local_file):
+            return False
+        try:
+            metadata = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key).get('Metadata', {})
+        except ClientError:
+            return False
+        if os.path.getsize(local_file) != int(metadata.get('uncompressed-size', remote["size"])):
+            return False
+        if 'sha256' in metadata:
+            return metadata['sha256'] == sha256_file(local_file)
+        etag = remote["etag"].strip('"')
+        # Multipart ETags ("<md5 of part md5s>-<parts>") depend on the part size, not just the content
+        return '-' not in etag and etag == md5_file(local_file)
+
+    def sync_directory(
+        self,
+        local_dir: str,
+        s3_prefix: str,
+        direction: str = "upload",
+        max_workers: int = S3_SYNC_CONCURRENCY,
+        callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Mirror a directory to or from an S3 prefix, transferring files in parallel
+        and skipping those whose size and hash already match.
+
+        Args:
+            local_dir: Local directory (created for downloads)
+            s3_prefix: Key prefix mirroring it (e.g. "models")
+            direction: "upload" (local -> S3) or "download" (S3 -> local)
+            max_workers: Files transferred at once (each file's parts use transfer_config on top)
+            callback: Gets the overall TransferProgress after every chunk
+
+        Returns:
+            dict with transferred, skipped and failed (relative paths), bytes, seconds and
+            throughput_mbps (MB/s over the files actually transferred)
+        """
+        if direction not in ("upload", "download"):
+            raise ValueError(f"direction must be 'upload' or 'download', not '{direction}'")
+        prefix = s3_prefix.strip("/") + "/" if s3_prefix.strip("/") else ""
+        remote = self.list_objects(prefix)
+
+        pairs: List[Tuple[str, str, str]] = []  # (relative path, local file, key)
+        if direction == "upload":
+            for root, _, files in os.walk(local_dir):
+                for name in sorted(files):
+                    local_file = os.path.join(root, name)
+                    relative = os.path.relpath(local_file, local_dir).replace(os.sep, "/")
+                    pairs.append((relative, local_file, prefix + relative))
+        else:
+            for key in sorted(remote):
+                relative = key[len(prefix):]
+                if relative and not relative.endswith("/"):
+                    pairs.append((relative, os.path.join(local_dir, *relative.split("/")), key))
+
+        total = sum(os.path.getsize(local) if direction == "upload" else remote[key]["size"] for _, local, key in pairs)
+        progress = TransferProgress(total, label=f"{direction} {local_dir} <-> s3://{self.bucket_name}/{prefix}", callback=callback)
+        result: Dict[str, Any] = {"transferred": [], "skipped": [], "failed": []}
+        lock = threading.Lock()
+
+        def sync_one(relative: str, local_file: str, key: str) -> None:
+            if self.same_content(local_file, key, remote.get(key)):
+                with lock:
+                    progress.total -= remote[key]["size"]
+                outcome = "skipped"
+            elif direction == "upload":
+                ok = self.upload_file(local_file, key, callback=progress, metadata={"sha256": sha256_file(local_file)})
+                outcome = "transferred" if ok else "failed"
+            else:
+                os.makedirs(os.path.dirname(local_file) or ".", exist_ok=True)
+                outcome = "transferred" if self.download_file(key, local_file, callback=progress) else "failed"
+            with lock:
+                result[outcome].append(relative)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="s3-sync") as pool:
+            for future in [pool.submit(sync_one, *pair) for pair in pairs]:
+                future.result()
+
+        for outcome in ("transferred", "skipped", "failed"):
+            result[outcome].sort()
+        result.update(
+            bytes=progress.transferred,
+            seconds=round(progress.elapsed, 3),
+            throughput_mbps=round(progress.throughput / 1e6, 1),
+        )
+        logging.info(
+            f"🔄 Synced {local_dir} {'->' if direction == 'upload' else '<-'} s3://{self.bucket_name}/{prefix}: "
+            f"{len(result['transferred'])} transferred, {len(result['skipped'])} unchanged, "
+            f"{len(result['failed'])} failed ({progress})"
+        )
+        return result
+
+    def upload_files(
+        self, files: Dict[str, str], max_workers: int = S3_SYNC_CONCURRENCY, codec: Optional[str] = None
+    ) -> Dict[str, bool]:
+        """Upload several files in parallel (optionally compressed); local file -> S3 key in, local file -> success out"""
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files) or 1)), thread_name_prefix="s3-upload") as pool:
+            futures = {local: pool.submit(self.upload_file, local, key, codec=codec) for local, key in files.items()}
+        return {local: future.result() for local, future in futures.items()}
+
+    def fetch_file(self, s3_key: str, local_file: str) -> bool:
+        """Download a file with parallel ranged GETs, decompressing zstd/lz4 objects"""
+        partial = local_file + ".part"
+        try:
+            _, size = RangedFetcher(self.s3_client).fetch(self.bucket_name, s3_key, partial, memory_limit=0)
+            if not os.path.exists(partial):
+                open(partial, 'wb').close()  # empty object
+            os.replace(partial, local_file)
+            logging.info(f"✅ Fetched s3://{self.bucket_name}/{s3_key} to {local_file} ({size / 1e6:.1f} MB)")
+            return True
+        except (ClientError, ValueError) as e:
+            logging.error(f"❌ Failed to fetch {s3_key}: {e}")
+            return False
+
+    def fetch_bytes(self, s3_key: str) -> Optional[bytearray]:
+        """Download an object into memory with parallel ranged GETs, decompressing zstd/lz4 objects"""
+        try:
+            data, _ = RangedFetcher(self.s3_client).fetch(self.bucket_name, s3_key, spill_path=None)
+            return data
+        except (ClientError, ValueError) as e:
+            logging.error(f"❌ Failed to fetch {s3_key}: {e}")
+            return None
+
+    def get_etag(self, s3_key: str) -> Optional[str]:
+        """Return the ETag of an S3 object, or None if it can't be read"""
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return response['ETag']
+        except ClientError as e:
+            logging.error(f"❌ Failed to read ETag of {s3_key}: {e}")
+            return None
+
+    def get_if_changed(self, s3_key: str, etag: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Read a small object unless it still has the given ETag.
+
+        Args:
+            s3_key: Object key
+            etag: ETag of the copy the caller already has (None reads unconditionally)
+
+        Returns:
+            (content, ETag); content is None when the object is unchanged (S3 answered 304)
+
+        Raises:
+            ClientError: if the object can't be read (e.g. NoSuchKey)
+        """
+        extra = {"IfNoneMatch": etag} if etag else {}
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key, **extra)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                return None, etag
+            raise
+        return response["Body"].read(), response["ETag"]
+
+    def put_bytes(self, s3_key: str, data: bytes, if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> str:
+        """
+        Write a small object, optionally as a conditional write.
+
+        Args:
+            s3_key: Object key
+            data: Content
+            if_match: Only overwrite the object if it still has this ETag
+            if_none_match: "*" only creates the object if it doesn't exist yet
+
+        Returns:
+            ETag of the written object
+
+        Raises:
+            ClientError: PreconditionFailed when a condition doesn't hold
+        """
+        extra = {}
+        if if_match:
+            extra["IfMatch"] = if_match
+        if if_none_match:
+            extra["IfNoneMatch"] = if_none_match
+        response = self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=data, **extra)
+        return response["ETag"]
 
-    def upload_model(self, model_path: str = "model.pkl") -> bool:
-        """Upload model.pkl to S3"""
+    def upload_model(self, model_path: str = "model.pkl", codec: str = S3_UPLOAD_CODEC) -> bool:
+        """Upload model.pkl to S3, compressed with S3_UPLOAD_CODEC"""
         s3_key = f"models/{model_path}"
-        return self.upload_file(model_path, s3_key)
+        return self.upload_file(model_path, s3_key, codec=codec)
 
-    def upload_params(self, params_path: str = "best_params.json") -> bool:
-        """Upload best_params.json to S3"""
+    def upload_params(self, params_path: str = "best_params.json", codec: str = S3_UPLOAD_CODEC) -> bool:
+        """Upload best_params.json to S3, compressed with S3_UPLOAD_CODEC"""
         s3_key = f"hyperparameters/{params_path}"
-        return self.upload_file(params_path, s3_key)
+        return self.upload_file(params_path, s3_key, codec=codec)
 
     def download_model(self, local_path: str = "model.pkl") -> bool:
         """Download model.pkl from S3"""
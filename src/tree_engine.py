@@ -0,0 +1,388 @@
+"""
+Flat-array inference engine for tree ensembles.
+
+A trained RandomForest, LightGBM or XGBoost regressor is exported into one
+structure-of-arrays representation (split feature, threshold, children,
+default direction and leaf value per node, every tree concatenated), which a
+vectorized NumPy traversal scores without the estimator's per-call overhead.
+Only numpy is needed at prediction time, so the Lambda image can use it.
+"""
+import json
+import logging
+import os
+from typing import Any, List, Optional
+
+import numpy as np
+
+# Use the engine instead of the native predict ("false" always calls model.predict)
+TREE_ENGINE_ENABLED = os.getenv('TREE_ENGINE', 'true').lower() == 'true'
+# Larger batches go to the native predict, which is faster once per-call overhead is amortized.
+# Unset (0) uses the measured crossover for the model type (benchmarks/bench_tree_engine.py)
+TREE_ENGINE_MAX_ROWS = int(os.getenv('TREE_ENGINE_MAX_ROWS', '0'))
+FOREST_MAX_ROWS = 256
+BOOSTING_MAX_ROWS = 32
+
+# How a node treats a missing value (per node, mirrors LightGBM's missing_type)
+MISSING_NONE = 0  # NaN is compared as 0.0
+MISSING_ZERO = 1  # NaN and 0.0 follow the default direction
+MISSING_NAN = 2  # NaN follows the default direction
+
+# Node-visit budget per traversal block, bounds the (rows, trees) index arrays
+BLOCK_NODES = 1 << 18
+ZERO_THRESHOLD = 1e-35
+
+SKLEARN_TREES = ("RandomForestRegressor", "ExtraTreesRegressor", "DecisionTreeRegressor")
+ARRAY_FIELDS = ("feature", "threshold", "children", "value", "default_left", "missing", "roots")
+IDENTITY_OBJECTIVES_XGB = ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror", "reg:quantileerror")
+IDENTITY_OBJECTIVES_LGBM = ("regression", "regression_l1", "huber", "fair", "quantile", "mape")
+
+
+class TreeEnsemble:
+    """
+    All trees of a regression ensemble as flat node arrays.
+
+    Node i splits on feature[i] at threshold[i]: rows with x <= threshold go
+    to children[2*i + 1] (left), the rest to children[2*i] (right). Leaves
+    point to themselves, so every row can take max_depth steps. The
+    prediction is base_score + scale * (sum of the leaf values reached).
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children: np.ndarray,
+        value: np.ndarray,
+        default_left: np.ndarray,
+        missing: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        n_features: int,
+        base_score: float = 0.0,
+        scale: float = 1.0,
+        float32_input: bool = False,
+        source: str = "",
+    ) -> None:
+        """
+        Args:
+            feature/threshold/value/default_left/missing: One entry per node
+            children: Two entries per node, (right, left)
+            roots: Root node of each tree
+            max_depth: Deepest leaf, the number of traversal steps
+            n_features: Width of the input matrix
+            base_score: Added to every prediction (XGBoost)
+            scale: Multiplies the summed leaf values (1 / n_trees for forests)
+            float32_input: Round inputs to float32 first, as sklearn and XGBoost do
+            source: Estimator class the ensemble was exported from
+        """
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.children = np.ascontiguousarray(children, dtype=np.intp)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.missing = np.ascontiguousarray(missing, dtype=np.int8)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.base_score = float(base_score)
+        self.scale = float(scale)
+        self.float32_input = bool(float32_input)
+        self.source = source
+        self._has_zero_missing = bool((self.missing == MISSING_ZERO).any())
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ARRAY_FIELDS)
+
+    @property
+    def max_rows(self) -> int:
+        """Largest batch the engine scores faster than the native predict"""
+        if TREE_ENGINE_MAX_ROWS:
+            return TREE_ENGINE_MAX_ROWS
+        # sklearn's per-call overhead (~10 ms for 200 trees) is far higher than LightGBM's/XGBoost's
+        return FOREST_MAX_ROWS if self.source in SKLEARN_TREES else BOOSTING_MAX_ROWS
+
+    @classmethod
+    def from_model(cls, model: Any) -> "TreeEnsemble":
+        """
+        Export a fitted RandomForestRegressor/ExtraTreesRegressor/
+        DecisionTreeRegressor, LGBMRegressor or XGBRegressor.
+
+        Raises:
+            ValueError: for unsupported estimators or objectives
+        """
+        module = type(model).__module__
+        if module.startswith("sklearn"):
+            return _from_sklearn(model)
+        if module.startswith("lightgbm"):
+            return _from_lightgbm(model)
+        if module.startswith("xgboost"):
+            return _from_xgboost(model)
+        raise ValueError(f"{type(model).__name__} is not a supported tree ensemble")
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Predictions for a (n_records, n_features) matrix"""
+        X = np.asarray(features, dtype=np.float32 if self.float32_input else np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input of shape (n, {self.n_features}), got {X.shape}")
+        X = np.ascontiguousarray(X, dtype=np.float64)
+
+        handle_missing = self._has_zero_missing or bool(np.isnan(X).any())
+        out = np.empty(len(X), dtype=np.float64)
+        block = max(1, BLOCK_NODES // self.n_trees)
+        for start in range(0, len(X), block):
+            out[start:start + block] = self._predict_block(X[start:start + block], handle_missing)
+        return out
+
+    def _predict_block(self, X: np.ndarray, handle_missing: bool) -> np.ndarray:
+        flat = X.ravel()
+        row_offset = (np.arange(len(X)) * self.n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees))
+
+        for _ in range(self.max_depth):
+            x = flat[row_offset + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if handle_missing:
+                go_left = self._missing_direction(x, nodes, go_left)
+            nodes = self.children[2 * nodes + go_left]
+
+        return self.base_score + self.scale * self.value[nodes].sum(axis=1)
+
+    def _missing_direction(self, x: np.ndarray, nodes: np.ndarray, go_left: np.ndarray) -> np.ndarray:
+        is_nan = np.isnan(x)
+        kind = self.missing[nodes]
+        # MISSING_NONE: compare NaN as 0.0
+        go_left = np.where(is_nan & (kind == MISSING_NONE), 0.0 <= self.threshold[nodes], go_left)
+        use_default = is_nan & (kind == MISSING_NAN)
+        if self._has_zero_missing:
+            use_default |= (kind == MISSING_ZERO) & (is_nan | (np.abs(x) <= ZERO_THRESHOLD))
+        return np.where(use_default, self.default_left[nodes], go_left)
+
+    def touch(self) -> int:
+        """
+        Read one byte per page of every node array, so a memory-mapped
+        ensemble is resident before the first request. Returns the bytes covered.
+        """
+        page = 4096
+        for name in ARRAY_FIELDS:
+            raw = getattr(self, name).reshape(-1).view(np.uint8)
+            np.add.reduce(raw[::page], dtype=np.uint64)
+        return self.nbytes
+
+    @property
+    def params(self) -> dict:
+        """Scalar constructor arguments (everything except the node arrays)"""
+        return {
+            "max_depth": self.max_depth,
+            "n_features": self.n_features,
+            "base_score": self.base_score,
+            "scale": self.scale,
+            "float32_input": self.float32_input,
+            "source": self.source,
+        }
+
+    def save(self, path: str) -> None:
+        """Write the arrays and scalars to an .npz file"""
+        np.savez(
+            path,
+            **{name: getattr(self, name) for name in ARRAY_FIELDS},
+            meta=np.array(json.dumps(self.params)),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsemble":
+        """Read an ensemble written by save()"""
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in ARRAY_FIELDS}, **json.loads(str(data["meta"])))
+
+
+class _Builder:
+    """Accumulates trees into the flat node arrays"""
+
+    def __init__(self) -> None:
+        self.feature: List[int] = []
+        self.threshold: List[float] = []
+        self.children: List[int] = []
+        self.value: List[float] = []
+        self.default_left: List[bool] = []
+        self.missing: List[int] = []
+        self.roots: List[int] = []
+        self.max_depth = 0
+
+    def add_node(self) -> int:
+        self.feature.append(0)
+        self.threshold.append(0.0)
+        self.children.extend((len(self.feature) - 1, len(self.feature) - 1))
+        self.value.append(0.0)
+        self.default_left.append(False)
+        self.missing.append(MISSING_NAN)
+        return len(self.feature) - 1
+
+    def set_split(self, node, feature, threshold, left, right, default_left, missing) -> None:
+        self.feature[node] = feature
+        self.threshold[node] = threshold
+        self.children[2 * node] = right
+        self.children[2 * node + 1] = left
+        self.default_left[node] = default_left
+        self.missing[node] = missing
+
+    def build(self, n_features, **kwargs) -> TreeEnsemble:
+        return TreeEnsemble(
+            np.array(self.feature), np.array(self.threshold), np.array(self.children), np.array(self.value),
+            np.array(self.default_left), np.array(self.missing), np.array(self.roots),
+            max_depth=self.max_depth, n_features=n_features, **kwargs,
+        )
+
+
+def _from_sklearn(model: Any) -> TreeEnsemble:
+    trees = getattr(model, "estimators_", None)
+    if trees is None and hasattr(model, "tree_"):
+        trees = [model]
+    if trees is None or type(model).__name__ not in SKLEARN_TREES:
+        raise ValueError(f"{type(model).__name__} is not a supported tree ensemble")
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("Only single-output regressors are supported")
+
+    parts = {name: [] for name in ("feature", "threshold", "children", "value", "default_left", "missing")}
+    roots, offset, max_depth = [], 0, 0
+    for estimator in trees:
+        tree = estimator.tree_
+        n = tree.node_count
+        leaf = tree.children_left < 0
+        own = np.arange(n) + offset
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+
+        parts["feature"].append(np.where(leaf, 0, tree.feature))
+        parts["threshold"].append(np.where(leaf, 0.0, tree.threshold))
+        # (right, left) per node; leaves point to themselves
+        parts["children"].append(np.column_stack([
+            np.where(leaf, own, tree.children_right + offset),
+            np.where(leaf, own, tree.children_left + offset),
+        ]).ravel())
+        parts["value"].append(np.where(leaf, tree.value[:, 0, 0], 0.0))
+        missing_left = getattr(tree, "missing_go_to_left", None)
+        parts["default_left"].append(
+            np.asarray(missing_left, dtype=bool) if missing_left is not None else np.zeros(n, dtype=bool)
+        )
+        parts["missing"].append(np.full(n, MISSING_NAN, dtype=np.int8))
+        offset += n
+
+    return TreeEnsemble(
+        **{name: np.concatenate(arrays) for name, arrays in parts.items()},
+        roots=np.array(roots),
+        max_depth=max_depth,
+        n_features=model.n_features_in_,
+        scale=1.0 / len(trees),
+        float32_input=True,
+        source=type(model).__name__,
+    )
+
+
+def _from_lightgbm(model: Any) -> TreeEnsemble:
+    booster = getattr(model, "booster_", model)
+    dump = booster.dump_model()
+    objective = dump.get("objective", "").split(" ")[0]
+    if objective not in IDENTITY_OBJECTIVES_LGBM:
+        raise ValueError(f"LightGBM objective '{objective}' is not supported")
+    if dump.get("num_tree_per_iteration", 1) != 1:
+        raise ValueError("Only single-output LightGBM models are supported")
+
+    missing_kinds = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+    builder = _Builder()
+
+    def add(node: dict, depth: int) -> int:
+        index = builder.add_node()
+        if "leaf_value" in node:
+            builder.value[index] = node["leaf_value"]
+            builder.max_depth = max(builder.max_depth, depth)
+            return index
+        if node["decision_type"] != "<=":
+            raise ValueError("Categorical LightGBM splits are not supported")
+        left = add(node["left_child"], depth + 1)
+        right = add(node["right_child"], depth + 1)
+        builder.set_split(
+            index, node["split_feature"], node["threshold"], left, right,
+            node["default_left"], missing_kinds[node["missing_type"]],
+        )
+        return index
+
+    for tree in dump["tree_info"]:
+        builder.roots.append(add(tree["tree_structure"], 0))
+
+    n_trees = len(builder.roots)
+    return builder.build(
+        dump["max_feature_idx"] + 1,
+        scale=1.0 / n_trees if dump.get("average_output") else 1.0,
+        source=type(model).__name__,
+    )
+
+
+def _from_xgboost(model: Any) -> TreeEnsemble:
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    config = json.loads(booster.save_config())["learner"]
+    objective = config["objective"]["name"]
+    if objective not in IDENTITY_OBJECTIVES_XGB:
+        raise ValueError(f"XGBoost objective '{objective}' is not supported")
+    if config.get("gradient_booster", {}).get("name", "gbtree") != "gbtree":
+        raise ValueError("Only gbtree XGBoost models are supported")
+    base_score = float(config["learner_model_param"]["base_score"].strip("[]"))
+
+    names = booster.feature_names
+    feature_index = {name: i for i, name in enumerate(names)} if names else {}
+    n_features = int(config["learner_model_param"]["num_feature"])
+    builder = _Builder()
+
+    def add(node: dict, depth: int) -> int:
+        index = builder.add_node()
+        if "leaf" in node:
+            builder.value[index] = node["leaf"]
+            builder.max_depth = max(builder.max_depth, depth)
+            return index
+        children = {child["nodeid"]: add(child, depth + 1) for child in node["children"]}
+        split = node["split"]
+        feature = feature_index[split] if split in feature_index else int(split.lstrip("f"))
+        # XGBoost goes left on x < t in float32; x <= nextafter(t, -inf) is the same test
+        threshold = np.nextafter(np.float32(node["split_condition"]), np.float32(-np.inf))
+        builder.set_split(
+            index, feature, float(threshold), children[node["yes"]], children[node["no"]],
+            node["missing"] == node["yes"], MISSING_NAN,
+        )
+        return index
+
+    trees = booster.get_dump(dump_format="json")
+    # predict() stops at the best iteration when the model was trained with early stopping
+    best_iteration = getattr(model, "best_iteration", None)
+    if best_iteration is not None:
+        trees = trees[:best_iteration + 1]
+    for tree in trees:
+        builder.roots.append(add(json.loads(tree), 0))
+
+    return builder.build(n_features, base_score=base_score, float32_input=True, source=type(model).__name__)
+
+
+def compile_model(model: Any) -> Optional[TreeEnsemble]:
+    """Export model for the flat-array engine, or None when it isn't a supported tree ensemble"""
+    if not TREE_ENGINE_ENABLED:
+        return None
+    if isinstance(model, TreeEnsemble):
+        # Already flat arrays (e.g. loaded from a model artifact)
+        return model
+    try:
+        ensemble = TreeEnsemble.from_model(model)
+    except Exception as e:
+        logging.debug(f"Tree engine not used for {type(model).__name__}: {e}")
+        return None
+    logging.info(
+        f"🌲 Compiled {ensemble.source}: {ensemble.n_trees} trees, {ensemble.n_nodes} nodes, "
+        f"{ensemble.nbytes / 1e6:.1f} MB"
+    )
+    return ensemble
@@ -1,9 +1,11 @@
 import logging
 import pandas as pd
 from zenml import step
+from src.chunked_ingestion import DATA_MEMORY_BUDGET_MB
 from src.data_cleaning import DataCleaning, DataPreProcessingStrategy, DataDivideStrategy
 from typing import Tuple
 from typing_extensions import Annotated
+from .config import DataConfig
 
 @step
 def clean_df(df: pd.DataFrame) -> Tuple[Annotated[pd.DataFrame,"X_train"], Annotated[pd.DataFrame,"X_test"], Annotated[pd.Series,"y_train"],Annotated[pd.Series,"y_test"]]:
@@ -29,4 +31,29 @@ def clean_df(df: pd.DataFrame) -> Tuple[Annotated[pd.DataFrame,"X_train"], Annot
 
     except Exception as e:
         logging.error("Error in cleaning data: {}".format(e))
-        raise e
\ No newline at end of file
+        raise e
+
+@step
+def clean_spilled(dataset_dir: str, config: DataConfig) -> Tuple[Annotated[pd.DataFrame,"X_train"], Annotated[pd.DataFrame,"X_test"], Annotated[pd.Series,"y_train"],Annotated[pd.Series,"y_test"]]:
+    """
+    Cleans a spilled dataset chunk by chunk and divides it into train and test
+
+    Args:
+        dataset_dir: Parquet dataset written by ingest_to_parquet
+        config: DataConfig with the memory_budget_mb of one chunk
+    Returns:
+        X_train, X_test, y_train, y_test
+    """
+    try:
+        processed_data = DataPreProcessingStrategy().handle_spill(dataset_dir, config.memory_budget_mb or DATA_MEMORY_BUDGET_MB)
+
+        divide_strategy = DataDivideStrategy()
+        data_cleaning = DataCleaning(processed_data, divide_strategy)
+        X_train, X_test, y_train, y_test = data_cleaning.handle_data()
+
+        logging.info("Chunked data cleaning completed")
+        return X_train, X_test, y_train, y_test
+
+    except Exception as e:
+        logging.error("Error in cleaning spilled data: {}".format(e))
+        raise e
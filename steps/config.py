@@ -1,9 +1,36 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
+UCI_WINE_URLS = {
+    "red": "https://archive.ics.uci.edu/ml/machine-learning-databases/wine-quality/winequality-red.csv",
+    "white": "https://archive.ics.uci.edu/ml/machine-learning-databases/wine-quality/winequality-white.csv",
+}
+
+class DataSource(BaseModel):
+    """One wine CSV to ingest"""
+    url: str
+    wine_type: str = "red"
+
 class DataConfig(BaseModel):
     """Data ingestion config"""
-    data_url: str = "https://archive.ics.uci.edu/ml/machine-learning-databases/wine-quality/winequality-red.csv"
+    data_url: str = UCI_WINE_URLS["red"]
     wine_type: str = "red"  # Options: "red", "white", "combined"
+    sources: List[DataSource] = []  # Loaded concurrently and combined; overrides data_url/wine_type
+    use_cache: bool = True  # Serve unchanged datasets from the local Parquet cache
+    offline: bool = False  # Use cached datasets without contacting the source (also DATASET_OFFLINE)
+    chunk_rows: Optional[int] = None  # Streaming ingestion: rows per chunk (None = sized from the memory budget)
+    memory_budget_mb: Optional[float] = None  # Streaming ingestion: memory per chunk (None = DATA_MEMORY_BUDGET_MB)
+    spill_dir: Optional[str] = None  # Streaming ingestion: Parquet dataset directory (None = DATA_SPILL_DIR)
+    chunked: bool = False  # Train from a Parquet spill streamed chunk by chunk, for inputs bigger than RAM
+
+    def resolved_sources(self) -> List[DataSource]:
+        """The declared sources, else data_url/wine_type ("combined" = the UCI red and white sets)"""
+        if self.sources:
+            return list(self.sources)
+        if self.wine_type == "combined":
+            return [DataSource(url=url, wine_type=wine_type) for wine_type, url in UCI_WINE_URLS.items()]
+        return [DataSource(url=self.data_url, wine_type=self.wine_type)]
 
 class ModelNameConfig(BaseModel):
     """Model config"""
@@ -1,8 +1,14 @@
 import logging
+from typing import Iterator, Optional
 
 import pandas as pd
-from zenml import step
+from typing_extensions import Annotated
+from zenml import log_metadata, step
 
+from src.chunked_ingestion import DATA_MEMORY_BUDGET_MB, DATA_SPILL_DIR, iter_chunks, iter_source_chunks, spill_to_parquet
+from src.data_ingestion import concat_frames, load_sources, read_source
+from src.data_schema import memory_report
+from src.dataset_cache import DATASET_OFFLINE, DatasetCache
 from .config import DataConfig
 
 
@@ -11,16 +17,19 @@ class IngestData:
     Data ingestion class which ingests data from URL and returns a DataFrame.
     """
 
-    def __init__(self, data_url: str, wine_type: str = "red") -> None:
+    def __init__(self, data_url: str, wine_type: str = "red", cache: Optional[DatasetCache] = None) -> None:
         """
         Initialize the data ingestion class.
 
         Args:
             data_url: URL to fetch the wine quality dataset
             wine_type: Type of wine dataset ("red", "white", or "combined")
+            cache: Local Parquet cache to serve the dataset from (None always downloads and parses)
         """
         self.data_url = data_url
         self.wine_type = wine_type
+        self.cache = cache
+        self.content_hash: Optional[str] = None
 
     def get_data(self) -> pd.DataFrame:
         """
@@ -32,14 +41,15 @@ class IngestData:
         try:
             logging.info(f"Fetching {self.wine_type} wine data from URL: {self.data_url}")
 
-            # Read CSV from URL with semicolon delimiter (UCI wine dataset uses semicolons)
-            df = pd.read_csv(self.data_url, sep=';')
-
-            # Add wine type column for tracking
-            df['wine_type'] = self.wine_type
+            # Read CSV with semicolon delimiter and add the wine type column for tracking
+            df = read_source(self.data_url, self.wine_type, cache=self.cache)
+            self.content_hash = df.attrs.get("dataset_sha256")
 
             logging.info(f"Successfully loaded {len(df)} records with {len(df.columns)} columns")
             logging.info(f"Columns: {list(df.columns)}")
+            memory_report(df, f"ingested {self.wine_type}")
+            if self.content_hash:
+                logging.info(f"Dataset SHA-256: {self.content_hash}")
 
             return df
 
@@ -47,41 +57,81 @@ class IngestData:
             logging.error(f"Error fetching data from {self.data_url}: {e}")
             raise e
 
+    def iter_chunks(self, chunk_rows: Optional[int] = None, memory_budget_mb: float = DATA_MEMORY_BUDGET_MB) -> Iterator[pd.DataFrame]:
+        """
+        Stream the dataset as typed chunks instead of one DataFrame.
+
+        Args:
+            chunk_rows: Fixed rows per chunk (default: sized from memory_budget_mb)
+            memory_budget_mb: Memory one chunk may take, parsing included
+
+        Returns:
+            Generator of DataFrames with the wine_type column
+        """
+        logging.info(f"Streaming {self.wine_type} wine data from: {self.data_url}")
+        return iter_chunks(self.data_url, self.wine_type, chunk_rows=chunk_rows, memory_budget_mb=memory_budget_mb)
+
 
 @step
 def ingest_df(config: DataConfig) -> pd.DataFrame:
     """
-    Ingest wine quality data from URL.
+    Ingest wine quality data from one URL, or several sources loaded concurrently.
 
     Args:
-        config: DataConfig with data_url and wine_type
+        config: DataConfig with data_url and wine_type, or a list of sources
 
     Returns:
         df: pd.DataFrame containing wine quality data
     """
     try:
-        # Handle combined dataset option
-        if config.wine_type == "combined":
-            # Fetch both red and white wine datasets
-            red_url = "https://archive.ics.uci.edu/ml/machine-learning-databases/wine-quality/winequality-red.csv"
-            white_url = "https://archive.ics.uci.edu/ml/machine-learning-databases/wine-quality/winequality-white.csv"
-
-            ingest_red = IngestData(red_url, "red")
-            ingest_white = IngestData(white_url, "white")
-
-            df_red = ingest_red.get_data()
-            df_white = ingest_white.get_data()
+        cache = DatasetCache(offline=config.offline or DATASET_OFFLINE) if config.use_cache else None
 
-            # Combine datasets
-            df = pd.concat([df_red, df_white], ignore_index=True)
-            logging.info(f"Combined dataset: {len(df)} total records")
-        else:
-            # Fetch single dataset
-            ingest_data = IngestData(config.data_url, config.wine_type)
+        sources = config.resolved_sources()
+        if len(sources) == 1:
+            ingest_data = IngestData(sources[0].url, sources[0].wine_type, cache=cache)
             df = ingest_data.get_data()
+        else:
+            # Fetch/parse every source at once, then combine into preallocated typed columns
+            frames = load_sources([(source.url, source.wine_type) for source in sources], cache=cache)
+            df = concat_frames(frames)
+            logging.info(f"Combined dataset: {len(df)} total records from {len(sources)} sources")
+
+        report = memory_report(df, "ingested dataset")
+        metadata = {"memory_mb": round(report["bytes"] / 1e6, 2), "dtypes": report["dtypes"]}
+        if df.attrs.get("dataset_sha256"):
+            # Recorded on the output artifact so training runs can be traced back to their data
+            metadata["dataset_sha256"] = df.attrs["dataset_sha256"]
+        log_metadata(metadata=metadata, infer_artifact=True)
 
         return df
 
     except Exception as e:
         logging.error(f"Error in ingest_df step: {e}")
         raise e
+
+
+@step
+def ingest_to_parquet(config: DataConfig) -> Annotated[str, "dataset_dir"]:
+    """
+    Stream every source into a partitioned Parquet dataset, for inputs bigger than RAM.
+
+    Args:
+        config: DataConfig with the sources, chunk_rows / memory_budget_mb and spill_dir
+
+    Returns:
+        Directory of the dataset, readable chunk by chunk with src.chunked_ingestion.iter_parquet_chunks
+    """
+    try:
+        directory = config.spill_dir or DATA_SPILL_DIR
+        chunks = iter_source_chunks(
+            [(source.url, source.wine_type) for source in config.resolved_sources()],
+            chunk_rows=config.chunk_rows,
+            memory_budget_mb=config.memory_budget_mb or DATA_MEMORY_BUDGET_MB,
+        )
+        summary = spill_to_parquet(chunks, directory)
+        log_metadata(metadata={"rows": summary["rows"], "chunks": summary["chunks"]}, infer_artifact=True)
+        return directory
+
+    except Exception as e:
+        logging.error(f"Error in ingest_to_parquet step: {e}")
+        raise e
@@ -3,29 +3,92 @@ import logging
 import os
 from sklearn.base import RegressorMixin
 from zenml import step
+from src.artifact_store import ArtifactStore
+from src.compression import S3_UPLOAD_CODEC
+from src.feature_contract import CONTRACT_FILENAME, FeatureContract
+from src.inference import model_version_of
+from src.model_artifact import ARTIFACT_FILENAME, save_artifact
 from src.s3_utils import S3Handler
 
+# Registry name for each model class trained by steps/model_train.py (served as /predict?model=<name>)
+REGISTRY_NAMES = {
+    "RandomForestRegressor": "randomforest",
+    "LGBMRegressor": "lightgbm",
+    "XGBRegressor": "xgboost",
+    "LinearRegression": "LinearRegressionModel",
+}
+
+def save_model_artifact(model: RegressorMixin, directory: str, contract: FeatureContract, version: str) -> bool:
+    """Write the memory-mappable artifact next to model.pkl; False when the model has no array form"""
+    path = os.path.join(directory, ARTIFACT_FILENAME)
+    try:
+        save_artifact(model, path, contract, version)
+        return True
+    except ValueError as e:
+        logging.info(f"No model artifact for {type(model).__name__} ({e}), servers will unpickle it")
+        # Don't leave a previous model's artifact next to the new pickle
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+
+
 @step
 def save_model(model: RegressorMixin) -> None:
     """Save trained model to disk and optionally to S3"""
     try:
         # Always save locally first
+        data = pickle.dumps(model)
         with open('model.pkl', 'wb') as f:
-            pickle.dump(model, f)
+            f.write(data)
         logging.info("💾 Model saved to model.pkl")
 
+        # Feature order/dtypes the servers use to build rows without pandas
+        contract = FeatureContract.from_model(model)
+        contract.save(CONTRACT_FILENAME)
+        logging.info(f"💾 Feature contract saved to {CONTRACT_FILENAME}")
+
+        # Same model as memory-mappable arrays, loaded without unpickling (written after the pickle so it's current)
+        has_artifact = save_model_artifact(model, '.', contract, model_version_of(data))
+
+        # Named copy for the API's model registry, so several trained models can be served side by side
+        registry_name = REGISTRY_NAMES.get(type(model).__name__, type(model).__name__)
+        registry_dir = os.path.join('models', registry_name)
+        os.makedirs(registry_dir, exist_ok=True)
+        with open(os.path.join(registry_dir, 'model.pkl'), 'wb') as f:
+            f.write(data)
+        contract.save(os.path.join(registry_dir, CONTRACT_FILENAME))
+        save_model_artifact(model, registry_dir, contract, model_version_of(data))
+        logging.info(f"💾 Registry copy saved to {registry_dir}/")
+
         # Upload to S3 if configured
         if os.getenv('SAVE_TO_S3', 'false').lower() == 'true':
             s3_handler = S3Handler()
 
-            # Upload model
-            if s3_handler.upload_model('model.pkl'):
-                logging.info("☁️  Model uploaded to S3")
+            # Model and hyperparameters go up in parallel, compressed (codec in the object metadata)
+            uploads = {'model.pkl': 'models/model.pkl'}
+            if os.path.exists('best_params.json'):
+                uploads['best_params.json'] = 'hyperparameters/best_params.json'
+            for local_file, uploaded in s3_handler.upload_files(uploads, codec=S3_UPLOAD_CODEC).items():
+                if uploaded:
+                    logging.info(f"☁️  {local_file} uploaded to S3")
+
+            # The contract is a few hundred bytes and a baked image reads it as `aws s3 cp` left it
+            if s3_handler.upload_file(CONTRACT_FILENAME, f"models/{CONTRACT_FILENAME}", codec="none"):
+                logging.info(f"☁️  {CONTRACT_FILENAME} uploaded to S3")
+
+            # Upload the artifact after the pickle, so readers see it as current. It goes up uncompressed:
+            # it exists to be memory-mapped (a baked copy is mapped as `aws s3 cp` left it)
+            if has_artifact and s3_handler.upload_file(ARTIFACT_FILENAME, f"models/{ARTIFACT_FILENAME}", codec="none"):
+                logging.info("☁️  Model artifact uploaded to S3")
 
-            # Upload hyperparameters if they exist
+            # Content-addressed copies and the manifest, so earlier models stay retrievable
+            published = {'model.pkl': 'model.pkl', CONTRACT_FILENAME: CONTRACT_FILENAME}
+            if has_artifact:
+                published[ARTIFACT_FILENAME] = ARTIFACT_FILENAME
             if os.path.exists('best_params.json'):
-                if s3_handler.upload_params('best_params.json'):
-                    logging.info("☁️  Hyperparameters uploaded to S3")
+                published['best_params.json'] = 'best_params.json'
+            digests = ArtifactStore(s3_handler).publish(published)
+            logging.info(f"☁️  Published model {digests['model.pkl'][:12]} to the artifact store")
 
     except Exception as e:
         logging.error(f"Error saving model: {e}")
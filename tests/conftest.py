@@ -0,0 +1,22 @@
+import os
+import pickle
+
+import pytest
+from src.feature_contract import FeatureContract
+from src.inference import model_version_of
+from src.model_artifact import ARTIFACT_FILENAME, save_artifact
+
+
+@pytest.fixture
+def save_pair():
+    """Writes model.pkl and model.arrays the way steps/save_model.py does, returning the pickle's path"""
+
+    def save(model, directory) -> str:
+        data = pickle.dumps(model)
+        model_path = os.path.join(directory, "model.pkl")
+        with open(model_path, "wb") as f:
+            f.write(data)
+        save_artifact(model, os.path.join(directory, ARTIFACT_FILENAME), FeatureContract.from_model(model), model_version_of(data))
+        return model_path
+
+    return save
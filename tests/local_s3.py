@@ -0,0 +1,339 @@
+"""
+Minimal local S3 stand-in for tests.
+
+Serves path-style HEAD/GET/PUT object requests from memory over HTTP, so real
+boto3 clients (and s3transfer's download_file) can run against it via
+endpoint_url. Objects get an MD5 ETag like single-part S3 uploads, and every
+request is counted by method so tests can assert what a loader fetched.
+If-Match / If-None-Match are honoured like S3 does (304 on GET/HEAD, 412 on
+conditional writes). User metadata (x-amz-meta-*), ListObjectsV2 and
+multipart uploads are supported, enough for s3transfer's upload_file and
+directory syncs.
+
+Optional first-byte latency and a per-connection bandwidth cap (on GET
+bodies and PUT uploads) make benchmarks behave more like real S3, where parallel ranged GETs pay off.
+"""
+import hashlib
+import itertools
+import socket
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.sax.saxutils import escape
+
+import boto3
+from botocore.config import Config
+
+
+class _Server(ThreadingHTTPServer):
+    # Room for many parallel ranged GETs connecting at once
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class LocalS3:
+    """In-memory S3 endpoint on 127.0.0.1, started with start() or as a context manager"""
+
+    def __init__(self, latency: float = 0.0, bandwidth: Optional[float] = None, connect_latency: float = 0.0) -> None:
+        """
+        Args:
+            latency: Seconds before each GET starts sending
+            bandwidth: Bytes per second per connection (None is unlimited)
+            connect_latency: Seconds added to each new connection, like a TLS handshake
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.connect_latency = connect_latency
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        self.modified: Dict[Tuple[str, str], float] = {}
+        self.etags: Dict[Tuple[str, str], str] = {}
+        self.metadata: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # upload id -> (bucket, key, metadata, {part number: data})
+        self.uploads: Dict[str, Tuple[str, str, Dict[str, str], Dict[int, bytes]]] = {}
+        self._upload_ids = itertools.count(1)
+        self.requests: Counter = Counter()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalS3":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalS3":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def put(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        modified: Optional[float] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        etag: Optional[str] = None,
+    ) -> None:
+        """Store an object, last modified now unless a timestamp is given"""
+        self.objects[(bucket, key)] = data
+        self.modified[(bucket, key)] = time.time() if modified is None else modified
+        self.etags[(bucket, key)] = etag or self.etag(data)
+        self.metadata[(bucket, key)] = dict(metadata or {})
+
+    def client(self, max_pool_connections: int = 10):
+        """boto3 S3 client pointed at this server"""
+        return boto3.client(
+            "s3",
+            region_name="us-east-1",
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+            config=Config(
+                s3={"addressing_style": "path"}, retries={"max_attempts": 1}, max_pool_connections=max_pool_connections
+            ),
+        )
+
+    def send(self, wfile, data: bytes) -> None:
+        """Write a GET body, throttled to the configured bandwidth"""
+        if self.latency:
+            time.sleep(self.latency)
+        if not self.bandwidth:
+            wfile.write(data)
+            return
+        chunk = 64 * 1024
+        started = time.perf_counter()
+        for offset in range(0, len(data), chunk):
+            wfile.write(data[offset:offset + chunk])
+            ahead = (offset + chunk) / self.bandwidth - (time.perf_counter() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    def receive(self, rfile, length: int) -> bytes:
+        """Read a PUT body, throttled to the configured bandwidth"""
+        if self.latency:
+            time.sleep(self.latency)
+        if not self.bandwidth:
+            return rfile.read(length)
+        chunks, received = [], 0
+        started = time.perf_counter()
+        while received < length:
+            chunk = rfile.read(min(64 * 1024, length - received))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            received += len(chunk)
+            ahead = received / self.bandwidth - (time.perf_counter() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+        return b"".join(chunks)
+
+    @staticmethod
+    def etag(data: bytes) -> str:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    def _handler(self):
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive connections and "Expect: 100-continue" answered, as boto3 expects of S3
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                if store.connect_latency:
+                    time.sleep(store.connect_latency)
+                super().setup()
+                # Headers and body go out as separate writes; without this, Nagle + delayed ACK stall keep-alive reads
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def _object(self):
+                path = unquote(urlparse(self.path).path).lstrip("/")
+                bucket, _, key = path.partition("/")
+                return bucket, key, store.objects.get((bucket, key))
+
+            def _query(self) -> Dict[str, str]:
+                return {name: values[0] for name, values in parse_qs(urlparse(self.path).query, keep_blank_values=True).items()}
+
+            def _request_metadata(self) -> Dict[str, str]:
+                return {
+                    name[len("x-amz-meta-"):].lower(): value
+                    for name, value in self.headers.items() if name.lower().startswith("x-amz-meta-")
+                }
+
+            def _send_xml(self, payload: str) -> None:
+                body = payload.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_headers(self, status: int, bucket: str, key: str, data: bytes, length: int) -> None:
+                self.send_response(status)
+                self.send_header("ETag", store.etags[(bucket, key)])
+                for name, value in store.metadata.get((bucket, key), {}).items():
+                    self.send_header(f"x-amz-meta-{name}", value)
+                self.send_header("Content-Length", str(length))
+                self.send_header("Last-Modified", formatdate(store.modified[(bucket, key)], usegmt=True))
+                self.send_header("Content-Type", "application/octet-stream")
+                self.end_headers()
+
+            def _not_found(self, body: bool = True) -> None:
+                payload = b"<Error><Code>NoSuchKey</Code><Message>Not found</Message></Error>"
+                self.send_response(404)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(payload)
+
+            def _precondition_failed(self, body: bool = True) -> None:
+                payload = b"<Error><Code>PreconditionFailed</Code><Message>Precondition failed</Message></Error>"
+                self.send_response(412)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(payload)
+
+            def _not_modified(self, bucket: str, key: str) -> None:
+                self.send_response(304)
+                self.send_header("ETag", store.etags[(bucket, key)])
+                self.end_headers()
+
+            def _check_read(self, bucket: str, key: str, body: bool = True) -> bool:
+                """Answer a failed If-Match / matching If-None-Match; True when the read goes ahead"""
+                etag = store.etags[(bucket, key)]
+                if_match = self.headers.get("If-Match")
+                if if_match and if_match not in ("*", etag):
+                    self._precondition_failed(body)
+                    return False
+                if self.headers.get("If-None-Match") in ("*", etag):
+                    self._not_modified(bucket, key)
+                    return False
+                return True
+
+            def do_HEAD(self):
+                store.requests["HEAD"] += 1
+                bucket, key, data = self._object()
+                if data is None:
+                    return self._not_found(body=False)
+                if not self._check_read(bucket, key, body=False):
+                    return
+                self._send_headers(200, bucket, key, data, len(data))
+
+            def _list_objects(self, bucket: str) -> None:
+                prefix = self._query().get("prefix", "")
+                contents = "".join(
+                    f"<Contents><Key>{escape(key)}</Key>"
+                    f"<LastModified>{time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(store.modified[(b, key)]))}</LastModified>"
+                    f"<ETag>{escape(store.etags[(b, key)])}</ETag><Size>{len(data)}</Size>"
+                    f"<StorageClass>STANDARD</StorageClass></Contents>"
+                    for (b, key), data in sorted(store.objects.items()) if b == bucket and key.startswith(prefix)
+                )
+                self._send_xml(
+                    '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+                    f"<Name>{escape(bucket)}</Name><Prefix>{escape(prefix)}</Prefix>"
+                    f"<KeyCount>{contents.count('<Contents>')}</KeyCount><MaxKeys>1000</MaxKeys>"
+                    f"<IsTruncated>false</IsTruncated>{contents}</ListBucketResult>"
+                )
+
+            def do_GET(self):
+                store.requests["GET"] += 1
+                bucket, key, data = self._object()
+                if not key:
+                    return self._list_objects(bucket)
+                if data is None:
+                    return self._not_found()
+                if not self._check_read(bucket, key):
+                    return
+                byte_range = self.headers.get("Range")
+                if byte_range:
+                    start, _, end = byte_range.replace("bytes=", "").partition("-")
+                    end = min(int(end), len(data) - 1) if end else len(data) - 1
+                    part = data[int(start):end + 1]
+                    self.send_response(206)
+                    self.send_header("ETag", store.etags[(bucket, key)])
+                    self.send_header("Content-Length", str(len(part)))
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                    self.end_headers()
+                    store.send(self.wfile, part)
+                    return
+                self._send_headers(200, bucket, key, data, len(data))
+                store.send(self.wfile, data)
+
+            def do_PUT(self):
+                store.requests["PUT"] += 1
+                bucket, key, current = self._object()
+                data = store.receive(self.rfile, int(self.headers.get("Content-Length", 0)))
+                query = self._query()
+                if "uploadId" in query:
+                    store.uploads[query["uploadId"]][3][int(query["partNumber"])] = data
+                    self.send_response(200)
+                    self.send_header("ETag", store.etag(data))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if_match = self.headers.get("If-Match")
+                if if_match and current is None:
+                    return self._not_found()
+                if (if_match and if_match != store.etags[(bucket, key)]) or \
+                        (self.headers.get("If-None-Match") == "*" and current is not None):
+                    return self._precondition_failed()
+                store.put(bucket, key, data, metadata=self._request_metadata())
+                self.send_response(200)
+                self.send_header("ETag", store.etag(data))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self):
+                store.requests["POST"] += 1
+                bucket, key, _ = self._object()
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                query = self._query()
+                if "uploads" in query:
+                    upload_id = str(next(store._upload_ids))
+                    store.uploads[upload_id] = (bucket, key, self._request_metadata(), {})
+                    return self._send_xml(
+                        f"<InitiateMultipartUploadResult><Bucket>{escape(bucket)}</Bucket><Key>{escape(key)}</Key>"
+                        f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+                    )
+                # CompleteMultipartUpload: parts in order, ETag like S3's (MD5 of the part MD5s, "-<count>")
+                bucket, key, metadata, parts = store.uploads.pop(query["uploadId"])
+                ordered = [parts[number] for number in sorted(parts)]
+                digest = hashlib.md5(b"".join(hashlib.md5(part).digest() for part in ordered)).hexdigest()
+                etag = f'"{digest}-{len(ordered)}"'
+                store.put(bucket, key, b"".join(ordered), metadata=metadata, etag=etag)
+                self._send_xml(
+                    f"<CompleteMultipartUploadResult><Bucket>{escape(bucket)}</Bucket><Key>{escape(key)}</Key>"
+                    f"<ETag>{escape(etag)}</ETag></CompleteMultipartUploadResult>"
+                )
+
+            def do_DELETE(self):
+                store.requests["DELETE"] += 1
+                bucket, key, _ = self._object()
+                query = self._query()
+                if "uploadId" in query:
+                    store.uploads.pop(query["uploadId"], None)
+                else:
+                    for table in (store.objects, store.modified, store.etags, store.metadata):
+                        table.pop((bucket, key), None)
+                self.send_response(204)
+                self.end_headers()
+
+        return Handler
@@ -82,3 +82,331 @@ def test_predict_invalid_data(test_client):
 
     response = test_client.post("/predict", json=payload)
     assert response.status_code == 422  # Validation error
+
+
+def test_predict_batch_endpoint(test_client):
+    """Test batch prediction matches single predictions in order"""
+    records = [
+        {
+            "fixed_acidity": 7.4 + i * 0.1,
+            "volatile_acidity": 0.7,
+            "citric_acid": 0.0,
+            "residual_sugar": 1.9,
+            "chlorides": 0.076,
+            "free_sulfur_dioxide": 11.0,
+            "total_sulfur_dioxide": 34.0,
+            "density": 0.9978,
+            "pH": 3.51,
+            "sulphates": 0.56,
+            "alcohol": 9.4 + i,
+            "wine_type_encoded": i % 2
+        }
+        for i in range(5)
+    ]
+
+    response = test_client.post("/predict/batch", json={"records": records})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["count"] == 5
+    assert len(data["predictions"]) == 5
+
+    for record, result in zip(records, data["predictions"]):
+        single = test_client.post("/predict", json=record).json()
+        assert result["wine_quality_score"] == pytest.approx(single["wine_quality_score"])
+        assert result["quality_rating"] == single["quality_rating"]
+
+
+def test_predict_batch_empty(test_client):
+    """Test batch prediction rejects an empty batch"""
+    response = test_client.post("/predict/batch", json={"records": []})
+    assert response.status_code == 422
+
+
+def test_cache_stats_endpoint(test_client):
+    """Test repeated predictions are served from the cache"""
+    payload = {
+        "fixed_acidity": 8.1,
+        "volatile_acidity": 0.56,
+        "citric_acid": 0.28,
+        "residual_sugar": 1.7,
+        "chlorides": 0.368,
+        "free_sulfur_dioxide": 16.0,
+        "total_sulfur_dioxide": 56.0,
+        "density": 0.9968,
+        "pH": 3.11,
+        "sulphates": 1.28,
+        "alcohol": 9.3,
+        "wine_type_encoded": 0
+    }
+
+    first = test_client.post("/predict", json=payload).json()
+    before = test_client.get("/cache/stats").json()
+    second = test_client.post("/predict", json=payload).json()
+    after = test_client.get("/cache/stats").json()
+
+    assert before["enabled"] is True
+    assert second["wine_quality_score"] == first["wine_quality_score"]
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_health_reports_model_version(test_client):
+    """Test health and model info report the active model version"""
+    test_client.post("/predict", json={
+        "fixed_acidity": 7.4, "volatile_acidity": 0.7, "citric_acid": 0.0,
+        "residual_sugar": 1.9, "chlorides": 0.076, "free_sulfur_dioxide": 11.0,
+        "total_sulfur_dioxide": 34.0, "density": 0.9978, "pH": 3.51,
+        "sulphates": 0.56, "alcohol": 9.4
+    })
+
+    health = test_client.get("/health").json()
+    info = test_client.get("/model/info").json()
+
+    assert health["model_version"] is not None
+    assert health["model_loaded_at"] is not None
+    assert info["model_version"] == health["model_version"]
+
+
+def test_predict_routes_to_named_model(test_client):
+    """Test ?model= and X-Model-Name select a registry model"""
+    import api
+    from sklearn.linear_model import LinearRegression
+    import numpy as np
+
+    os.makedirs('test_registry/constant', exist_ok=True)
+    X = np.random.rand(20, 12)
+    with open('test_registry/constant/model.pkl', 'wb') as f:
+        pickle.dump(LinearRegression().fit(X, np.full(20, 4.0)), f)
+    api.registry.register("constant", 'test_registry/constant/model.pkl')
+
+    payload = {
+        "fixed_acidity": 7.4, "volatile_acidity": 0.7, "citric_acid": 0.0,
+        "residual_sugar": 1.9, "chlorides": 0.076, "free_sulfur_dioxide": 11.0,
+        "total_sulfur_dioxide": 34.0, "density": 0.9978, "pH": 3.51,
+        "sulphates": 0.56, "alcohol": 9.4
+    }
+    try:
+        by_query = test_client.post("/predict?model=constant", json=payload)
+        by_header = test_client.post("/predict", json=payload, headers={"X-Model-Name": "constant"})
+        unknown = test_client.post("/predict?model=missing", json=payload)
+        models = test_client.get("/models").json()
+    finally:
+        api.registry.unload("constant")
+        os.remove('test_registry/constant/model.pkl')
+        os.removedirs('test_registry/constant')
+
+    assert by_query.status_code == 200
+    assert by_query.json()["wine_quality_score"] == pytest.approx(4.0)
+    assert by_header.json()["wine_quality_score"] == pytest.approx(4.0)
+    assert unknown.status_code == 404
+    assert models["models"]["constant"]["loaded"] is True
+
+
+def test_registry_model_loads_off_the_event_loop(test_client, monkeypatch):
+    """Test a registry model's first load runs on a worker thread, once however many requests wait"""
+    import asyncio
+    import time
+    import api
+    from src.model_registry import ModelRegistry
+
+    registry = ModelRegistry()
+    registry.register("slow", 'unused/model.pkl')
+    loads = []
+
+    def slow_get(name):
+        loads.append(name)
+        time.sleep(0.3)
+        return "slow model"
+
+    monkeypatch.setattr(api, "registry", registry)
+    monkeypatch.setattr(registry, "get", slow_get)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(api.resolve_model("slow") for _ in range(3)))
+        task.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(run())
+
+    assert results == ["slow model"] * 3
+    assert loads == ["slow"]
+    assert ticks >= 10  # the loop kept running while the model loaded
+    assert api.registry_loads == {}
+
+
+def test_metrics_endpoint(test_client):
+    """Test /metrics exposes per-stage latency in Prometheus format"""
+    test_client.post("/predict", json={
+        "fixed_acidity": 7.4, "volatile_acidity": 0.7, "citric_acid": 0.0,
+        "residual_sugar": 1.9, "chlorides": 0.076, "free_sulfur_dioxide": 11.0,
+        "total_sulfur_dioxide": 34.0, "density": 0.9978, "pH": 3.51,
+        "sulphates": 0.56, "alcohol": 9.4
+    })
+
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for stage in ("validate", "featurize", "predict", "rate", "serialize"):
+        assert f'stage="{stage}",model="default"' in response.text
+    assert 'wine_api_requests_total{endpoint="/predict",status="200"}' in response.text
+
+
+def test_predict_stream_csv(test_client):
+    """Test /predict/stream scores a UCI-format CSV and ends with a summary"""
+    import json
+
+    header = '"fixed acidity";"volatile acidity";"citric acid";"residual sugar";"chlorides";' \
+             '"free sulfur dioxide";"total sulfur dioxide";"density";"pH";"sulphates";"alcohol";"quality"'
+    rows = "\n".join("7.4;0.7;0;1.9;0.076;11;34;0.9978;3.51;0.56;9.4;5" for _ in range(25))
+    response = test_client.post(
+        "/predict/stream", content=f"{header}\n{rows}\n".encode(), headers={"content-type": "text/csv"}
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["row"] for line in lines[:-1]] == list(range(25))
+    assert 0 <= lines[0]["prediction"] <= 10
+    assert lines[-1]["summary"]["rows"] == 25
+    assert lines[-1]["summary"]["rows_per_sec"] > 0
+
+
+def test_predict_stream_reports_invalid_rows(test_client):
+    """Test rows /predict would reject get an error line and the rest of the upload is scored"""
+    import json
+
+    header = '"fixed acidity";"volatile acidity";"citric acid";"residual sugar";"chlorides";' \
+             '"free sulfur dioxide";"total sulfur dioxide";"density";"pH";"sulphates";"alcohol";"quality"'
+    good = "7.4;0.7;0;1.9;0.076;11;34;0.9978;3.51;0.56;9.4;5"
+    rows = [good, ";;;;;;;;;;;5", good.replace("9.4", "n/a"), good]
+    csv = test_client.post(
+        "/predict/stream", content=f"{header}\n" + "\n".join(rows), headers={"content-type": "text/csv"}
+    )
+    ndjson = test_client.post(
+        "/predict/stream", content=b'{"alcohol": 9.4}\n', headers={"content-type": "application/x-ndjson"}
+    )
+
+    lines = [json.loads(line) for line in csv.text.splitlines()]
+    assert [line["row"] for line in lines[:-1]] == [0, 1, 2, 3]
+    assert "prediction" in lines[0] and "prediction" in lines[3]
+    assert "Missing fields" in lines[1]["error"] and "error" in lines[2]
+    assert lines[-1]["summary"]["rows"] == 4 and lines[-1]["summary"]["failed"] == 2
+    assert "error" not in lines[-1]["summary"]
+    ndjson_lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert "Missing fields" in ndjson_lines[0]["error"]
+    assert ndjson_lines[-1]["summary"]["failed"] == 1
+
+
+def test_predict_stream_bad_header(test_client):
+    """Test /predict/stream rejects a CSV without the wine features"""
+    response = test_client.post("/predict/stream", content=b"a;b\n1;2\n", headers={"content-type": "text/csv"})
+    assert response.status_code == 400
+
+
+def test_predict_stream_chunked_upload_through_uvicorn(test_client):
+    """Test a chunked upload spread over many ASGI messages is scored in full by a real server"""
+    import json
+    import socket
+    import threading
+    import time
+    import httpx
+    import uvicorn
+    import api
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    n_rows, rows_per_part = 50_000, 500
+    row = "7.4;0.7;0;1.9;0.076;11;34;0.9978;3.51;0.56;9.4;5\n"
+
+    def upload():
+        yield b'"fixed acidity";"volatile acidity";"citric acid";"residual sugar";"chlorides";' \
+              b'"free sulfur dioxide";"total sulfur dioxide";"density";"pH";"sulphates";"alcohol";"quality"\n'
+        for _ in range(n_rows // rows_per_part):
+            yield (row * rows_per_part).encode()
+
+    try:
+        response = httpx.post(
+            f"http://127.0.0.1:{port}/predict/stream", content=upload(),
+            headers={"content-type": "text/csv"}, timeout=60,
+        )
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    summary = json.loads(lines[-1])["summary"]
+    assert "error" not in summary
+    assert summary["rows"] == n_rows
+    assert len(lines) == n_rows + 1
+
+
+def test_reload_keeps_registry_cache_entries(test_client, monkeypatch):
+    """Test a hot reload evicts the replaced model's cached scores only"""
+    import numpy as np
+    import api
+    from src.model_reloader import LoadedModel
+
+    active = api.active_model()
+    row = np.array([7.4, 0.7, 0.0, 1.9, 0.076, 11.0, 34.0, 0.9978, 3.51, 0.56, 9.4, 0.0])
+    replaced_key = api.prediction_cache.make_key(row, active.version)
+    registry_key = api.prediction_cache.make_key(row, "registry-model")
+    api.prediction_cache.put(replaced_key, 5.0)
+    api.prediction_cache.put(registry_key, 6.0)
+
+    monkeypatch.setattr(api, "current", active)
+    api.install_model(LoadedModel(active.model, active.contract, "reloaded-version"))
+
+    assert api.prediction_cache.get(replaced_key) is None
+    assert api.prediction_cache.get(registry_key) == 6.0
+
+
+def test_micro_batch_scores_with_the_requests_model(test_client, monkeypatch):
+    """Test a reload while a row waits in the micro-batcher doesn't cache one model's score under another's version"""
+    import asyncio
+    import numpy as np
+    import api
+    from sklearn.linear_model import LinearRegression
+    from src.feature_contract import FeatureContract
+    from src.micro_batcher import MicroBatcher
+    from src.model_reloader import LoadedModel
+
+    X = np.random.rand(20, 12)
+    requested = LoadedModel(LinearRegression().fit(X, np.full(20, 4.0)), FeatureContract.default(), "requested")
+    reloaded = LoadedModel(LinearRegression().fit(X, np.full(20, 7.0)), FeatureContract.default(), "reloaded")
+    monkeypatch.setattr(api, "current", requested)
+    monkeypatch.setattr(api, "batcher", MicroBatcher(api.predict_matrix, max_wait_ms=50))
+    row = requested.contract.fill_row_from_dict({
+        "fixed_acidity": 6.1, "volatile_acidity": 0.3, "citric_acid": 0.3,
+        "residual_sugar": 2.1, "chlorides": 0.04, "free_sulfur_dioxide": 30.0,
+        "total_sulfur_dioxide": 110.0, "density": 0.991, "pH": 3.2,
+        "sulphates": 0.5, "alcohol": 12.1
+    })
+
+    async def run():
+        scoring = asyncio.create_task(api.score_features(row, requested))
+        await asyncio.sleep(0.01)  # the row is queued, waiting for more
+        api.install_model(reloaded)
+        score = await scoring
+        await api.batcher.stop()
+        return score
+
+    score = asyncio.run(run())
+
+    assert score[0] == pytest.approx(4.0)
+    assert api.prediction_cache.get(api.prediction_cache.make_key(row[0], "requested")) == pytest.approx(4.0)
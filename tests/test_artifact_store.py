@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+from src.artifact_store import ArtifactStore, LocalArtifactCache, sha256_file
+from src.compression import decompress_bytes
+from src.s3_utils import S3Handler
+from tests.local_s3 import LocalS3
+
+BUCKET = "wine-test-bucket"
+
+
+@pytest.fixture
+def s3():
+    with LocalS3() as server:
+        yield server
+
+
+@pytest.fixture
+def handler(s3):
+    handler = S3Handler(bucket_name=BUCKET, region="us-east-1")
+    handler.s3_client = s3.client()
+    return handler
+
+
+def write(path, data: bytes) -> str:
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def make_store(handler, tmp_path, max_bytes=10_000_000):
+    return ArtifactStore(handler, cache=LocalArtifactCache(str(tmp_path / "cache"), max_bytes=max_bytes))
+
+
+class TestArtifactStore:
+    """Test the content-addressed store against a local S3 stand-in"""
+
+    def test_publish_stores_blobs_by_digest(self, s3, handler, tmp_path):
+        model = write(tmp_path / "model.pkl", b"model v1")
+        store = make_store(handler, tmp_path)
+
+        digests = store.publish({"model.pkl": model})
+
+        assert digests["model.pkl"] == sha256_file(model)
+        blob = (BUCKET, f"artifacts/sha256/{digests['model.pkl']}")
+        assert decompress_bytes(s3.objects[blob]) == b"model v1"
+        assert s3.metadata[blob]["codec"] == "zstd"
+        manifest = json.loads(s3.objects[(BUCKET, "artifacts/manifest.json")])
+        assert manifest["current"]["model.pkl"]["sha256"] == digests["model.pkl"]
+
+    def test_unchanged_content_is_not_uploaded_again(self, s3, handler, tmp_path):
+        model = write(tmp_path / "model.pkl", b"model v1")
+        store = make_store(handler, tmp_path)
+        store.publish({"model.pkl": model})
+        puts = s3.requests["PUT"]
+
+        store.publish({"model.pkl": model})
+
+        assert s3.requests["PUT"] == puts + 1  # only the manifest
+
+    def test_history_keeps_earlier_versions(self, handler, tmp_path):
+        store = make_store(handler, tmp_path)
+        first = store.publish({"model.pkl": write(tmp_path / "a", b"model v1")})["model.pkl"]
+        second = store.publish({"model.pkl": write(tmp_path / "b", b"model v2")})["model.pkl"]
+
+        history = [entry["sha256"] for entry in store.manifest()["history"]["model.pkl"]]
+
+        assert history == [second, first]
+        assert open(store.fetch("model.pkl", digest=first), "rb").read() == b"model v1"
+
+    def test_fetch_uses_local_cache_and_conditional_manifest(self, s3, handler, tmp_path):
+        make_store(handler, tmp_path / "publisher").publish({"model.pkl": write(tmp_path / "m", b"model v1")})
+        store = make_store(handler, tmp_path)
+
+        store.fetch("model.pkl", str(tmp_path / "first.pkl"))
+        gets = s3.requests["GET"]
+        # A new process reuses the cached blob and the saved manifest ETag
+        path = make_store(handler, tmp_path).fetch("model.pkl", str(tmp_path / "second.pkl"))
+
+        assert open(path, "rb").read() == b"model v1"
+        assert s3.requests["GET"] == gets + 1  # the manifest, answered 304
+
+    def test_concurrent_publishers_keep_both_entries(self, handler, tmp_path):
+        first = make_store(handler, tmp_path / "one")
+        second = make_store(handler, tmp_path / "two")
+        first.publish({"model.pkl": write(tmp_path / "m", b"model v1")})
+        second.manifest()
+        first.publish({"best_params.json": write(tmp_path / "p", b"{}")})
+
+        # second's manifest ETag is stale: its conditional write fails and it re-reads
+        second.publish({"model.arrays": write(tmp_path / "a", b"arrays")})
+
+        assert set(make_store(handler, tmp_path / "three").manifest()["current"]) == {
+            "model.pkl", "best_params.json", "model.arrays"
+        }
+
+    def test_missing_artifact_raises(self, handler, tmp_path):
+        with pytest.raises(KeyError):
+            make_store(handler, tmp_path).fetch("model.pkl")
+
+    def test_corrupt_blob_is_rejected(self, s3, handler, tmp_path):
+        store = make_store(handler, tmp_path / "publisher")
+        digest = store.publish({"model.pkl": write(tmp_path / "m", b"model v1")})["model.pkl"]
+        s3.put(BUCKET, f"artifacts/sha256/{digest}", b"tampered")
+
+        with pytest.raises(ValueError):
+            make_store(handler, tmp_path).fetch("model.pkl")
+        assert not os.path.exists(tmp_path / "cache" / digest)
+
+
+class TestLocalArtifactCache:
+    """Test LRU eviction of the local blob cache"""
+
+    def test_evicts_least_recently_used_past_cap(self, tmp_path):
+        cache = LocalArtifactCache(str(tmp_path / "cache"), max_bytes=250)
+        for i, digest in enumerate(("a" * 64, "b" * 64)):
+            cache.add(digest, write(tmp_path / f"blob{i}", b"x" * 100))
+            os.utime(cache.path(digest), ns=(i * 10**9, i * 10**9))
+        cache.get("a" * 64)  # now the most recently used
+
+        cache.add("c" * 64, write(tmp_path / "blob2", b"x" * 100))
+
+        assert cache.get("b" * 64) is None
+        assert cache.get("a" * 64) and cache.get("c" * 64)
+        assert cache.size() == 200
@@ -0,0 +1,135 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.chunked_ingestion import (
+    MB,
+    PARSE_OVERHEAD,
+    frame_bytes,
+    iter_chunks,
+    iter_parquet_chunks,
+    iter_source_chunks,
+    spill_to_parquet,
+)
+from src.data_ingestion import read_source
+
+
+def wine_csv(path, rows: int, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(np.round(rng.random((rows, 3)) * 10, 3), columns=["fixed acidity", "pH", "alcohol"])
+    df["quality"] = rng.integers(3, 9, rows)
+    df.to_csv(path, sep=";", index=False)
+    return str(path)
+
+
+class TestIterChunks:
+    """Test streaming a CSV as typed chunks"""
+
+    def test_fixed_chunk_rows(self, tmp_path):
+        source = wine_csv(tmp_path / "wine.csv", 2500)
+
+        chunks = list(iter_chunks(source, "red", chunk_rows=1000))
+
+        assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+        pd.testing.assert_frame_equal(pd.concat(chunks), read_source(source, "red"))
+
+    def test_chunks_fit_memory_budget(self, tmp_path):
+        source = wine_csv(tmp_path / "wine.csv", 60000)
+
+        chunks = list(iter_chunks(source, "red", memory_budget_mb=0.5))
+
+        assert len(chunks) > 1
+        assert sum(len(chunk) for chunk in chunks) == 60000
+        assert max(frame_bytes(chunk) for chunk in chunks) * PARSE_OVERHEAD <= 0.5 * MB * 1.1
+
+    def test_every_chunk_keeps_schema_and_sample_dtypes(self, tmp_path):
+        source = tmp_path / "wine.csv"
+        df = pd.read_csv(wine_csv(source, 3000), sep=";")
+        df["batch"] = np.arange(3000) // 7  # not in the schema: dtype inferred from the sample
+        df.to_csv(source, sep=";", index=False)
+
+        chunks = list(iter_chunks(str(source), "white", chunk_rows=1000))
+
+        assert {str(chunk["quality"].dtype) for chunk in chunks} == {"int8"}
+        assert {str(chunk["alcohol"].dtype) for chunk in chunks} == {"float32"}
+        assert {str(chunk["batch"].dtype) for chunk in chunks} == {"int64"}
+        assert all(chunk["wine_type"].dtype == "category" for chunk in chunks)
+
+    def test_late_missing_value_in_int_column_is_reported(self, tmp_path):
+        source = tmp_path / "wine.csv"
+        wine_csv(source, 3000)
+        source.write_text(source.read_text() + "7.0;3.2;9.9;\n")
+
+        with pytest.raises(ValueError, match="doesn't fit dtypes"):
+            list(iter_chunks(str(source), chunk_rows=1000))
+
+    def test_sources_share_dtypes_and_index(self, tmp_path):
+        red = wine_csv(tmp_path / "red.csv", 1500, seed=1)
+        white = wine_csv(tmp_path / "white.csv", 1200, seed=2)
+
+        chunks = list(iter_source_chunks([(red, "red"), (white, "white")], chunk_rows=1000))
+
+        combined = pd.concat(chunks)
+        assert list(combined.index) == list(range(2700))
+        assert combined["wine_type"].value_counts().to_dict() == {"red": 1500, "white": 1200}
+
+
+class TestSpillToParquet:
+    """Test spilling chunks to a partitioned Parquet dataset and reading it back"""
+
+    def test_round_trip(self, tmp_path):
+        red = wine_csv(tmp_path / "red.csv", 1500, seed=1)
+        white = wine_csv(tmp_path / "white.csv", 1200, seed=2)
+        sources = [(red, "red"), (white, "white")]
+        directory = str(tmp_path / "dataset")
+
+        summary = spill_to_parquet(iter_source_chunks(sources, chunk_rows=1000), directory)
+        back = pd.concat(iter_parquet_chunks(directory, batch_rows=500))
+
+        assert summary["rows"] == 2700
+        assert summary["chunks"] == 4
+        assert sorted(os.listdir(directory)) == ["_spill.json", "wine_type=red", "wine_type=white"]
+        expected = pd.concat(iter_source_chunks(sources, chunk_rows=1000))
+        pd.testing.assert_frame_equal(
+            back.sort_values(list(back.columns)).reset_index(drop=True),
+            expected.sort_values(list(expected.columns)).reset_index(drop=True),
+            check_dtype=False,
+        )
+        assert back["quality"].dtype == np.int8
+        assert back["wine_type"].dtype == "category"
+        assert max(len(chunk) for chunk in iter_parquet_chunks(directory, batch_rows=500)) <= 500
+
+    def test_replaces_previous_spill(self, tmp_path):
+        source = wine_csv(tmp_path / "wine.csv", 1500)
+        directory = str(tmp_path / "dataset")
+        spill_to_parquet(iter_chunks(source, "red", chunk_rows=500), directory)
+
+        spill_to_parquet(iter_chunks(source, "white", chunk_rows=1000), directory)
+
+        assert sorted(os.listdir(directory)) == ["_spill.json", "wine_type=white"]
+        assert sum(len(chunk) for chunk in iter_parquet_chunks(directory)) == 1500
+
+    def test_refuses_foreign_directory(self, tmp_path):
+        (tmp_path / "notes.txt").write_text("keep me")
+
+        with pytest.raises(FileExistsError):
+            spill_to_parquet(iter([]), str(tmp_path))
+        assert (tmp_path / "notes.txt").exists()
+
+    def test_incomplete_spill_is_not_read(self, tmp_path):
+        source = wine_csv(tmp_path / "wine.csv", 1500)
+        directory = str(tmp_path / "dataset")
+
+        def failing_chunks():
+            yield next(iter_chunks(source, "red", chunk_rows=500))
+            raise OSError("source went away")
+
+        with pytest.raises(OSError):
+            spill_to_parquet(failing_chunks(), directory)
+
+        with open(os.path.join(directory, "_spill.json")) as f:
+            assert json.load(f) == {"complete": False}
+        with pytest.raises(ValueError, match="incomplete"):
+            list(iter_parquet_chunks(directory))
@@ -0,0 +1,104 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from src.compression import compress_file, decompress_bytes, decompress_file, upload_codec
+from src.model_reloader import load_pickled_model
+from src.s3_utils import S3Handler
+from tests.local_s3 import LocalS3
+
+BUCKET = "wine-test-bucket"
+PAYLOAD = os.urandom(1000) * 300  # compressible, 300 KB
+
+
+@pytest.fixture
+def handler():
+    with LocalS3() as s3:
+        handler = S3Handler(bucket_name=BUCKET, region="us-east-1")
+        handler.s3_client = s3.client()
+        handler.local_s3 = s3
+        yield handler
+
+
+class TestCompression:
+    """Test compressed uploads and transparent decompression"""
+
+    @pytest.mark.parametrize("codec,level", [("zstd", 1), ("zstd", 19), ("lz4", 0), ("lz4", 9)])
+    def test_file_round_trip(self, tmp_path, codec, level):
+        (tmp_path / "model.pkl").write_bytes(PAYLOAD)
+
+        size = compress_file(str(tmp_path / "model.pkl"), str(tmp_path / "model.pkl.c"), codec, level)
+
+        assert size < len(PAYLOAD) / 10
+        assert decompress_file(str(tmp_path / "model.pkl.c")) == codec
+        assert (tmp_path / "model.pkl.c").read_bytes() == PAYLOAD
+
+    def test_plain_content_is_left_alone(self, tmp_path):
+        (tmp_path / "model.pkl").write_bytes(PAYLOAD)
+
+        assert decompress_file(str(tmp_path / "model.pkl")) is None
+        assert decompress_bytes(PAYLOAD) is PAYLOAD
+
+    def test_upload_codec_validates(self):
+        assert upload_codec("none") == (None, None)
+        assert upload_codec("zstd", 7) == ("zstd", 7)
+        with pytest.raises(ValueError):
+            upload_codec("gzip")
+
+    def test_upload_records_codec_and_download_decompresses(self, handler, tmp_path):
+        (tmp_path / "model.pkl").write_bytes(PAYLOAD)
+
+        assert handler.upload_file(str(tmp_path / "model.pkl"), "models/model.pkl", codec="zstd", level=5)
+        stored = handler.local_s3.objects[(BUCKET, "models/model.pkl")]
+        metadata = handler.local_s3.metadata[(BUCKET, "models/model.pkl")]
+
+        assert len(stored) < len(PAYLOAD) / 10
+        assert metadata["codec"] == "zstd" and metadata["codec-level"] == "5"
+        assert metadata["uncompressed-size"] == str(len(PAYLOAD))
+        assert handler.download_file("models/model.pkl", str(tmp_path / "copy.pkl"))
+        assert (tmp_path / "copy.pkl").read_bytes() == PAYLOAD
+        assert handler.fetch_bytes("models/model.pkl") == PAYLOAD
+        assert handler.same_content(str(tmp_path / "copy.pkl"), "models/model.pkl") is True
+
+    @pytest.mark.parametrize("codec", ["zstd", "lz4"])
+    def test_corrupt_object_fails_download(self, handler, tmp_path, codec):
+        (tmp_path / "model.pkl").write_bytes(PAYLOAD)
+        compress_file(str(tmp_path / "model.pkl"), str(tmp_path / "model.pkl.c"), codec, 3)
+        compressed = (tmp_path / "model.pkl.c").read_bytes()
+        metadata = {"codec": codec}
+        handler.local_s3.put(BUCKET, "models/corrupt.pkl", compressed[:8] + b"\xff" * 64 + compressed[72:], metadata=metadata)
+        handler.local_s3.put(BUCKET, "models/truncated.pkl", compressed[:len(compressed) // 2], metadata=metadata)
+
+        for key in ("models/corrupt.pkl", "models/truncated.pkl"):
+            assert handler.download_file(key, str(tmp_path / "copy.pkl")) is False
+            assert not (tmp_path / "copy.pkl").exists()
+            assert not (tmp_path / "copy.pkl.decompressing").exists()
+            assert handler.fetch_bytes(key) is None
+
+    def test_object_stored_compressed_downloads_as_is(self, handler, tmp_path):
+        (tmp_path / "data.csv").write_bytes(PAYLOAD)
+        (tmp_path / "synced").mkdir()
+        compress_file(str(tmp_path / "data.csv"), str(tmp_path / "synced" / "data.csv.zst"), "zstd", 3)
+        stored = (tmp_path / "synced" / "data.csv.zst").read_bytes()
+        handler.sync_directory(str(tmp_path / "synced"), "data", direction="upload")
+
+        assert handler.download_file("data/data.csv.zst", str(tmp_path / "copy.csv.zst"))
+        assert (tmp_path / "copy.csv.zst").read_bytes() == stored
+
+        first = handler.sync_directory(str(tmp_path / "mirror"), "data", direction="download")
+        second = handler.sync_directory(str(tmp_path / "mirror"), "data", direction="download")
+        assert first["transferred"] == ["data.csv.zst"]
+        assert second["transferred"] == [] and second["skipped"] == ["data.csv.zst"]
+        assert (tmp_path / "mirror" / "data.csv.zst").read_bytes() == stored
+
+    def test_compressed_pickle_loads_from_disk(self, tmp_path):
+        model = LinearRegression().fit(np.eye(12), np.arange(12.0))
+        (tmp_path / "raw.pkl").write_bytes(pickle.dumps(model))
+        compress_file(str(tmp_path / "raw.pkl"), str(tmp_path / "model.pkl"), "zstd", 3)
+
+        loaded = load_pickled_model(str(tmp_path / "model.pkl"))
+
+        assert loaded.model.predict(np.eye(12)[[3]])[0] == pytest.approx(3.0)
+        assert loaded.version == load_pickled_model(str(tmp_path / "raw.pkl")).version
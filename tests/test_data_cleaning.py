@@ -2,6 +2,7 @@ import pytest
 import pandas as pd
 import numpy as np
 from src.data_cleaning import DataPreProcessingStrategy, DataDivideStrategy
+from src.chunked_ingestion import iter_chunks, spill_to_parquet
 
 
 class TestDataPreProcessingStrategy:
@@ -34,6 +35,61 @@ class TestDataPreProcessingStrategy:
         assert 'wine_type' not in result.columns
 
 
+class TestChunkedPreProcessing:
+    """Test preprocessing a stream of chunks"""
+
+    def test_matches_handle_data_across_chunks(self, tmp_path):
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({
+            'fixed acidity': np.round(rng.random(1500) * 10, 1),
+            'quality': rng.integers(3, 9, 1500),
+        })
+        data = pd.concat([data, data.iloc[:700]], ignore_index=True)  # duplicates spanning chunks
+        data.to_csv(tmp_path / "wine.csv", sep=";", index=False)
+        full = pd.read_csv(tmp_path / "wine.csv", sep=";")
+        full['wine_type'] = 'white'
+
+        expected = DataPreProcessingStrategy().handle_data(full)
+        chunks = DataPreProcessingStrategy().handle_chunks(iter_chunks(str(tmp_path / "wine.csv"), "white", chunk_rows=400))
+        result = pd.concat(chunks)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert (result['wine_type_encoded'] == 1).all()
+
+    def test_fills_missing_values_from_fill_values(self):
+        chunks = [
+            pd.DataFrame({'alcohol': [9.4, np.nan], 'quality': [5, 6]}),
+            pd.DataFrame({'alcohol': [np.nan, 11.0], 'quality': [7, 8]}, index=[2, 3]),
+        ]
+
+        result = pd.concat(DataPreProcessingStrategy().handle_chunks(chunks, fill_values={'alcohol': 10.0}))
+
+        np.testing.assert_allclose(result['alcohol'], [9.4, 10.0, 10.0, 11.0], rtol=1e-6)
+
+    def test_handle_spill_matches_handle_data(self, tmp_path):
+        rng = np.random.default_rng(1)
+        data = pd.DataFrame({
+            'fixed acidity': np.round(rng.random(1200) * 10, 1),
+            'quality': rng.integers(3, 9, 1200),
+        })
+        data = pd.concat([data, data.iloc[:500]], ignore_index=True)
+        data.to_csv(tmp_path / "wine.csv", sep=";", index=False)
+        full = pd.read_csv(tmp_path / "wine.csv", sep=";")
+        full['wine_type'] = 'red'
+        spill_to_parquet(iter_chunks(str(tmp_path / "wine.csv"), "red", chunk_rows=300), str(tmp_path / "spill"))
+
+        expected = DataPreProcessingStrategy().handle_data(full)
+        result = DataPreProcessingStrategy().handle_spill(str(tmp_path / "spill"), memory_budget_mb=0.01)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_handle_spill_of_empty_dataset_raises(self, tmp_path):
+        spill_to_parquet(iter([]), str(tmp_path / "spill"))
+
+        with pytest.raises(ValueError, match="no rows"):
+            DataPreProcessingStrategy().handle_spill(str(tmp_path / "spill"))
+
+
 class TestDataDivideStrategy:
     """Test train/test split"""
 
@@ -0,0 +1,138 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+from src import data_ingestion
+from src.data_ingestion import concat_frames, load_sources, read_source
+from src.dataset_cache import DatasetCache, combined_hash
+
+RED = b"fixed acidity;alcohol;quality\n7.4;9.4;5\n7.8;9.8;5\n"
+WHITE = b"fixed acidity;alcohol;quality\n7.0;8.8;6\n6.3;9.5;6\n8.1;10.1;6\n"
+
+
+def write(path, data: bytes) -> str:
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.fixture
+def barrier_server():
+    """Serves RED/WHITE only once both requests are in flight, so sequential fetches fail"""
+    barrier = threading.Barrier(2, timeout=5)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                self.send_error(503)
+                return
+            content = RED if self.path.endswith("red.csv") else WHITE
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestLoadSources:
+    """Test concurrent loading of several wine sources"""
+
+    def test_read_source_adds_wine_type(self, tmp_path):
+        df = read_source(write(tmp_path / "red.csv", RED), "red")
+
+        assert list(df["wine_type"]) == ["red", "red"]
+
+    def test_remote_sources_are_fetched_concurrently(self, barrier_server):
+        frames = load_sources([(f"{barrier_server}/red.csv", "red"), (f"{barrier_server}/white.csv", "white")])
+
+        assert [len(df) for df in frames] == [2, 3]
+        assert list(frames[1]["wine_type"].unique()) == ["white"]
+
+    def test_large_local_files_are_parsed_in_processes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_ingestion, "DATA_PARSE_PROCESS_MB", 0)
+        monkeypatch.setattr(data_ingestion.os, "cpu_count", lambda: 2)
+        cache = DatasetCache(str(tmp_path / "datasets"))
+        sources = [(write(tmp_path / "red.csv", RED), "red"), (write(tmp_path / "white.csv", WHITE), "white")]
+
+        frames = load_sources(sources, cache=cache)
+
+        pd.testing.assert_frame_equal(frames[0], read_source(*sources[0]))
+        pd.testing.assert_frame_equal(frames[1], read_source(*sources[1]))
+        assert all(df.attrs["dataset_sha256"] for df in frames)
+        assert len(cache.entries()) == 2
+
+    def test_single_core_parses_on_threads(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_ingestion, "DATA_PARSE_PROCESS_MB", 0)
+        monkeypatch.setattr(data_ingestion.os, "cpu_count", lambda: 1)
+
+        assert not data_ingestion._parse_in_process(write(tmp_path / "red.csv", RED))
+
+    def test_frames_keep_source_order(self, tmp_path):
+        sources = [(write(tmp_path / f"{i}.csv", RED if i % 2 else WHITE), str(i)) for i in range(6)]
+
+        frames = load_sources(sources, max_workers=3)
+
+        assert [df["wine_type"].iloc[0] for df in frames] == [str(i) for i in range(6)]
+
+
+class TestConcatFrames:
+    """Test combining frames into preallocated typed columns"""
+
+    def test_matches_pd_concat(self, tmp_path):
+        frames = [read_source(write(tmp_path / "red.csv", RED), "red"), read_source(write(tmp_path / "white.csv", WHITE), "white")]
+
+        combined = concat_frames(frames)
+
+        pd.testing.assert_frame_equal(combined, pd.concat(frames, ignore_index=True))
+
+    def test_promotes_mixed_numeric_dtypes(self):
+        frames = [pd.DataFrame({"quality": np.array([5, 6], dtype=np.int64)}), pd.DataFrame({"quality": [5.5]})]
+
+        combined = concat_frames(frames)
+
+        assert combined["quality"].dtype == np.float64
+        assert list(combined["quality"]) == [5.0, 6.0, 5.5]
+
+    def test_falls_back_for_differing_columns(self):
+        frames = [pd.DataFrame({"a": [1]}), pd.DataFrame({"b": [2]})]
+
+        combined = concat_frames(frames)
+
+        assert list(combined.columns) == ["a", "b"]
+        assert len(combined) == 2
+
+    def test_categoricals_stay_categorical(self):
+        frames = [pd.DataFrame({"t": pd.Categorical(["red"])}), pd.DataFrame({"t": pd.Categorical(["white", "white"])})]
+
+        combined = concat_frames(frames)
+
+        assert combined["t"].dtype == "category"
+        assert list(combined["t"]) == ["red", "white", "white"]
+
+    def test_other_extension_dtypes_are_kept(self):
+        frames = [pd.DataFrame({"q": pd.array([5], dtype="Int8")}), pd.DataFrame({"q": pd.array([None], dtype="Int8")})]
+
+        combined = concat_frames(frames)
+
+        assert combined["q"].dtype == "Int8"
+        assert combined["q"].isna().tolist() == [False, True]
+
+    def test_combines_content_hashes(self):
+        frames = [pd.DataFrame({"a": [1]}), pd.DataFrame({"a": [2]})]
+        frames[0].attrs["dataset_sha256"], frames[1].attrs["dataset_sha256"] = "r" * 64, "w" * 64
+
+        combined = concat_frames(frames)
+
+        assert combined.attrs["dataset_sha256"] == combined_hash(["r" * 64, "w" * 64])
+        assert frames[0].attrs["dataset_sha256"] == "r" * 64
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import data_schema
+from src.data_cleaning import DataDivideStrategy, DataPreProcessingStrategy
+from src.data_ingestion import concat_frames, read_source
+from src.data_schema import MEASUREMENT_COLUMNS, apply_schema, encode_wine_type, memory_report
+from src.evaluation import MSE, R2Score
+from src.model_dev import LinearRegressionModel, RandomForestModel
+
+# (low, high, decimals) of each measurement, as in the UCI files
+RANGES = {
+    "fixed acidity": (4.6, 15.9, 1),
+    "volatile acidity": (0.12, 1.58, 3),
+    "citric acid": (0.0, 1.0, 2),
+    "residual sugar": (0.9, 15.5, 1),
+    "chlorides": (0.012, 0.611, 3),
+    "free sulfur dioxide": (1, 72, 0),
+    "total sulfur dioxide": (6, 289, 0),
+    "density": (0.99007, 1.00369, 5),
+    "pH": (2.74, 4.01, 2),
+    "sulphates": (0.33, 2.0, 2),
+    "alcohol": (8.4, 14.9, 1),
+}
+
+
+def wine_csv(path, rows: int, seed: int = 0) -> str:
+    """UCI-shaped wine CSV whose quality depends on alcohol, volatile acidity and sulphates"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        column: np.round(rng.uniform(low, high, rows), decimals)
+        for column, (low, high, decimals) in RANGES.items()
+    })
+    signal = 0.6 * df["alcohol"] - 2.0 * df["volatile acidity"] + 1.2 * df["sulphates"] + rng.normal(0, 0.4, rows)
+    df["quality"] = np.clip(np.round(signal - signal.mean() + 5.6), 3, 8).astype(int)
+    df.to_csv(path, sep=";", index=False)
+    return str(path)
+
+
+@pytest.fixture
+def default_dtypes(monkeypatch):
+    monkeypatch.setattr(data_schema, "DATA_COMPACT_DTYPES", False)
+
+
+class TestSchema:
+    """Test the compact wine dtypes"""
+
+    def test_read_source_parses_into_schema(self, tmp_path):
+        df = read_source(wine_csv(tmp_path / "red.csv", 100), "red")
+
+        assert all(df[column].dtype == np.float32 for column in MEASUREMENT_COLUMNS)
+        assert df["quality"].dtype == np.int8
+        assert df["wine_type"].dtype == "category"
+        assert list(df["wine_type"].cat.categories) == ["red", "white"]
+
+    def test_default_dtypes_when_disabled(self, tmp_path, default_dtypes):
+        df = read_source(wine_csv(tmp_path / "red.csv", 100), "red")
+
+        assert df["alcohol"].dtype == np.float64
+        assert df["quality"].dtype == np.int64
+        assert df["wine_type"].dtype != "category"
+
+    def test_compact_frame_is_half_the_size(self, tmp_path, monkeypatch):
+        source = wine_csv(tmp_path / "white.csv", 5000)
+        compact = memory_report(read_source(source, "white"), "compact")
+        monkeypatch.setattr(data_schema, "DATA_COMPACT_DTYPES", False)
+        default = memory_report(read_source(source, "white"), "default")
+
+        assert compact["bytes"] < 0.5 * default["bytes"]
+        assert compact["dtypes"] == {"float32": 11, "int8": 1, "category": 1}
+
+    def test_values_round_trip_through_float32(self, tmp_path):
+        source = wine_csv(tmp_path / "red.csv", 1000)
+
+        compact = read_source(source, "red")
+        default = pd.read_csv(source, sep=";")
+
+        for column, (_, _, decimals) in RANGES.items():
+            # Rounding to the file's precision gives back exactly what was written
+            np.testing.assert_array_equal(np.round(compact[column].astype(np.float64), decimals), default[column])
+
+    def test_encode_wine_type(self):
+        categorical = pd.Series(pd.Categorical(["white", "red"], categories=["red", "white"]))
+
+        assert encode_wine_type(categorical).tolist() == [1, 0]
+        assert encode_wine_type(categorical).dtype == np.int8
+        assert encode_wine_type(pd.Series(["red", "rose"])).isnull().tolist() == [False, True]
+
+    def test_apply_schema_leaves_missing_quality_alone(self):
+        df = pd.DataFrame({"alcohol": [9.4, 10.0], "quality": [5, None]})
+
+        result = apply_schema(df)
+
+        assert result["alcohol"].dtype == np.float32
+        assert result["quality"].dtype == np.float64
+
+    def test_schema_kept_through_preprocessing_and_split(self, tmp_path):
+        frames = [read_source(wine_csv(tmp_path / f"{t}.csv", 600, seed=i), t) for i, t in enumerate(["red", "white"])]
+        combined = concat_frames(frames)
+
+        processed = DataPreProcessingStrategy().handle_data(combined)
+        X_train, X_test, y_train, y_test = DataDivideStrategy().handle_data(processed)
+
+        assert combined["wine_type"].dtype == "category"
+        assert processed["wine_type_encoded"].dtype == np.int8
+        assert set(processed["wine_type_encoded"]) == {0, 1}
+        assert all(processed[column].dtype == np.float32 for column in MEASUREMENT_COLUMNS)
+        # Widened for training: the compact dtypes are a storage format
+        assert all(X_train[column].dtype == np.float64 for column in MEASUREMENT_COLUMNS)
+        assert y_train.dtype == np.int8
+
+
+class TestCompactDtypeAccuracy:
+    """Models trained on the compact frame score like the float64 ones"""
+
+    def split(self, tmp_path):
+        frames = [read_source(wine_csv(tmp_path / f"{t}.csv", 1500, seed=i), t) for i, t in enumerate(["red", "white"])]
+        return DataDivideStrategy().handle_data(DataPreProcessingStrategy().handle_data(concat_frames(frames)))
+
+    @pytest.mark.parametrize("model, kwargs", [
+        (LinearRegressionModel(), {}),
+        (RandomForestModel(), {"n_estimators": 30, "random_state": 0, "n_jobs": 1}),
+    ])
+    def test_metrics_match_float64(self, tmp_path, monkeypatch, model, kwargs):
+        X_train, X_test, y_train, y_test = self.split(tmp_path)
+        compact = model.train(X_train, y_train, **kwargs).predict(X_test)
+        monkeypatch.setattr(data_schema, "DATA_COMPACT_DTYPES", False)
+        X_train64, X_test64, y_train64, y_test64 = self.split(tmp_path)
+        default = model.train(X_train64, y_train64, **kwargs).predict(X_test64)
+
+        assert X_train.dtypes["alcohol"] == np.float64 and X_train64.dtypes["alcohol"] == np.float64
+        np.testing.assert_array_equal(y_test.to_numpy(), y_test64.to_numpy())
+        assert R2Score().calculate_score(y_test, compact) == pytest.approx(R2Score().calculate_score(y_test64, default), abs=1e-3)
+        assert MSE().calculate_score(y_test, compact) == pytest.approx(MSE().calculate_score(y_test64, default), rel=1e-3)
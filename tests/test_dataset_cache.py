@@ -0,0 +1,174 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+from src.dataset_cache import DatasetCache, combined_hash
+
+CSV = (
+    b'"fixed acidity";"volatile acidity";"alcohol";"quality"\n'
+    b"7.4;0.7;9.4;5\n"
+    b"7.8;0.88;9.8;5\n"
+    b"11.2;0.28;9.8;6\n"
+)
+
+
+class CsvServer:
+    """HTTP server for one CSV with an ETag and Last-Modified, answering conditional GETs with 304"""
+
+    def __init__(self, content: bytes = CSV) -> None:
+        self.content = content
+        self.etag = '"v1"'
+        self.last_modified = "Mon, 02 Feb 2026 10:00:00 GMT"
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", server.etag)
+                self.send_header("Last-Modified", server.last_modified)
+                self.send_header("Content-Length", str(len(server.content)))
+                self.end_headers()
+                self.wfile.write(server.content)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/winequality-red.csv"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def publish(self, content: bytes, etag: str) -> None:
+        self.content, self.etag = content, etag
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = CsvServer()
+    yield server
+    server.close()
+
+
+def make_cache(tmp_path, **kwargs):
+    return DatasetCache(str(tmp_path / "datasets"), **kwargs)
+
+
+class TestDatasetCache:
+    """Test the Parquet dataset cache against a local HTTP server"""
+
+    def test_first_read_parses_and_records_hash(self, server, tmp_path):
+        df = make_cache(tmp_path).read_csv(server.url, sep=";")
+
+        pd.testing.assert_frame_equal(df, pd.read_csv(server.url, sep=";"))
+        assert df.attrs["dataset_sha256"] == hashlib.sha256(CSV).hexdigest()
+        assert df.attrs["dataset_source"] == server.url
+
+    def test_unchanged_source_is_revalidated_not_downloaded(self, server, tmp_path):
+        cache = make_cache(tmp_path)
+        first = cache.read_csv(server.url, sep=";")
+
+        second = cache.read_csv(server.url, sep=";")
+
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+        assert server.requests[1]["If-Modified-Since"] == server.last_modified
+        pd.testing.assert_frame_equal(first, second)
+        assert second.attrs["dataset_sha256"] == first.attrs["dataset_sha256"]
+
+    def test_cached_copy_keeps_dtypes_and_metadata(self, server, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.read_csv(server.url, sep=";")
+
+        entry = cache.metadata(cache.path(server.url, {"sep": ";"}))
+        df = cache.read_csv(server.url, sep=";")
+
+        assert entry["etag"] == '"v1"'
+        assert entry["rows"] == 3
+        assert entry["dtypes"] == {"fixed acidity": "float64", "volatile acidity": "float64", "alcohol": "float64", "quality": "int64"}
+        assert {column: str(dtype) for column, dtype in df.dtypes.items()} == entry["dtypes"]
+
+    def test_changed_source_is_downloaded_again(self, server, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.read_csv(server.url, sep=";")
+        updated = CSV + b"7.3;0.65;10.0;7\n"
+        server.publish(updated, '"v2"')
+
+        df = cache.read_csv(server.url, sep=";")
+
+        assert len(df) == 4
+        assert df.attrs["dataset_sha256"] == hashlib.sha256(updated).hexdigest()
+
+    def test_offline_never_touches_the_network(self, server, tmp_path):
+        make_cache(tmp_path).read_csv(server.url, sep=";")
+        server.close()
+
+        df = make_cache(tmp_path, offline=True).read_csv(server.url, sep=";")
+
+        assert len(server.requests) == 1
+        assert len(df) == 3
+
+    def test_offline_without_cached_copy_fails(self, server, tmp_path):
+        with pytest.raises(RuntimeError, match="Offline mode"):
+            make_cache(tmp_path, offline=True).read_csv(server.url, sep=";")
+        assert server.requests == []
+
+    def test_unreachable_source_falls_back_to_cache(self, server, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.read_csv(server.url, sep=";")
+        server.close()
+
+        df = cache.read_csv(server.url, sep=";")
+
+        assert len(df) == 3
+
+    def test_unreachable_source_without_cache_raises(self, server, tmp_path):
+        url = server.url
+        server.close()
+
+        with pytest.raises(OSError):
+            make_cache(tmp_path, timeout=2).read_csv(url, sep=";")
+
+    def test_local_file_validated_by_size_and_mtime(self, tmp_path):
+        source = tmp_path / "wine.csv"
+        source.write_bytes(CSV)
+        cache = make_cache(tmp_path)
+        cache.read_csv(str(source), sep=";")
+
+        source.write_bytes(CSV + b"7.3;0.65;10.0;7\n")
+        df = cache.read_csv(str(source), sep=";")
+
+        assert len(df) == 4
+
+    def test_parse_options_are_part_of_the_key(self, server, tmp_path):
+        cache = make_cache(tmp_path)
+
+        assert cache.path(server.url, {"sep": ";"}) != cache.path(server.url, {"sep": ","})
+
+    def test_eviction_keeps_cache_under_limit(self, tmp_path):
+        cache = make_cache(tmp_path, max_bytes=1)
+        sources = []
+        for i in range(3):
+            source = tmp_path / f"wine-{i}.csv"
+            source.write_bytes(CSV)
+            sources.append(str(source))
+            cache.read_csv(str(source), sep=";")
+
+        remaining = [path for _, _, path in cache.entries()]
+
+        # Everything older than the newest entry is evicted
+        assert remaining == [cache.path(sources[-1], {"sep": ";"})]
+        assert os.path.exists(remaining[0])
+
+    def test_combined_hash_depends_on_order(self):
+        assert combined_hash(["a", "b"]) != combined_hash(["b", "a"])
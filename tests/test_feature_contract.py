@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from src.feature_contract import FeatureContract, load_contract, contract_path_for
+from src.inference import FEATURE_COLUMNS, REQUEST_FIELDS
+
+
+class Request:
+    """Stand-in for a validated pydantic request"""
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+def sample_values():
+    return {field: float(i) for i, field in enumerate(REQUEST_FIELDS)}
+
+
+class TestFeatureContract:
+    """Test feature contract creation and row assembly"""
+
+    def test_from_model_follows_feature_names_in(self):
+        # Train on a frame whose columns are in a different order
+        shuffled = list(reversed(FEATURE_COLUMNS))
+        X = pd.DataFrame(np.random.rand(30, 12), columns=shuffled)
+        model = LinearRegression().fit(X, np.random.rand(30))
+
+        contract = FeatureContract.from_model(model)
+
+        assert contract.feature_names == shuffled
+        assert contract.feature_names_in == shuffled
+        assert contract.request_fields == list(reversed(REQUEST_FIELDS))
+
+    def test_fill_row_matches_dataframe_prediction(self):
+        X = pd.DataFrame(np.random.rand(30, 12), columns=FEATURE_COLUMNS)
+        model = LinearRegression().fit(X, np.random.rand(30))
+        contract = FeatureContract.from_model(model)
+
+        values = sample_values()
+        row = contract.fill_row(Request(**values))
+        expected = model.predict(pd.DataFrame([dict(zip(FEATURE_COLUMNS, values.values()))]))
+
+        assert row.shape == (1, 12)
+        assert row.dtype == np.float64
+        assert model.predict(contract.model_input(row))[0] == pytest.approx(expected[0])
+
+    def test_fill_row_reuses_buffer(self):
+        contract = FeatureContract.default(dtype="float32")
+        buffer = contract.new_row()
+
+        row = contract.fill_row(Request(**sample_values()), out=buffer)
+
+        assert row is buffer
+        assert buffer.dtype == np.float32
+        assert buffer[0, 11] == 11.0
+
+    def test_fill_row_from_dict_defaults(self):
+        contract = FeatureContract.default()
+        body = sample_values()
+        del body["wine_type_encoded"]
+        del body["pH"]
+
+        row = contract.fill_row_from_dict(body)
+
+        assert row[0, 11] == 0.0  # wine_type_encoded defaults to red
+        assert np.isnan(row[0, 8])  # missing pH becomes NaN
+
+    def test_save_and_load(self, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        contract = FeatureContract.default(dtype="float32")
+        contract.save(contract_path_for(str(model_path)))
+
+        loaded = load_contract(str(model_path), model=None)
+
+        assert loaded.to_dict() == contract.to_dict()
+
+    def test_mismatched_model_rejected(self):
+        X = pd.DataFrame(np.random.rand(10, 2), columns=["a", "b"])
+        model = LinearRegression().fit(X, np.random.rand(10))
+
+        with pytest.raises(ValueError):
+            FeatureContract.from_model(model)
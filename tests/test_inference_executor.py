@@ -0,0 +1,144 @@
+import asyncio
+import pickle
+import threading
+import time
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from src.feature_contract import FeatureContract
+from src.inference_executor import InferenceExecutor
+from src.model_reloader import load_pickled_model
+
+
+class FakeModel:
+    """Stand-in for a LoadedModel scoring with a plain function"""
+
+    def __init__(self, predict_fn):
+        self.predict = predict_fn
+        self.path = None
+        self.artifact_path = None
+        self.version = "fake"
+        self.contract = FeatureContract.default()
+
+
+class TestInferenceExecutor:
+    """Test dispatching model calls off the event loop"""
+
+    def test_thread_executor_does_not_block_loop(self):
+        def slow_predict(features):
+            time.sleep(0.2)
+            return features[:, 0]
+
+        async def run():
+            executor = InferenceExecutor(kind="thread", max_workers=2)
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await executor.predict(np.ones((1, 3)), FakeModel(slow_predict))
+            task.cancel()
+            executor.shutdown()
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+
+        assert result.tolist() == [1.0]
+        # The loop kept running while the model call was in progress
+        assert ticks >= 5
+
+    def test_max_in_flight_bound(self):
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def predict(features):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return features[:, 0]
+
+        async def run():
+            executor = InferenceExecutor(kind="thread", max_workers=8, max_in_flight=2)
+            model = FakeModel(predict)
+            await asyncio.gather(*(executor.predict(np.ones((1, 1)), model) for _ in range(8)))
+            stats = executor.stats()
+            executor.shutdown()
+            return stats
+
+        stats = asyncio.run(run())
+
+        assert peak <= 2
+        assert stats["completed"] == 8
+        assert stats["in_flight"] == 0
+
+    def test_process_executor_loads_model(self, tmp_path):
+        X = np.random.rand(50, 12)
+        model = LinearRegression().fit(X, X[:, 0] + 2 * X[:, 1])
+        model_path = tmp_path / "model.pkl"
+        with open(model_path, 'wb') as f:
+            pickle.dump(model, f)
+        loaded = load_pickled_model(str(model_path))
+        features = np.zeros((1, 12))
+        features[0, :2] = 1.0
+
+        async def run():
+            executor = InferenceExecutor(kind="process", max_workers=1)
+            result = await executor.predict(features, loaded)
+            executor.shutdown()
+            return result
+
+        result = asyncio.run(run())
+
+        assert result[0] == pytest.approx(3.0)
+
+    def test_process_executor_loads_compressed_pickle(self, tmp_path):
+        from src.compression import compress_file
+
+        X = np.random.rand(50, 12)
+        model = LinearRegression().fit(X, X[:, 0] + 2 * X[:, 1])
+        (tmp_path / "raw.pkl").write_bytes(pickle.dumps(model))
+        # As copied straight from S3, where upload_model compresses by default
+        compress_file(str(tmp_path / "raw.pkl"), str(tmp_path / "model.pkl"), "zstd", 3)
+        loaded = load_pickled_model(str(tmp_path / "model.pkl"))
+        features = np.zeros((1, 12))
+        features[0, :2] = 1.0
+
+        async def run():
+            executor = InferenceExecutor(kind="process", max_workers=1)
+            result = await executor.predict(features, loaded)
+            executor.shutdown()
+            return result
+
+        assert asyncio.run(run())[0] == pytest.approx(3.0)
+
+    def test_process_executor_never_scores_an_overwritten_model(self, tmp_path):
+        X = np.random.rand(50, 12)
+        model_path = tmp_path / "model.pkl"
+        model_path.write_bytes(pickle.dumps(LinearRegression().fit(X, np.full(50, 3.0))))
+        loaded = load_pickled_model(str(model_path))
+        # A retrain overwrites model.pkl while the API still serves the model it loaded
+        model_path.write_bytes(pickle.dumps(LinearRegression().fit(X, np.full(50, 8.0))))
+
+        async def run():
+            executor = InferenceExecutor(kind="process", max_workers=1)
+            results = [await executor.predict(np.zeros((1, 12)), loaded) for _ in range(2)]
+            executor.shutdown()
+            return results
+
+        results = asyncio.run(run())
+
+        assert [result[0] for result in results] == pytest.approx([3.0, 3.0])
+
+    def test_invalid_kind(self):
+        with pytest.raises(ValueError):
+            InferenceExecutor(kind="gpu")
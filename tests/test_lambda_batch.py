@@ -0,0 +1,154 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from src.feature_contract import FeatureContract
+from src.inference import REQUEST_FIELDS
+from src.prediction_cache import PredictionCache
+from src.tree_engine import compile_model
+
+import lambda_handler
+
+WINE = {
+    "fixed_acidity": 7.4, "volatile_acidity": 0.7, "citric_acid": 0.0,
+    "residual_sugar": 1.9, "chlorides": 0.076, "free_sulfur_dioxide": 11.0,
+    "total_sulfur_dioxide": 34.0, "density": 0.9978, "pH": 3.51,
+    "sulphates": 0.56, "alcohol": 9.4, "wine_type_encoded": 0
+}
+
+
+def wine(alcohol: float) -> dict:
+    return {**WINE, "alcohol": alcohol}
+
+
+@pytest.fixture
+def warm_lambda(monkeypatch):
+    """The handler module with a model already loaded"""
+    rng = np.random.default_rng(0)
+    X = rng.random((200, 12)) * 15
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X[:, 10] / 1.5)
+    monkeypatch.setattr(lambda_handler, "model", model)
+    monkeypatch.setattr(lambda_handler, "tree_engine", compile_model(model))
+    monkeypatch.setattr(lambda_handler, "contract", FeatureContract.default())
+    monkeypatch.setattr(lambda_handler, "prediction_cache", PredictionCache(FeatureContract.default().feature_names, max_size=100))
+    return lambda_handler
+
+
+def single_score(handler, body: dict) -> float:
+    response = handler.lambda_handler({"body": json.dumps(body)}, {})
+    return json.loads(response["body"])["prediction"]
+
+
+class TestLambdaBatch:
+    """Test JSON array bodies and SQS/Kinesis Records events"""
+
+    def test_array_body_matches_single_predictions(self, warm_lambda):
+        records = [wine(a) for a in (8.0, 10.0, 12.0, 14.0)]
+
+        response = warm_lambda.lambda_handler({"body": json.dumps(records)}, {})
+
+        assert response["statusCode"] == 200
+        body = json.loads(response["body"])
+        assert body["count"] == 4 and body["failed"] == 0
+        expected = [single_score(warm_lambda, record) for record in records]
+        assert [p["prediction"] for p in body["predictions"]] == pytest.approx(expected)
+        assert all("quality_rating" in p for p in body["predictions"])
+
+    def test_invalid_records_fail_individually(self, warm_lambda):
+        missing = {k: v for k, v in WINE.items() if k != "alcohol"}
+        records = [wine(9.0), missing, "not a wine", {**WINE, "pH": "acidic"}, wine(12.0)]
+
+        response = warm_lambda.lambda_handler({"body": {"records": records}}, {})
+
+        body = json.loads(response["body"])
+        assert response["statusCode"] == 200
+        assert body["failed"] == 3
+        results = body["predictions"]
+        assert "prediction" in results[0] and "prediction" in results[4]
+        assert "alcohol" in results[1]["error"]
+        assert "error" in results[2] and "error" in results[3]
+
+    def test_single_record_validated_like_batch_record(self, warm_lambda):
+        missing = {k: v for k, v in WINE.items() if k != "alcohol"}
+
+        single = warm_lambda.lambda_handler({"body": json.dumps(missing)}, {})
+        batch = json.loads(warm_lambda.lambda_handler({"body": [missing]}, {})["body"])
+
+        assert single["statusCode"] == 400
+        assert json.loads(single["body"])["error"] == batch["predictions"][0]["error"]
+        assert warm_lambda.lambda_handler({"body": json.dumps({**WINE, "pH": "acidic"})}, {})["statusCode"] == 400
+        assert warm_lambda.lambda_handler({"body": "7.4"}, {})["statusCode"] == 400
+
+    def test_missing_optional_field_uses_default(self, warm_lambda):
+        record = {k: v for k, v in WINE.items() if k != "wine_type_encoded"}
+
+        body = json.loads(warm_lambda.lambda_handler({"body": [record]}, {})["body"])
+
+        assert body["failed"] == 0
+        assert body["predictions"][0]["prediction"] == pytest.approx(single_score(warm_lambda, WINE))
+
+    def test_batch_size_limits(self, warm_lambda, monkeypatch):
+        monkeypatch.setattr(warm_lambda, "MAX_BATCH_SIZE", 2)
+
+        assert warm_lambda.lambda_handler({"body": []}, {})["statusCode"] == 400
+        assert warm_lambda.lambda_handler({"body": [WINE] * 3}, {})["statusCode"] == 400
+        assert warm_lambda.lambda_handler({"body": [WINE] * 2}, {})["statusCode"] == 200
+
+    def test_large_batch_uses_one_native_call(self, warm_lambda, monkeypatch):
+        model = warm_lambda.model
+        calls = []
+        monkeypatch.setattr(model, "predict", lambda X: calls.append(len(X)) or np.full(len(X), 5.0))
+        records = [wine(8.0 + i / 1000) for i in range(warm_lambda.tree_engine.max_rows + 10)]
+
+        body = json.loads(warm_lambda.lambda_handler({"body": records}, {})["body"])
+
+        assert calls == [len(records)]
+        assert body["failed"] == 0
+
+    def test_sqs_partial_batch_response(self, warm_lambda):
+        event = {"Records": [
+            {"messageId": "m1", "body": json.dumps(wine(10.0))},
+            {"messageId": "m2", "body": "{not json"},
+            {"messageId": "m3", "body": json.dumps({"alcohol": 10.0})},
+            {"messageId": "m4", "body": json.dumps(wine(13.0))},
+        ]}
+
+        result = warm_lambda.lambda_handler(event, {})
+
+        assert result["batchItemFailures"] == [{"itemIdentifier": "m2"}, {"itemIdentifier": "m3"}]
+        assert [r["itemIdentifier"] for r in result["results"]] == ["m1", "m2", "m3", "m4"]
+        assert result["results"][3]["prediction"] == pytest.approx(single_score(warm_lambda, wine(13.0)))
+
+    def test_kinesis_records(self, warm_lambda):
+        def kinesis(seq, payload):
+            return {"kinesis": {"sequenceNumber": seq, "data": base64.b64encode(payload).decode()}}
+
+        event = {"Records": [kinesis("1", json.dumps(WINE).encode()), kinesis("2", b"\xff")]}
+
+        result = warm_lambda.lambda_handler(event, {})
+
+        assert result["batchItemFailures"] == [{"itemIdentifier": "2"}]
+        assert result["results"][0]["prediction"] == pytest.approx(single_score(warm_lambda, WINE))
+
+    def test_model_failure_fails_every_record(self, warm_lambda, monkeypatch):
+        monkeypatch.setattr(warm_lambda, "tree_engine", None)
+        monkeypatch.setattr(warm_lambda.model, "predict", lambda X: 1 / 0)
+        event = {"Records": [{"messageId": f"m{i}", "body": json.dumps(WINE)} for i in range(3)]}
+
+        result = warm_lambda.lambda_handler(event, {})
+
+        assert len(result["batchItemFailures"]) == 3
+
+
+def test_fill_matrix_from_dicts_reports_errors():
+    contract = FeatureContract.default()
+    good = {field: float(i) for i, field in enumerate(REQUEST_FIELDS)}
+
+    matrix, kept, errors = contract.fill_matrix_from_dicts([good, None, good])
+
+    assert matrix.shape == (2, 12)
+    assert kept == [0, 2]
+    assert list(errors) == [1]
+    assert matrix[1, 11] == 11.0
@@ -1,6 +1,10 @@
 import pytest
 from unittest.mock import Mock, patch
 import json
+import os
+import re
+import subprocess
+import sys
 
 
 class TestLambdaHandler:
@@ -57,3 +61,44 @@ class TestLambdaHandler:
         assert response['statusCode'] == 200
         body = json.loads(response['body'])
         assert body['service'] == 'wine-quality-predictor'
+
+
+def test_handler_import_is_lean():
+    """Importing the handler loads only the serving modules the Dockerfile ships, and no boto3"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, "Dockerfile")) as f:
+        shipped = set(re.findall(r"src/(\w+)\.py", f.read()))
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, lambda_handler; print(' '.join(sorted(sys.modules)))"],
+        cwd=root, env={**os.environ, "LAMBDA_IMPORT_MODE": "lean"}, capture_output=True, text=True, check=True,
+    )
+    modules = result.stdout.split()
+
+    imported = {name.split(".", 1)[1] for name in modules if name.startswith("src.")}
+    assert imported <= shipped
+    for package in ("boto3", "pandas", "sklearn", "optuna", "xgboost", "lightgbm"):
+        assert package not in modules
+
+
+def test_failed_model_call_fails_every_sqs_record():
+    """A model call that raises reports each message of the batch in batchItemFailures"""
+    import lambda_handler
+    from src.feature_contract import FeatureContract
+
+    wine = {
+        "fixed_acidity": 7.4, "volatile_acidity": 0.7, "citric_acid": 0.0,
+        "residual_sugar": 1.9, "chlorides": 0.076, "free_sulfur_dioxide": 11.0,
+        "total_sulfur_dioxide": 34.0, "density": 0.9978, "pH": 3.51,
+        "sulphates": 0.56, "alcohol": 9.4, "wine_type_encoded": 0
+    }
+    event = {'Records': [
+        {'messageId': f'm{i}', 'eventSource': 'aws:sqs', 'body': json.dumps(wine)} for i in range(3)
+    ]}
+
+    with patch('lambda_handler.model', Mock()), \
+            patch('lambda_handler.contract', FeatureContract.default()), \
+            patch('lambda_handler.score_features', side_effect=RuntimeError("model exploded")):
+        result = lambda_handler.lambda_handler(event, {})
+
+    assert result['batchItemFailures'] == [{'itemIdentifier': f'm{i}'} for i in range(3)]
@@ -0,0 +1,235 @@
+import json
+import pickle
+import time
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from src.feature_contract import FeatureContract
+from src.inference import model_version_of
+from src.model_artifact import ARTIFACT_FILENAME, save_artifact
+from src.s3_cache import fetch_cached
+from src.tree_engine import TreeEnsemble
+from tests.local_s3 import LocalS3
+
+import lambda_handler
+
+BUCKET = "wine-test-bucket"
+EVENT = {"body": json.dumps({
+    "fixed_acidity": 7.4, "volatile_acidity": 0.7, "citric_acid": 0.0,
+    "residual_sugar": 1.9, "chlorides": 0.076, "free_sulfur_dioxide": 11.0,
+    "total_sulfur_dioxide": 34.0, "density": 0.9978, "pH": 3.51,
+    "sulphates": 0.56, "alcohol": 9.4, "wine_type_encoded": 0
+})}
+
+
+def model_bytes(seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    model = RandomForestRegressor(n_estimators=3, random_state=seed).fit(rng.random((50, 12)), rng.random(50) * 10)
+    return pickle.dumps(model)
+
+
+def artifact_bytes(seed: int, directory) -> bytes:
+    """model_bytes(seed) as a memory-mappable artifact"""
+    data = model_bytes(seed)
+    path = str(directory / f"{seed}.arrays")
+    save_artifact(pickle.loads(data), path, FeatureContract.default(), model_version_of(data))
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def s3():
+    with LocalS3() as server:
+        server.put(BUCKET, lambda_handler.MODEL_KEY, model_bytes(0))
+        server.put(BUCKET, lambda_handler.CONTRACT_KEY, json.dumps(FeatureContract.default().to_dict()).encode())
+        yield server
+
+
+@pytest.fixture
+def cold_lambda(s3, tmp_path, monkeypatch):
+    """The handler module as a fresh execution environment would see it, backed by the local S3"""
+    monkeypatch.setattr(lambda_handler, "BUCKET_NAME", BUCKET)
+    monkeypatch.setattr(lambda_handler, "MODEL_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(lambda_handler, "BAKED_MODEL_PATH", str(tmp_path / "baked" / "model.pkl"))
+    monkeypatch.setattr(lambda_handler, "s3_client", s3.client())
+    monkeypatch.setattr(lambda_handler, "model", None)
+    monkeypatch.setattr(lambda_handler, "tree_engine", None)
+    monkeypatch.setattr(lambda_handler, "cold_start", dict(lambda_handler.cold_start))
+    return lambda_handler
+
+
+def restart(handler):
+    """Simulate a new init in a reused execution environment (/tmp survives)"""
+    handler.model = None
+
+
+class TestLambdaModelCache:
+    """Test the ETag-validated /tmp model cache against a local S3 stand-in"""
+
+    def test_cold_start_downloads_and_reports_timings(self, cold_lambda, s3):
+        response = cold_lambda.lambda_handler(EVENT, {})
+
+        assert response["statusCode"] == 200
+        assert s3.requests["GET"] >= 1
+        assert cold_lambda.cold_start["model_source"] == "s3"
+        for phase in ("import", "s3_fetch", "deserialize", "first_predict"):
+            assert f"{phase};dur=" in response["headers"]["Server-Timing"]
+
+        # Warm invocations don't repeat the header
+        assert "Server-Timing" not in cold_lambda.lambda_handler(EVENT, {})["headers"]
+
+    def test_reused_environment_skips_download(self, cold_lambda, s3):
+        cold_lambda.load_model_from_s3()
+        version = cold_lambda.model_version
+        gets = s3.requests["GET"]
+
+        restart(cold_lambda)
+        cold_lambda.load_model_from_s3()
+
+        assert s3.requests["GET"] == gets
+        assert cold_lambda.cold_start["model_source"] == "tmp_cache"
+        assert cold_lambda.model_version == version
+
+    def test_changed_etag_downloads_new_model(self, cold_lambda, s3):
+        cold_lambda.load_model_from_s3()
+        old_version = cold_lambda.model_version
+
+        s3.put(BUCKET, cold_lambda.MODEL_KEY, model_bytes(1))
+        restart(cold_lambda)
+        cold_lambda.load_model_from_s3()
+
+        assert cold_lambda.cold_start["model_source"] == "s3"
+        assert cold_lambda.model_version != old_version
+
+    def test_baked_model_skips_s3(self, cold_lambda, s3, tmp_path):
+        baked = tmp_path / "baked"
+        baked.mkdir()
+        (baked / "model.pkl").write_bytes(model_bytes(2))
+
+        cold_lambda.load_model_from_s3()
+
+        assert cold_lambda.cold_start["model_source"] == "baked"
+        assert sum(s3.requests.values()) == 0
+
+    def test_artifact_preferred_over_pickle(self, cold_lambda, s3, tmp_path):
+        s3.put(BUCKET, cold_lambda.ARTIFACT_KEY, artifact_bytes(0, tmp_path))
+
+        response = cold_lambda.lambda_handler(EVENT, {})
+
+        assert isinstance(cold_lambda.model, TreeEnsemble)
+        assert cold_lambda.model_version == model_version_of(model_bytes(0))
+        features = cold_lambda.contract.fill_row_from_dict(json.loads(EVENT["body"]))
+        expected = pickle.loads(model_bytes(0)).predict(features)[0]
+        assert json.loads(response["body"])["prediction"] == pytest.approx(expected)
+
+    def test_stale_artifact_falls_back_to_pickle(self, cold_lambda, s3, tmp_path):
+        s3.put(BUCKET, cold_lambda.ARTIFACT_KEY, artifact_bytes(0, tmp_path), modified=time.time() - 3600)
+
+        cold_lambda.load_model_from_s3()
+
+        assert isinstance(cold_lambda.model, RandomForestRegressor)
+
+    def test_baked_artifact(self, cold_lambda, s3, tmp_path):
+        baked = tmp_path / "baked"
+        baked.mkdir()
+        (baked / "model.pkl").write_bytes(model_bytes(2))
+        (baked / ARTIFACT_FILENAME).write_bytes(artifact_bytes(2, tmp_path))
+
+        cold_lambda.load_model_from_s3()
+
+        assert cold_lambda.cold_start["model_source"] == "baked"
+        assert isinstance(cold_lambda.model, TreeEnsemble)
+        assert sum(s3.requests.values()) == 0
+
+    def test_warmup_event_loads_and_primes(self, cold_lambda, s3, monkeypatch):
+        monkeypatch.setattr(cold_lambda, "warm_state", {"warmups": 0, "last_warmup": None})
+        cache_lookups = cold_lambda.prediction_cache.hits + cold_lambda.prediction_cache.misses
+        schedule = {"source": "aws.events", "detail-type": "Scheduled Event", "detail": {}}
+
+        first = json.loads(cold_lambda.lambda_handler(schedule, {})["body"])
+        second = json.loads(cold_lambda.lambda_handler({"warmup": True}, {})["body"])
+
+        assert first["warm"] and first["was_cold"]
+        assert second["warm"] and not second["was_cold"]
+        assert second["model_version"] == cold_lambda.model_version
+        # Warm-ups bypass the prediction cache
+        assert cold_lambda.prediction_cache.hits + cold_lambda.prediction_cache.misses == cache_lookups
+
+    def test_health_check_triggers_warmup(self, cold_lambda, s3, monkeypatch):
+        monkeypatch.setattr(cold_lambda, "warm_state", {"warmups": 0, "last_warmup": None})
+
+        cold = json.loads(cold_lambda.health_check({}, {})["body"])
+        warmed = json.loads(cold_lambda.health_check({"queryStringParameters": {"warmup": "true"}}, {})["body"])
+
+        assert cold["warm"] is False and cold["warmup"] is None
+        assert warmed["warm"] is True and warmed["warmups"] == 1
+        assert warmed["warmup"]["was_cold"] is True
+
+
+def test_fetch_cached_ignores_truncated_copy(s3, tmp_path):
+    """A local copy that doesn't match its sidecar is downloaded again"""
+    client = s3.client()
+    path = str(tmp_path / "model.pkl")
+    assert fetch_cached(client, BUCKET, lambda_handler.MODEL_KEY, path)["downloaded"] is True
+
+    with open(path, "r+b") as f:
+        f.truncate(10)
+
+    assert fetch_cached(client, BUCKET, lambda_handler.MODEL_KEY, path)["downloaded"] is True
+
+
+def test_cold_start_loads_compressed_model(cold_lambda, s3, tmp_path):
+    """A model uploaded zstd compressed (codec in its metadata) loads transparently"""
+    from src.s3_utils import S3Handler
+
+    data = model_bytes(3)
+    (tmp_path / "upload").mkdir()
+    (tmp_path / "upload" / "model.pkl").write_bytes(data)
+    handler = S3Handler(bucket_name=BUCKET, region="us-east-1")
+    handler.s3_client = s3.client()
+    assert handler.upload_file(str(tmp_path / "upload" / "model.pkl"), lambda_handler.MODEL_KEY, codec="zstd", level=9)
+    assert s3.metadata[(BUCKET, lambda_handler.MODEL_KEY)]["codec"] == "zstd"
+
+    response = cold_lambda.lambda_handler(EVENT, {})
+
+    assert response["statusCode"] == 200
+    assert cold_lambda.model_version == model_version_of(data)
+    assert cold_lambda.cold_start["model_codec"] == "zstd"
+
+
+def test_baked_compressed_artifact_loads(cold_lambda, s3, tmp_path):
+    """An artifact baked as `aws s3 cp` left a zstd upload is decompressed instead of failing the cold start"""
+    from src.compression import compress_file
+
+    baked = tmp_path / "baked"
+    baked.mkdir()
+    (baked / "model.pkl").write_bytes(model_bytes(4))
+    (tmp_path / "plain.arrays").write_bytes(artifact_bytes(4, tmp_path))
+    compress_file(str(tmp_path / "plain.arrays"), str(baked / ARTIFACT_FILENAME), "zstd", 3)
+
+    cold_lambda.load_model_from_s3()
+
+    assert cold_lambda.cold_start["model_source"] == "baked"
+    assert isinstance(cold_lambda.model, TreeEnsemble)
+    assert cold_lambda.model_version == model_version_of(model_bytes(4))
+    assert sum(s3.requests.values()) == 0
+
+
+def test_baked_compressed_contract_loads(cold_lambda, s3, tmp_path):
+    """A contract baked as `aws s3 cp` left a zstd upload is decompressed instead of failing the cold start"""
+    from src.compression import compress_file
+
+    contract = FeatureContract.default()
+    baked = tmp_path / "baked"
+    baked.mkdir()
+    (baked / "model.pkl").write_bytes(model_bytes(5))
+    contract.save(str(tmp_path / "plain.json"))
+    compress_file(str(tmp_path / "plain.json"), str(baked / "feature_contract.json"), "zstd", 3)
+
+    response = cold_lambda.lambda_handler(EVENT, {})
+
+    assert response["statusCode"] == 200
+    assert cold_lambda.cold_start["model_source"] == "baked"
+    assert cold_lambda.contract.to_dict() == contract.to_dict()
+    assert sum(s3.requests.values()) == 0
@@ -0,0 +1,53 @@
+import time
+
+from src.metrics import NULL_TIMER, Histogram, Metrics, RequestTimer
+
+
+class TestMetrics:
+    """Test stage timers and Prometheus text output"""
+
+    def test_timer_records_stages_in_order(self):
+        timer = RequestTimer()
+        timer.mark("featurize")
+        timer.mark("predict")
+
+        assert [stage for stage, _ in timer.stages] == ["featurize", "predict"]
+        assert all(seconds >= 0 for _, seconds in timer.stages)
+
+    def test_null_timer_ignores_marks(self):
+        NULL_TIMER.mark("predict")
+        NULL_TIMER.model = "lightgbm"
+        assert NULL_TIMER.model == "default"
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("latency_seconds", "Latency", ("model",), buckets=(0.01, 0.1))
+        for value in (0.005, 0.05, 0.05, 5.0):
+            histogram.observe(("rf",), value)
+
+        lines = histogram.render()
+        assert 'latency_seconds_bucket{model="rf",le="0.01"} 1' in lines
+        assert 'latency_seconds_bucket{model="rf",le="0.1"} 3' in lines
+        assert 'latency_seconds_bucket{model="rf",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{model="rf"} 4' in lines
+
+    def test_record_counts_requests_and_errors(self):
+        metrics = Metrics()
+        timer = RequestTimer()
+        timer.model = "lightgbm"
+        timer.mark("predict")
+        metrics.record("/predict", 200, timer, time.perf_counter())
+        metrics.record("/predict", 500, RequestTimer(), time.perf_counter())
+
+        text = metrics.render()
+        assert 'wine_api_requests_total{endpoint="/predict",status="200"} 1' in text
+        assert 'wine_api_errors_total{endpoint="/predict"} 1' in text
+        assert 'wine_api_stage_duration_seconds_count{endpoint="/predict",stage="predict",model="lightgbm"} 1' in text
+
+    def test_gauges_skip_missing_values(self):
+        metrics = Metrics()
+        metrics.gauge("queue_depth", "Queue depth", lambda: 3)
+        metrics.gauge("cache_hit_rate", "Hit rate", lambda: None)
+
+        text = metrics.render()
+        assert "queue_depth 3" in text
+        assert "cache_hit_rate" not in text
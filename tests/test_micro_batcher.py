@@ -0,0 +1,89 @@
+import asyncio
+
+import numpy as np
+import pytest
+from src.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test micro-batching of concurrent predictions"""
+
+    def test_concurrent_rows_share_one_call(self):
+        batch_sizes = []
+
+        def predict_fn(features, model):
+            batch_sizes.append(len(features))
+            return features.sum(axis=1)
+
+        async def run():
+            batcher = MicroBatcher(predict_fn, max_batch_size=64, max_wait_ms=50)
+            rows = [np.full(3, float(i)) for i in range(20)]
+            results = await asyncio.gather(*(batcher.submit(row) for row in rows))
+            stats = batcher.stats()
+            await batcher.stop()
+            return results, stats
+
+        results, stats = asyncio.run(run())
+
+        # Every caller gets its own result
+        assert results == [3.0 * i for i in range(20)]
+        assert batch_sizes == [20]
+        assert stats["requests"] == 20
+        assert stats["batches"] == 1
+        assert stats["batch_size_distribution"]["<=32"] == 1
+
+    def test_max_batch_size_respected(self):
+        batch_sizes = []
+
+        def predict_fn(features, model):
+            batch_sizes.append(len(features))
+            return features[:, 0]
+
+        async def run():
+            batcher = MicroBatcher(predict_fn, max_batch_size=4, max_wait_ms=50)
+            rows = [np.array([float(i)]) for i in range(10)]
+            results = await asyncio.gather(*(batcher.submit(row) for row in rows))
+            await batcher.stop()
+            return results
+
+        results = asyncio.run(run())
+
+        assert results == [float(i) for i in range(10)]
+        assert max(batch_sizes) <= 4
+        assert sum(batch_sizes) == 10
+
+    def test_prediction_error_propagates(self):
+        def predict_fn(features, model):
+            raise ValueError("bad model")
+
+        async def run():
+            batcher = MicroBatcher(predict_fn, max_wait_ms=1)
+            try:
+                await batcher.submit(np.zeros(2))
+            finally:
+                await batcher.stop()
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+
+    def test_rows_scored_with_their_own_model(self):
+        calls = []
+
+        def predict_fn(features, model):
+            calls.append((model, len(features)))
+            return features[:, 0] * model
+
+        async def run():
+            batcher = MicroBatcher(predict_fn, max_batch_size=64, max_wait_ms=50)
+            # The "active" model changes while rows are queued
+            submissions = [batcher.submit(np.array([float(i)]), 1.0 if i < 3 else 10.0) for i in range(6)]
+            results = await asyncio.gather(*submissions)
+            stats = batcher.stats()
+            await batcher.stop()
+            return results, stats
+
+        results, stats = asyncio.run(run())
+
+        assert results == [0.0, 1.0, 2.0, 30.0, 40.0, 50.0]
+        assert calls == [(1.0, 3), (10.0, 3)]
+        assert stats["batches"] == 2
@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMRegressor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.neighbors import KNeighborsRegressor
+from xgboost import XGBRegressor
+from src import model_artifact
+from src.feature_contract import FeatureContract
+from src.inference import FEATURE_COLUMNS, model_version_of
+from src.model_artifact import ALIGNMENT, ARTIFACT_FILENAME, current_artifact, load_artifact, read_header, save_artifact
+from src.model_reloader import load_model_file
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    rng = np.random.default_rng(0)
+    # Columns in a different order than FEATURE_COLUMNS, so the contract order matters
+    columns = list(reversed(FEATURE_COLUMNS))
+    X = pd.DataFrame(rng.random((400, 12)) * 10, columns=columns)
+    y = X["alcohol"] * 0.5 + np.sin(X["pH"]) + rng.random(400)
+    return X, y
+
+
+class TestModelArtifact:
+    """Test the memory-mappable artifact format"""
+
+    @pytest.mark.parametrize("model, tolerance", [
+        (RandomForestRegressor(n_estimators=10, max_depth=8, random_state=0), 1e-12),
+        (LGBMRegressor(n_estimators=30, verbose=-1), 1e-12),
+        (XGBRegressor(n_estimators=30, max_depth=4), 1e-5),
+        (LinearRegression(), 1e-9),
+    ])
+    def test_round_trip_matches_native_predict(self, model, tolerance, training_data, tmp_path, save_pair):
+        X, y = training_data
+        model.fit(X, y)
+        model_path = save_pair(model, tmp_path)
+
+        loaded, contract, version = load_artifact(str(tmp_path / ARTIFACT_FILENAME))
+
+        assert version == model_version_of(open(model_path, "rb").read())
+        assert contract.feature_names == list(X.columns)
+        assert contract.requires_frame is False
+        np.testing.assert_allclose(loaded.predict(X.to_numpy()), model.predict(X), atol=tolerance)
+
+    def test_arrays_are_mapped_and_aligned(self, training_data, tmp_path, save_pair):
+        X, y = training_data
+        save_pair(RandomForestRegressor(n_estimators=3, random_state=0).fit(X, y), tmp_path)
+        path = str(tmp_path / ARTIFACT_FILENAME)
+
+        ensemble, _, _ = load_artifact(path)
+        header, data_start = read_header(path)
+
+        assert data_start % ALIGNMENT == 0
+        assert all(spec["offset"] % ALIGNMENT == 0 for spec in header["arrays"].values())
+        # Views into the read-only mapping, not copies
+        assert isinstance(ensemble.threshold.base, np.memmap)
+        assert not ensemble.threshold.flags.writeable
+
+    def test_touch_covers_every_array(self, training_data, tmp_path, save_pair):
+        X, y = training_data
+        save_pair(RandomForestRegressor(n_estimators=3, random_state=0).fit(X, y), tmp_path)
+        ensemble, _, _ = load_artifact(str(tmp_path / ARTIFACT_FILENAME))
+
+        assert ensemble.touch() == ensemble.nbytes
+
+    def test_unsupported_model_raises(self, training_data, tmp_path):
+        X, y = training_data
+        model = KNeighborsRegressor().fit(X, y)
+
+        with pytest.raises(ValueError):
+            save_artifact(model, str(tmp_path / ARTIFACT_FILENAME), FeatureContract.from_model(model), "v")
+
+    def test_stale_artifact_is_ignored(self, training_data, tmp_path, save_pair):
+        X, y = training_data
+        model_path = save_pair(LinearRegression().fit(X, y), tmp_path)
+        assert current_artifact(model_path) == str(tmp_path / ARTIFACT_FILENAME)
+
+        # A newer pickle saved without an artifact
+        later = os.stat(model_path).st_mtime_ns + 10**9
+        os.utime(model_path, ns=(later, later))
+
+        assert current_artifact(model_path) is None
+
+    def test_pickle_format_forces_unpickling(self, training_data, tmp_path, save_pair, monkeypatch):
+        X, y = training_data
+        model_path = save_pair(LinearRegression().fit(X, y), tmp_path)
+        monkeypatch.setattr(model_artifact, "MODEL_FORMAT", "pickle")
+
+        assert current_artifact(model_path) is None
+
+    def test_load_model_file_prefers_artifact(self, training_data, tmp_path, save_pair):
+        X, y = training_data
+        model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+        model_path = save_pair(model, tmp_path)
+
+        loaded = load_model_file(model_path)
+
+        assert loaded.path == model_path
+        assert loaded.artifact_path == str(tmp_path / ARTIFACT_FILENAME)
+        assert loaded.model_type == "RandomForestRegressor"
+        assert loaded.engine is loaded.model
+        assert loaded.version == model_version_of(open(model_path, "rb").read())
+        np.testing.assert_allclose(loaded.predict(X.to_numpy()[:500]), model.predict(X), atol=1e-12)
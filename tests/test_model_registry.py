@@ -0,0 +1,75 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor
+from src.model_registry import ModelRegistry
+
+
+def write_model(directory, model):
+    os.makedirs(directory, exist_ok=True)
+    X = np.random.rand(50, 12)
+    model.fit(X, X[:, 0] * 10)
+    path = os.path.join(directory, "model.pkl")
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+    return path
+
+
+class TestModelRegistry:
+    """Test named model loading, routing and memory budget"""
+
+    def test_discover_and_lazy_load(self, tmp_path):
+        write_model(tmp_path / "linear", LinearRegression())
+        write_model(tmp_path / "forest", RandomForestRegressor(n_estimators=5, random_state=0))
+        registry = ModelRegistry()
+
+        assert registry.discover(str(tmp_path)) == ["forest", "linear"]
+        assert registry.stats()["models"]["linear"]["loaded"] is False
+
+        assert registry.loaded("linear") is None
+        loaded = registry.get("linear")
+        assert type(loaded.model).__name__ == "LinearRegression"
+        assert registry.loaded("linear") is loaded
+        assert registry.get("linear") is loaded
+        assert registry.loads == 1
+
+        stats = registry.stats()
+        assert stats["models"]["linear"]["loaded"] is True
+        assert stats["models"]["linear"]["memory_bytes"] > 0
+        assert stats["memory_used_bytes"] == loaded.memory_bytes
+
+    def test_unknown_model(self):
+        with pytest.raises(KeyError):
+            ModelRegistry().get("missing")
+        with pytest.raises(KeyError):
+            ModelRegistry().loaded("missing")
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        paths = {
+            name: write_model(tmp_path / name, LinearRegression())
+            for name in ("a", "b", "c")
+        }
+        size = os.path.getsize(paths["a"])
+        registry = ModelRegistry(memory_budget_bytes=2 * size)
+        for name, path in paths.items():
+            registry.register(name, path)
+
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")  # "b" is now least recently used
+        registry.get("c")
+
+        models = registry.stats()["models"]
+        assert models["a"]["loaded"] and models["c"]["loaded"]
+        assert not models["b"]["loaded"]
+        assert registry.evictions == 1
+
+    def test_keeps_model_larger_than_budget(self, tmp_path):
+        registry = ModelRegistry(memory_budget_bytes=1)
+        registry.register("linear", write_model(tmp_path / "linear", LinearRegression()))
+
+        assert registry.get("linear") is not None
+        assert registry.stats()["models"]["linear"]["loaded"] is True
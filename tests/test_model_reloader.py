@@ -0,0 +1,105 @@
+import os
+import pickle
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from src.model_reloader import LocalModelSource, ModelReloader, S3ModelSource, load_pickled_model
+
+
+def write_model(path, slope):
+    X = np.random.rand(30, 12)
+    model = LinearRegression().fit(X, X[:, 0] * slope)
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+    return model
+
+
+class TestModelReloader:
+    """Test background model hot reload"""
+
+    def test_swaps_when_file_changes(self, tmp_path):
+        path = tmp_path / "model.pkl"
+        write_model(path, 1.0)
+        active = {"model": load_pickled_model(str(path))}
+        old = active["model"]
+
+        reloader = ModelReloader(
+            LocalModelSource(str(path)),
+            lambda loaded: active.update(model=loaded),
+            current_version=lambda: active["model"].version,
+        )
+        assert reloader.check_once() is False  # nothing changed yet
+
+        write_model(path, 5.0)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+        assert reloader.check_once() is True
+        assert active["model"] is not old
+        assert active["model"].version != old.version
+        # The old reference still serves requests that started before the swap
+        assert old.predict(np.ones((1, 12))).shape == (1,)
+        assert reloader.reloads == 1
+
+    def test_watches_pickle_when_serving_its_artifact(self, tmp_path, save_pair):
+        from sklearn.ensemble import RandomForestRegressor
+        from src.model_reloader import load_model_file
+
+        X = np.random.rand(50, 12)
+        save_pair(RandomForestRegressor(n_estimators=3, random_state=0).fit(X, X[:, 0]), str(tmp_path))
+        active = {"model": load_model_file(str(tmp_path / "model.pkl"))}
+        assert active["model"].model_type == "RandomForestRegressor"
+
+        reloader = ModelReloader(
+            LocalModelSource(active["model"].path),
+            lambda loaded: active.update(model=loaded),
+            current_version=lambda: active["model"].version,
+        )
+        # The next save has no array form: the artifact is removed and only the pickle changes
+        os.remove(tmp_path / "model.arrays")
+        write_model(tmp_path / "model.pkl", 3.0)
+        os.utime(tmp_path / "model.pkl", ns=(0, os.stat(tmp_path / "model.pkl").st_mtime_ns + 1_000_000))
+
+        assert reloader.check_once() is True
+        assert active["model"].model_type == "LinearRegression"
+        assert active["model"].artifact_path is None
+
+    def test_failed_reload_keeps_current_model(self, tmp_path):
+        path = tmp_path / "model.pkl"
+        write_model(path, 1.0)
+        swapped = []
+
+        reloader = ModelReloader(LocalModelSource(str(path)), swapped.append)
+        with open(path, 'wb') as f:
+            f.write(b"not a pickle")
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+        assert reloader.check_once() is False
+        assert swapped == []
+        assert reloader.last_error is not None
+
+    def test_s3_source_uses_etag(self, tmp_path):
+        model_file = tmp_path / "source.pkl"
+        write_model(model_file, 2.0)
+
+        handler = Mock()
+        handler.bucket_name = "bucket"
+        handler.get_etag.return_value = '"etag-1"'
+
+        def download(key, local_path):
+            if key.endswith("model.pkl"):
+                with open(model_file, 'rb') as src, open(local_path, 'wb') as dst:
+                    dst.write(src.read())
+                return True
+            return False
+
+        handler.download_file.side_effect = download
+        source = S3ModelSource(handler, download_dir=str(tmp_path / "downloads"))
+        os.makedirs(source.download_dir)
+
+        assert source.fingerprint() == '"etag-1"'
+        loaded = source.load()
+
+        assert loaded.source == "s3://bucket/models/model.pkl"
+        assert loaded.predict(np.ones((2, 12))) == pytest.approx([2.0, 2.0])
@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+from src.inference import FEATURE_COLUMNS
+from src.prediction_cache import PredictionCache
+
+
+def sample_row():
+    return np.array([7.4, 0.7, 0.0, 1.9, 0.076, 11.0, 34.0, 0.9978, 3.51, 0.56, 9.4, 0.0])
+
+
+class TestPredictionCache:
+    """Test prediction cache keys, eviction and counters"""
+
+    def test_hit_after_put(self):
+        cache = PredictionCache(FEATURE_COLUMNS)
+        key = cache.make_key(sample_row(), "abc")
+
+        assert cache.get(key) is None
+        cache.put(key, 5.5)
+
+        assert cache.get(key) == 5.5
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_quantization_to_measurement_precision(self):
+        cache = PredictionCache(FEATURE_COLUMNS)
+        row = sample_row()
+        noisy = row.copy()
+        noisy[7] += 1e-9  # float noise well below density's 5 decimals
+        different = row.copy()
+        different[7] += 1e-4
+
+        assert cache.make_key(row, "v") == cache.make_key(noisy, "v")
+        assert cache.make_key(row, "v") != cache.make_key(different, "v")
+
+    def test_model_version_in_key(self):
+        cache = PredictionCache(FEATURE_COLUMNS)
+        cache.put(cache.make_key(sample_row(), "old"), 5.0)
+
+        assert cache.get(cache.make_key(sample_row(), "new")) is None
+
+    def test_quantization_follows_the_row_feature_order(self):
+        cache = PredictionCache(FEATURE_COLUMNS)
+        reordered = list(reversed(FEATURE_COLUMNS))  # density at 4, chlorides at 7
+        row = sample_row()[::-1].copy()
+        different = row.copy()
+        different[4] += 1e-4  # density differs at its 5th decimal
+
+        assert cache.make_key(row, "v", reordered) != cache.make_key(different, "v", reordered)
+        # Quantized with the default order, column 4 is chlorides (3 decimals) and the rows collide
+        assert cache.make_key(row, "v") == cache.make_key(different, "v")
+        assert cache.scale_for(reordered) is cache.scale_for(tuple(reordered))
+
+    def test_lru_eviction(self):
+        cache = PredictionCache(FEATURE_COLUMNS, max_size=2)
+        keys = []
+        for i in range(3):
+            row = sample_row()
+            row[0] = i
+            keys.append(cache.make_key(row, "v"))
+
+        cache.put(keys[0], 1.0)
+        cache.put(keys[1], 2.0)
+        cache.get(keys[0])  # keys[1] becomes least recently used
+        cache.put(keys[2], 3.0)
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == 1.0
+        assert cache.stats()["evictions"] == 1
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        cache = PredictionCache(FEATURE_COLUMNS, ttl_seconds=0.01)
+        key = cache.make_key(sample_row(), "v")
+        cache.put(key, 5.0)
+        time.sleep(0.02)
+
+        assert cache.get(key) is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_invalidate(self):
+        cache = PredictionCache(FEATURE_COLUMNS)
+        key = cache.make_key(sample_row(), "v")
+        cache.put(key, 5.0)
+
+        cache.invalidate()
+
+        assert cache.get(key) is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_invalidate_one_model_version(self):
+        cache = PredictionCache(FEATURE_COLUMNS)
+        old, other = cache.make_key(sample_row(), "old"), cache.make_key(sample_row(), "registry")
+        cache.put(old, 5.0)
+        cache.put(other, 6.0)
+
+        cache.invalidate(model_version="old")
+
+        assert cache.get(old) is None
+        assert cache.get(other) == 6.0
+        assert len(cache) == 1
@@ -1,8 +1,18 @@
+import os
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
+from src.s3_client import get_s3_client, reset_s3_clients
 from src.s3_utils import S3Handler
 
 
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Each test builds its own (possibly mocked) shared client"""
+    reset_s3_clients()
+    yield
+    reset_s3_clients()
+
+
 class TestS3Handler:
     """Test S3 utility functions"""
 
@@ -13,7 +23,34 @@ class TestS3Handler:
 
         assert handler.bucket_name == 'wine-quality-mlops-sujan'
         assert handler.region == 'us-east-2'
-        mock_boto_client.assert_called_once_with('s3', region_name='us-east-2')
+        mock_boto_client.assert_called_once_with('s3', region_name='us-east-2', endpoint_url=None, config=ANY)
+
+    @patch('boto3.client')
+    def test_handlers_share_one_pooled_client(self, mock_boto_client):
+        """Test S3Handlers in a process reuse one client and its connection pool"""
+        first, second = S3Handler(), S3Handler()
+
+        assert first.s3_client is second.s3_client
+        mock_boto_client.assert_called_once()
+        config = mock_boto_client.call_args.kwargs['config']
+        assert config.max_pool_connections >= 10 and config.tcp_keepalive is True
+        assert config.retries['mode'] == 'standard'
+
+    @patch('boto3.client')
+    def test_forked_child_gets_its_own_client(self, mock_boto_client):
+        """Test a forked worker doesn't reuse the parent's client"""
+        mock_boto_client.side_effect = lambda *args, **kwargs: Mock()
+        parent = get_s3_client('us-east-2')
+        read_end, write_end = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_end, b"1" if get_s3_client('us-east-2') is not parent else b"0")
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert os.read(read_end, 1) == b"1"
+        assert get_s3_client('us-east-2') is parent
 
     @patch('boto3.client')
     def test_upload_model_success(self, mock_boto_client):
@@ -41,3 +78,96 @@ class TestS3Handler:
 
         # Should attempt download
         mock_s3.download_file.assert_called_once()
+
+    @patch('boto3.client')
+    def test_get_etag(self, mock_boto_client):
+        """Test reading an object's ETag"""
+        mock_s3 = Mock()
+        mock_s3.head_object.return_value = {'ETag': '"abc123"'}
+        mock_boto_client.return_value = mock_s3
+
+        handler = S3Handler()
+
+        assert handler.get_etag('models/model.pkl') == '"abc123"'
+        mock_s3.head_object.assert_called_once_with(Bucket='wine-quality-mlops-sujan', Key='models/model.pkl')
+
+
+class TestS3Transfers:
+    """Test multipart transfers and directory sync against a local S3 stand-in"""
+
+    BUCKET = "wine-test-bucket"
+
+    @pytest.fixture
+    def s3(self):
+        from tests.local_s3 import LocalS3
+
+        with LocalS3() as server:
+            yield server
+
+    @pytest.fixture
+    def handler(self, s3):
+        from boto3.s3.transfer import TransferConfig
+
+        config = TransferConfig(multipart_threshold=5 * 1024 * 1024, multipart_chunksize=5 * 1024 * 1024, max_concurrency=4)
+        handler = S3Handler(bucket_name=self.BUCKET, region="us-east-1", transfer_config=config)
+        handler.s3_client = s3.client()
+        return handler
+
+    @staticmethod
+    def make_tree(root):
+        files = {
+            "models/model.pkl": os.urandom(6 * 1024 * 1024),  # multipart with 5 MB parts
+            "params/best_params.json": b'{"n_estimators": 200}',
+            "metrics/metrics.json": b'{"r2": 0.5}',
+        }
+        for relative, data in files.items():
+            path = root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        return files
+
+    def test_multipart_upload_reports_progress(self, s3, handler, tmp_path):
+        from src.s3_utils import TransferProgress
+
+        data = os.urandom(11 * 1024 * 1024)
+        (tmp_path / "model.pkl").write_bytes(data)
+        progress = TransferProgress(len(data))
+
+        assert handler.upload_file(str(tmp_path / "model.pkl"), "models/model.pkl", callback=progress) is True
+
+        assert s3.objects[(self.BUCKET, "models/model.pkl")] == data
+        assert s3.etags[(self.BUCKET, "models/model.pkl")].endswith('-3"')
+        assert progress.transferred == len(data) and progress.fraction == 1.0
+
+    def test_sync_upload_skips_unchanged_files(self, s3, handler, tmp_path):
+        files = self.make_tree(tmp_path / "artifacts")
+
+        first = handler.sync_directory(str(tmp_path / "artifacts"), "mirror")
+        (tmp_path / "artifacts" / "metrics" / "metrics.json").write_bytes(b'{"r2": 0.9}')
+        second = handler.sync_directory(str(tmp_path / "artifacts"), "mirror")
+
+        assert first["transferred"] == sorted(files) and not first["failed"]
+        assert second["transferred"] == ["metrics/metrics.json"]
+        assert second["skipped"] == ["models/model.pkl", "params/best_params.json"]
+        assert s3.objects[(self.BUCKET, "mirror/metrics/metrics.json")] == b'{"r2": 0.9}'
+
+    def test_sync_download_mirrors_prefix(self, handler, tmp_path):
+        files = self.make_tree(tmp_path / "artifacts")
+        handler.sync_directory(str(tmp_path / "artifacts"), "mirror")
+        updates = []
+
+        first = handler.sync_directory(str(tmp_path / "copy"), "mirror", direction="download", callback=updates.append)
+        second = handler.sync_directory(str(tmp_path / "copy"), "mirror", direction="download")
+
+        assert first["transferred"] == sorted(files) and first["bytes"] == sum(map(len, files.values()))
+        assert updates and updates[-1].fraction == 1.0
+        assert second["skipped"] == sorted(files) and second["bytes"] == 0
+        for relative, data in files.items():
+            assert (tmp_path / "copy" / relative).read_bytes() == data
+
+    def test_multipart_etag_without_hash_is_not_trusted(self, s3, handler, tmp_path):
+        data = os.urandom(6 * 1024 * 1024)
+        (tmp_path / "model.pkl").write_bytes(data)
+        handler.upload_file(str(tmp_path / "model.pkl"), "models/model.pkl")
+
+        assert handler.same_content(str(tmp_path / "model.pkl"), "models/model.pkl") is False
@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+import pytest
+from src.feature_contract import FeatureContract
+from src.inference import FEATURE_COLUMNS, REQUEST_FIELDS
+from src.stream_parser import StreamParser
+
+UCI_HEADER = ";".join(f'"{name}"' for name in FEATURE_COLUMNS[:-1] + ["quality"])
+ROW = [7.4, 0.7, 0.0, 1.9, 0.076, 11.0, 34.0, 0.9978, 3.51, 0.56, 9.4]
+
+
+class TestStreamParser:
+    """Test chunked parsing of CSV/NDJSON uploads"""
+
+    def test_uci_csv_in_fixed_chunks(self):
+        body = (UCI_HEADER + "\n" + "\n".join(";".join(map(str, ROW + [5])) for _ in range(5)) + "\n").encode()
+        parser = StreamParser(FeatureContract.default(), "csv", chunk_rows=2)
+
+        chunks = []
+        for i in range(0, len(body), 7):  # split mid-line like a network stream
+            chunks += parser.feed(body[i:i + 7])
+        chunks += parser.flush()
+
+        assert [len(chunk.features) for chunk in chunks] == [2, 2, 1]
+        np.testing.assert_allclose(chunks[0].features[0], ROW + [0])  # wine_type_encoded defaults to red
+        assert parser.rows == 5
+
+    def test_csv_wine_type_default_and_column_order(self):
+        header = ",".join(reversed(REQUEST_FIELDS[:-1]))
+        body = f"{header}\n{','.join(map(str, reversed(ROW)))}".encode()
+        parser = StreamParser(FeatureContract.default(), "csv", defaults={"wine_type_encoded": 1})
+
+        chunks = parser.feed(body) + parser.flush()
+
+        np.testing.assert_allclose(chunks[0].features[0], ROW + [1])
+
+    def test_csv_missing_columns(self):
+        parser = StreamParser(FeatureContract.default(), "csv")
+        with pytest.raises(ValueError, match="missing columns"):
+            parser.feed(b'"alcohol";"pH"\n')
+
+    def test_ndjson(self):
+        record = dict(zip(REQUEST_FIELDS, ROW))
+        body = "\n".join(json.dumps(record) for _ in range(3)).encode()
+        parser = StreamParser(FeatureContract.default(), "ndjson", chunk_rows=10)
+
+        chunks = parser.feed(body) + parser.flush()
+
+        assert len(chunks) == 1 and chunks[0].features.shape == (3, 12)
+        assert chunks[0].errors == {}
+        np.testing.assert_allclose(chunks[0].features[2], ROW + [0])
+
+    def test_invalid_csv_rows_reported_per_row(self):
+        good = ";".join(map(str, ROW + [5]))
+        rows = [good, ";" * 11, good.replace("9.4", "strong"), good.replace("3.51", "15"), good.replace("7.4", "-1")]
+        body = (UCI_HEADER + "\n" + "\n".join(rows) + "\n").encode()
+        parser = StreamParser(FeatureContract.default(), "csv")
+
+        chunks = parser.feed(body) + parser.flush()
+
+        errors = chunks[0].errors
+        assert sorted(errors) == [1, 2, 3, 4]
+        assert errors[1].startswith("Missing fields") and "alcohol" in errors[1]
+        assert errors[2] == "Invalid value for alcohol: 'strong'"
+        assert errors[3] == "pH must be <= 14"
+        assert errors[4] == "fixed_acidity must be >= 0"
+        np.testing.assert_allclose(chunks[0].features[0], ROW + [0])
+
+    def test_invalid_ndjson_rows_reported_per_row(self):
+        record = dict(zip(REQUEST_FIELDS, ROW))
+        lines = [json.dumps(record), json.dumps({"alcohol": 9.4}), "{not json", "[1, 2]",
+                 json.dumps({**record, "pH": "acidic"}), json.dumps({**record, "density": 0})]
+        parser = StreamParser(FeatureContract.default(), "ndjson")
+
+        chunks = parser.feed("\n".join(lines).encode()) + parser.flush()
+
+        errors = chunks[0].errors
+        assert sorted(errors) == [1, 2, 3, 4, 5]
+        assert errors[1].startswith("Missing fields") and "fixed_acidity" in errors[1]
+        assert errors[2].startswith("Invalid JSON")
+        assert errors[3] == "Record must be a JSON object"
+        assert errors[4].startswith("Invalid value")
+        assert errors[5] == "density must be > 0"
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMRegressor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from xgboost import XGBRegressor
+from src.inference import FEATURE_COLUMNS
+from src.tree_engine import TreeEnsemble, compile_model
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((500, 12)) * 10, columns=FEATURE_COLUMNS)
+    y = X["alcohol"] * 0.5 + np.sin(X["pH"]) + rng.random(500)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def test_rows():
+    rng = np.random.default_rng(1)
+    X = rng.random((300, 12)) * 10
+    X_missing = X.copy()
+    X_missing[rng.random(X.shape) < 0.1] = np.nan
+    return X, X_missing
+
+
+class TestTreeEngine:
+    """Test the flat-array engine matches each library's native predict"""
+
+    @pytest.mark.parametrize("model, tolerance", [
+        (RandomForestRegressor(n_estimators=20, max_depth=12, random_state=0), 1e-12),
+        (LGBMRegressor(n_estimators=50, verbose=-1), 1e-12),
+        # XGBoost accumulates leaf values in float32
+        (XGBRegressor(n_estimators=50, max_depth=6), 1e-5),
+    ])
+    def test_matches_native_predict(self, model, tolerance, training_data, test_rows):
+        X, y = training_data
+        model.fit(X, y)
+        ensemble = TreeEnsemble.from_model(model)
+
+        for rows in test_rows:
+            np.testing.assert_allclose(ensemble.predict(rows), model.predict(rows), rtol=0, atol=tolerance)
+        np.testing.assert_allclose(ensemble.predict(test_rows[0][:1]), model.predict(test_rows[0][:1]), atol=tolerance)
+
+    def test_save_and_load(self, tmp_path, training_data, test_rows):
+        X, y = training_data
+        model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+        ensemble = TreeEnsemble.from_model(model)
+        ensemble.save(str(tmp_path / "trees.npz"))
+
+        loaded = TreeEnsemble.load(str(tmp_path / "trees.npz"))
+
+        assert loaded.n_nodes == ensemble.n_nodes
+        np.testing.assert_array_equal(loaded.predict(test_rows[0]), ensemble.predict(test_rows[0]))
+
+    def test_rejects_wrong_width(self, training_data):
+        X, y = training_data
+        ensemble = TreeEnsemble.from_model(RandomForestRegressor(n_estimators=2).fit(X, y))
+        with pytest.raises(ValueError):
+            ensemble.predict(np.zeros((1, 5)))
+
+    def test_non_tree_models_are_not_compiled(self, training_data):
+        X, y = training_data
+        assert compile_model(LinearRegression().fit(X, y)) is None